@@ -1,7 +1,9 @@
 import logging
 from chatterbot.storage import StorageAdapter
 from chatterbot.logic import LogicAdapter
-from chatterbot.search import TextSearch, IndexedTextSearch
+from chatterbot.learning import LearningQueue
+from chatterbot.indexes import ConversationIndex
+from chatterbot.search import TextSearch, IndexedTextSearch, BM25TextSearch, MinHashTextSearch, VectorSearch
 from chatterbot import utils
 
 
@@ -27,12 +29,28 @@ class ChatBot(object):
 
         self.storage = utils.initialize_class(storage_adapter, **kwargs)
 
+        # Keep the latest statements of each conversation in memory when enabled
+        self.conversation_index = None
+
+        if kwargs.get('conversation_cache_size', 0):
+            self.conversation_index = ConversationIndex(
+                size=kwargs['conversation_cache_size']
+            )
+
+            self.storage.add_index(self.conversation_index)
+
         primary_search_algorithm = IndexedTextSearch(self, **kwargs)
         text_search_algorithm = TextSearch(self, **kwargs)
+        bm25_search_algorithm = BM25TextSearch(self, **kwargs)
+        minhash_search_algorithm = MinHashTextSearch(self, **kwargs)
+        vector_search_algorithm = VectorSearch(self, **kwargs)
 
         self.search_algorithms = {
             primary_search_algorithm.name: primary_search_algorithm,
-            text_search_algorithm.name: text_search_algorithm
+            text_search_algorithm.name: text_search_algorithm,
+            bm25_search_algorithm.name: bm25_search_algorithm,
+            minhash_search_algorithm.name: minhash_search_algorithm,
+            vector_search_algorithm.name: vector_search_algorithm
         }
 
         for adapter in logic_adapters:
@@ -56,6 +74,30 @@ class ChatBot(object):
         # Allow the bot to save input it receives so that it can learn
         self.read_only = kwargs.get('read_only', False)
 
+        # Save learned statements from a background thread when enabled
+        self.learning_queue = None
+
+        if kwargs.get('write_behind', False):
+            database_uri = getattr(self.storage, 'database_uri', None) or ''
+
+            # Each thread has its own in-memory database unless the cache is shared
+            in_memory = database_uri == 'sqlite://' or ':memory:' in database_uri or 'mode=memory' in database_uri
+
+            if database_uri.startswith('sqlite://') and in_memory and 'cache=shared' not in database_uri:
+                raise self.ChatBotException(
+                    'Write-behind learning can not be used with an in-memory SQLite '
+                    'database because the background thread would save statements '
+                    'to a separate database. Set "database_uri" to a database file.'
+                )
+
+            self.learning_queue = LearningQueue(
+                self.storage,
+                maximum_size=kwargs.get('write_behind_queue_size', 1000),
+                batch_size=kwargs.get('write_behind_batch_size', 100),
+                flush_interval=kwargs.get('write_behind_flush_interval', 1.0),
+                logger=self.logger
+            )
+
     def get_response(self, statement=None, **kwargs):
         """
         Return the bot's response based on the input.
@@ -127,10 +169,13 @@ class ChatBot(object):
                     setattr(response, response_key, response_value)
 
         if not self.read_only:
-            self.learn_response(input_statement)
+            self.set_previous_statement(input_statement)
 
-            # Save the response generated for the input
-            self.storage.create(**response.serialize())
+            # Save the input and the response generated for it together
+            if self.learning_queue:
+                self.learning_queue.put(input_statement, response)
+            else:
+                self.storage.create_pair(input_statement, response)
 
         return response
 
@@ -211,6 +256,17 @@ class ChatBot(object):
         """
         Learn that the statement provided is a valid response.
         """
+        self.set_previous_statement(statement, previous_statement)
+
+        # Save the input statement
+        return self.storage.create(**statement.serialize())
+
+    def set_previous_statement(self, statement, previous_statement=None):
+        """
+        Set the statement that the statement provided is in response to.
+        The latest response in the conversation is used if a previous
+        statement is not provided.
+        """
         if not previous_statement:
             previous_statement = statement.in_response_to
 
@@ -231,8 +287,38 @@ class ChatBot(object):
             previous_statement_text
         ))
 
-        # Save the input statement
-        return self.storage.create(**statement.serialize())
+    def get_latest_statements(self, conversation, limit=None):
+        """
+        Returns the most recent statements in a conversation, ordered from the
+        oldest to the newest, including statements that are waiting to be saved.
+
+        The statements are read from the conversation cache when it is enabled
+        and keeps at least ``limit`` statements, otherwise from the database.
+
+        :param limit: The maximum number of statements to return. Defaults to
+            the size of the conversation cache if it is enabled, or 20.
+        :type limit: int
+        """
+        if limit is None:
+            limit = self.conversation_index.size if self.conversation_index is not None else 20
+
+        # The pending statements are read first so that a
+        # statement saved while the others are read is not missed
+        pending_statements = []
+
+        if self.learning_queue:
+            pending_statements = self.learning_queue.get_pending(conversation)
+
+        if self.conversation_index is not None and limit <= self.conversation_index.size:
+            statements = self.conversation_index.get_latest_statements(
+                conversation, self.storage.get_latest_statements
+            )
+        else:
+            statements = self.storage.get_latest_statements(conversation, limit)
+
+        statements.extend(pending_statements)
+
+        return statements[-limit:]
 
     def get_latest_response(self, conversation):
         """
@@ -241,10 +327,7 @@ class ChatBot(object):
         """
         from chatterbot.conversation import Statement as StatementObject
 
-        conversation_statements = list(self.storage.filter(
-            conversation=conversation,
-            order_by=['id']
-        ))
+        conversation_statements = self.get_latest_statements(conversation)
 
         # Get the most recent statement in the conversation if one exists
         latest_statement = conversation_statements[-1] if conversation_statements else None
@@ -252,11 +335,18 @@ class ChatBot(object):
         if latest_statement:
             if latest_statement.in_response_to:
 
-                response_statements = list(self.storage.filter(
-                    conversation=conversation,
-                    text=latest_statement.in_response_to,
-                    order_by=['id']
-                ))
+                response_statements = [
+                    statement for statement in conversation_statements
+                    if statement.text == latest_statement.in_response_to
+                ]
+
+                # Look further back in the conversation than the latest statements
+                if not response_statements:
+                    response_statements = list(self.storage.filter(
+                        conversation=conversation,
+                        text=latest_statement.in_response_to,
+                        order_by=['id']
+                    ))
 
                 if response_statements:
                     return response_statements[-1]
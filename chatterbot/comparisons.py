@@ -2,7 +2,10 @@
 This module contains various text-comparison algorithms
 designed to compare one statement to another.
 """
+from chatterbot import constants
 from chatterbot.exceptions import OptionalDependencyImportError
+from chatterbot.utils import get_spacy_model
+from collections import Counter
 from difflib import SequenceMatcher
 
 
@@ -18,6 +21,29 @@ class Comparator:
     def compare(self, statement_a, statement_b):
         return 0
 
+    def compare_many(self, statement, other_statements, minimum_confidence=0, get_minimum_confidence=None):
+        """
+        Compare a statement to each statement in a list of other statements.
+        Comparators can override this method to score a batch of statements
+        more efficiently than comparing them one at a time.
+
+        Each similarity is only calculated when it is consumed, so a caller
+        that stops early does not pay for comparing the remaining statements.
+
+        :param minimum_confidence: Comparators may give a similarity of 0 to
+            statements that can be proven to not be more similar than this
+            value without fully comparing them.
+
+        :param get_minimum_confidence: A callable returning the current minimum
+            confidence. When provided, it is used instead of ``minimum_confidence``
+            and is called again before each statement is compared.
+
+        :return: The similarity of the statement to each of the other statements.
+        :rtype: Generator yielding one similarity at a time.
+        """
+        for other_statement in other_statements:
+            yield self.compare(statement, other_statement)
+
 
 class LevenshteinDistance(Comparator):
     """
@@ -56,16 +82,88 @@ class LevenshteinDistance(Comparator):
 
         return percent
 
+    def get_length_upper_bound(self, length_a, length_b):
+        """
+        Return the highest similarity that two statements with text
+        of the given lengths could possibly have.
+
+        :rtype: float
+        """
+        if not length_a or not length_b:
+            return 0
+
+        return round(2.0 * min(length_a, length_b) / (length_a + length_b), 2)
+
+    def compare_many(self, statement, other_statements, minimum_confidence=0, get_minimum_confidence=None):
+        """
+        Compare the input statement to each of the other statements.
+        The input text is only converted to lowercase once and a single
+        sequence matcher is reused for all of the comparisons.
+
+        Statements are first checked against cheap upper bounds on their
+        similarity, based on the length of their text and on the characters
+        they share with the input. The full comparison is skipped, and a
+        similarity of 0 is given, when these bounds show that a statement
+        can not be more similar than ``minimum_confidence``.
+
+        :return: The percent of similarity between the text of the input
+            statement and the text of each of the other statements.
+        :rtype: Generator yielding one similarity at a time.
+        """
+        if not statement.text:
+            for _ in other_statements:
+                yield 0
+            return
+
+        statement_text = str(statement.text.lower())
+        statement_character_counts = Counter(statement_text)
+
+        similarity = SequenceMatcher(None, statement_text)
+
+        for other_statement in other_statements:
+
+            # Falsy text values have no similarity
+            if not other_statement.text:
+                yield 0
+                continue
+
+            if get_minimum_confidence is not None:
+                minimum_confidence = get_minimum_confidence()
+
+            other_statement_text = str(other_statement.text.lower())
+
+            total_length = len(statement_text) + len(other_statement_text)
+
+            upper_bound = self.get_length_upper_bound(
+                len(statement_text), len(other_statement_text)
+            )
+
+            if upper_bound <= minimum_confidence:
+                yield 0
+                continue
+
+            # The number of characters the texts have in common
+            shared_characters = statement_character_counts & Counter(other_statement_text)
+            upper_bound = round(2.0 * sum(shared_characters.values()) / total_length, 2)
+
+            if upper_bound <= minimum_confidence:
+                yield 0
+                continue
+
+            similarity.set_seq2(other_statement_text)
+
+            yield round(similarity.ratio(), 2)
+
 
 class SpacySimilarity(Comparator):
     """
     Calculate the similarity of two statements using Spacy models.
     """
 
-    def __init__(self, language):
+    def __init__(self, language, disabled_pipes=constants.DISABLED_SPACY_PIPES):
         super().__init__(language)
         try:
-            import spacy
+            import spacy  # NOQA
         except ImportError:
             message = (
                 'Unable to import "spacy".\n'
@@ -74,7 +172,19 @@ class SpacySimilarity(Comparator):
             )
             raise OptionalDependencyImportError(message)
 
-        self.nlp = spacy.load(self.language.ISO_639_1)
+        self.disabled_pipes = disabled_pipes
+
+        self._nlp = None
+
+    @property
+    def nlp(self):
+        """
+        The spaCy model, loaded the first time that it is used.
+        """
+        if self._nlp is None:
+            self._nlp = get_spacy_model(self.language, self.disabled_pipes)
+
+        return self._nlp
 
     def compare(self, statement_a, statement_b):
         """
@@ -88,6 +198,23 @@ class SpacySimilarity(Comparator):
 
         return document_a.similarity(document_b)
 
+    def compare_many(self, statement, other_statements, minimum_confidence=0, get_minimum_confidence=None):
+        """
+        Compare the input statement to each of the other statements.
+        The input is only processed once and the other statements
+        are processed in a single batch.
+
+        :rtype: Generator yielding one similarity at a time.
+        """
+        document = self.nlp(statement.text)
+
+        other_documents = self.nlp.pipe([
+            other_statement.text for other_statement in other_statements
+        ])
+
+        for other_document in other_documents:
+            yield document.similarity(other_document)
+
 
 class JaccardSimilarity(Comparator):
     """
@@ -115,10 +242,10 @@ class JaccardSimilarity(Comparator):
     .. _`Jaccard similarity index`: https://en.wikipedia.org/wiki/Jaccard_index
     """
 
-    def __init__(self, language):
+    def __init__(self, language, disabled_pipes=constants.DISABLED_SPACY_PIPES):
         super().__init__(language)
         try:
-            import spacy
+            import spacy  # NOQA
         except ImportError:
             message = (
                 'Unable to import "spacy".\n'
@@ -127,7 +254,19 @@ class JaccardSimilarity(Comparator):
             )
             raise OptionalDependencyImportError(message)
 
-        self.nlp = spacy.load(self.language.ISO_639_1)
+        self.disabled_pipes = disabled_pipes
+
+        self._nlp = None
+
+    @property
+    def nlp(self):
+        """
+        The spaCy model, loaded the first time that it is used.
+        """
+        if self._nlp is None:
+            self._nlp = get_spacy_model(self.language, self.disabled_pipes)
+
+        return self._nlp
 
     def compare(self, statement_a, statement_b):
         """
@@ -138,16 +277,42 @@ class JaccardSimilarity(Comparator):
         document_a = self.nlp(statement_a.text.lower())
         document_b = self.nlp(statement_b.text.lower())
 
-        statement_a_lemmas = set([
-            token.lemma_ for token in document_a if not token.is_stop
+        return self.get_jaccard_index(
+            self.get_lemmas(document_a),
+            self.get_lemmas(document_b)
+        )
+
+    def compare_many(self, statement, other_statements, minimum_confidence=0, get_minimum_confidence=None):
+        """
+        Return the similarity of the input statement to each of the other
+        statements. The input is only processed once and the other statements
+        are processed in a single batch.
+
+        :rtype: Generator yielding one similarity at a time.
+        """
+        statement_lemmas = self.get_lemmas(self.nlp(statement.text.lower()))
+
+        other_documents = self.nlp.pipe([
+            other_statement.text.lower() for other_statement in other_statements
         ])
-        statement_b_lemmas = set([
-            token.lemma_ for token in document_b if not token.is_stop
+
+        for other_document in other_documents:
+            yield self.get_jaccard_index(statement_lemmas, self.get_lemmas(other_document))
+
+    def get_lemmas(self, document):
+        """
+        Return the set of lemmas of the tokens in a document that are not stopwords.
+        """
+        return set([
+            token.lemma_ for token in document if not token.is_stop
         ])
 
-        # Calculate Jaccard similarity
-        numerator = len(statement_a_lemmas.intersection(statement_b_lemmas))
-        denominator = float(len(statement_a_lemmas.union(statement_b_lemmas)))
+    def get_jaccard_index(self, lemmas_a, lemmas_b):
+        """
+        Calculate the Jaccard similarity of two sets of lemmas.
+        """
+        numerator = len(lemmas_a.intersection(lemmas_b))
+        denominator = float(len(lemmas_a.union(lemmas_b)))
         ratio = numerator / denominator
 
         return ratio
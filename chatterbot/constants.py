@@ -26,3 +26,11 @@ PERSONA_MAX_LENGTH = 50
 TAG_NAME_MAX_LENGTH = 50
 
 DEFAULT_DJANGO_APP_NAME = 'django_chatterbot'
+
+'''
+The spaCy pipeline components that are not loaded by default. The tagger
+and the spaCy based comparators only use the part-of-speech tags, lemmas
+and vectors of each document, so the dependency parser and the named
+entity recognizer do not need to run.
+'''
+DISABLED_SPACY_PIPES = ('parser', 'ner')
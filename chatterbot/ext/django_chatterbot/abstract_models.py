@@ -92,6 +92,14 @@ class AbstractBaseStatement(models.Model, StatementMixin):
 
     class Meta:
         abstract = True
+        indexes = [
+            # The statements of a conversation, in the order they were created
+            models.Index(fields=['conversation', 'id']),
+            # Responses to a statement, excluding those said by the bot
+            models.Index(fields=['search_in_response_to', 'persona']),
+            # Statements with a given text in a conversation
+            models.Index(fields=['text', 'conversation']),
+        ]
 
     def __str__(self):
         if len(self.text.strip()) > 60:
@@ -105,7 +113,7 @@ class AbstractBaseStatement(models.Model, StatementMixin):
         Return the list of tags for this statement.
         (Overrides the method from StatementMixin)
         """
-        return list(self.tags.values_list('name', flat=True))
+        return [tag.name for tag in self.tags.all()]
 
     def add_tags(self, *tags):
         """
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_chatterbot', '0018_text_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='statement',
+            index=models.Index(fields=['conversation', 'id'], name='django_chat_convers_e69094_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='statement',
+            index=models.Index(fields=['search_in_response_to', 'persona'], name='django_chat_search__62dec8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='statement',
+            index=models.Index(fields=['text', 'conversation'], name='django_chat_text_3da512_idx'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Table, Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declared_attr, declarative_base
@@ -53,6 +53,15 @@ class Statement(Base, StatementMixin):
     A Statement represents a sentence or phrase.
     """
 
+    __table_args__ = (
+        # The statements of a conversation, in the order they were created
+        Index('ix_statement_conversation_id', 'conversation', 'id'),
+        # Responses to a statement, excluding those said by the bot
+        Index('ix_statement_search_in_response_to_persona', 'search_in_response_to', 'persona'),
+        # Statements with a given text in a conversation
+        Index('ix_statement_text_conversation', 'text', 'conversation'),
+    )
+
     confidence = 0
 
     text = Column(
@@ -6,10 +6,7 @@ def get_recent_repeated_responses(chatbot, conversation, sample=10, threshold=3,
     from collections import Counter
 
     # Get the most recent statements from the conversation
-    conversation_statements = list(chatbot.storage.filter(
-        conversation=conversation,
-        order_by=['id']
-    ))[sample * -1:]
+    conversation_statements = chatbot.get_latest_statements(conversation, sample)
 
     text_of_recent_responses = [
         statement.text for statement in conversation_statements
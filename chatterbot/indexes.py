@@ -0,0 +1,1087 @@
+"""
+In-process indexes that can be attached to a storage adapter to reduce
+the number of statements that need to be loaded when searching.
+
+Indexes are built from the statements that already exist in the database
+and the storage adapter keeps them up to date as statements are created,
+updated and removed. Because they live in the memory of the current
+process, changes written to the database by other processes will not be
+reflected in the index until it is rebuilt.
+"""
+from collections import OrderedDict, deque
+from threading import RLock
+
+
+class StatementIndex(object):
+    """
+    This is an abstract class that represents the interface
+    that all statement indexes should implement.
+    """
+
+    def __init__(self):
+        self.lock = RLock()
+
+    def build(self, statements):
+        """
+        Populate the index using the provided statements.
+        Any existing entries in the index are discarded.
+        """
+        with self.lock:
+            self.clear()
+
+            for statement in statements:
+                self.add(statement)
+
+    def add(self, statement):
+        """
+        Add a statement to the index, replacing any entry that
+        already exists for a statement with the same id.
+        """
+        raise NotImplementedError(
+            'The `add` method is not implemented by this index.'
+        )
+
+    def add_many(self, statements):
+        """
+        Add multiple statements to the index. Indexes can override
+        this method to process a batch of statements more efficiently.
+        """
+        with self.lock:
+            for statement in statements:
+                self.add(statement)
+
+    def remove(self, statement_id):
+        """
+        Remove the statement with the given id from the index.
+        """
+        raise NotImplementedError(
+            'The `remove` method is not implemented by this index.'
+        )
+
+    def clear(self):
+        """
+        Remove all entries from the index.
+        """
+        raise NotImplementedError(
+            'The `clear` method is not implemented by this index.'
+        )
+
+
+class InvertedIndex(StatementIndex):
+    """
+    An index that maps each of the tokens in the ``search_text`` of
+    a statement to the ids of the statements that contain the token.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        # Token -> set of statement ids
+        self.postings = {}
+
+        # Statement id -> set of tokens, used to update and remove entries
+        self.statement_tokens = {}
+
+    def __len__(self):
+        return len(self.statement_tokens)
+
+    def add(self, statement):
+        if statement.id is None:
+            return
+
+        tokens = set((statement.search_text or '').split())
+
+        with self.lock:
+            self.remove(statement.id)
+
+            for token in tokens:
+                self.postings.setdefault(token, set()).add(statement.id)
+
+            self.statement_tokens[statement.id] = tokens
+
+    def remove(self, statement_id):
+        with self.lock:
+            tokens = self.statement_tokens.pop(statement_id, ())
+
+            for token in tokens:
+                statement_ids = self.postings.get(token)
+
+                if statement_ids is not None:
+                    statement_ids.discard(statement_id)
+
+                    if not statement_ids:
+                        del self.postings[token]
+
+    def clear(self):
+        with self.lock:
+            self.postings = {}
+            self.statement_tokens = {}
+
+    def search(self, search_text):
+        """
+        Return the ids of the statements that share at least
+        one token with the provided search text.
+
+        :param search_text: A string of space separated tokens, such as
+            the value produced by the tagger of a storage adapter.
+        :type search_text: str
+
+        :rtype: set
+        """
+        statement_ids = set()
+
+        with self.lock:
+            for token in set(search_text.split()):
+                statement_ids.update(self.postings.get(token, ()))
+
+        return statement_ids
+
+
+class LengthIndex(StatementIndex):
+    """
+    An index that groups the ids of statements by the
+    length of the lowercase text of each statement.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        # Text length -> set of statement ids
+        self.buckets = {}
+
+        # Statement id -> text length, used to update and remove entries
+        self.statement_lengths = {}
+
+    def __len__(self):
+        return len(self.statement_lengths)
+
+    def get_text_length(self, text):
+        """
+        Return the normalized length of a statement's text.
+        """
+        return len(str(text or '').lower())
+
+    def add(self, statement):
+        if statement.id is None:
+            return
+
+        length = self.get_text_length(statement.text)
+
+        with self.lock:
+            self.remove(statement.id)
+
+            self.buckets.setdefault(length, set()).add(statement.id)
+            self.statement_lengths[statement.id] = length
+
+    def remove(self, statement_id):
+        with self.lock:
+            length = self.statement_lengths.pop(statement_id, None)
+
+            if length is not None:
+                statement_ids = self.buckets[length]
+                statement_ids.discard(statement_id)
+
+                if not statement_ids:
+                    del self.buckets[length]
+
+    def clear(self):
+        with self.lock:
+            self.buckets = {}
+            self.statement_lengths = {}
+
+    def get_lengths(self):
+        """
+        Return a list of the text lengths that have statements.
+        """
+        with self.lock:
+            return sorted(self.buckets.keys())
+
+    def get_statement_ids(self, length):
+        """
+        Return the ids of the statements with text of the given length.
+        """
+        with self.lock:
+            return set(self.buckets.get(length, ()))
+
+
+class BM25Index(StatementIndex):
+    """
+    An index of the tokens in the ``search_text`` of each statement that
+    keeps the statistics needed to rank statements using the Okapi BM25
+    ranking function. The statistics are updated incrementally as
+    statements are added to and removed from the index.
+
+    :param k1: Controls how quickly the score of a token saturates
+        as it is repeated in a statement.
+    :type k1: float
+
+    :param b: Controls how much the score of a statement
+        is normalized by the number of tokens it contains.
+    :type b: float
+
+    :param persona_not_startswith: Statements with a persona that starts
+        with this value are not added to the index.
+    :type persona_not_startswith: str
+    """
+
+    def __init__(self, k1=1.2, b=0.75, persona_not_startswith=None):
+        super().__init__()
+
+        self.k1 = k1
+        self.b = b
+        self.persona_not_startswith = persona_not_startswith
+
+        # Token -> {statement id: number of times the token occurs}
+        self.postings = {}
+
+        # Statement id -> list of tokens, used to update and remove entries
+        self.statement_tokens = {}
+
+        self.total_token_count = 0
+
+    def __len__(self):
+        return len(self.statement_tokens)
+
+    def add(self, statement):
+        if statement.id is None:
+            return
+
+        with self.lock:
+            self.remove(statement.id)
+
+            persona = statement.persona or ''
+
+            if self.persona_not_startswith and persona.startswith(self.persona_not_startswith):
+                return
+
+            tokens = (statement.search_text or '').split()
+
+            for token in tokens:
+                token_counts = self.postings.setdefault(token, {})
+                token_counts[statement.id] = token_counts.get(statement.id, 0) + 1
+
+            self.statement_tokens[statement.id] = tokens
+            self.total_token_count += len(tokens)
+
+    def remove(self, statement_id):
+        with self.lock:
+            tokens = self.statement_tokens.pop(statement_id, None)
+
+            if tokens is None:
+                return
+
+            self.total_token_count -= len(tokens)
+
+            for token in set(tokens):
+                token_counts = self.postings.get(token)
+
+                if token_counts is not None:
+                    token_counts.pop(statement_id, None)
+
+                    if not token_counts:
+                        del self.postings[token]
+
+    def clear(self):
+        with self.lock:
+            self.postings = {}
+            self.statement_tokens = {}
+            self.total_token_count = 0
+
+    def get_inverse_document_frequency(self, token):
+        """
+        Return the weight of a token, which is higher the fewer statements contain it.
+        """
+        import math
+
+        statement_count = len(self.statement_tokens)
+        document_frequency = len(self.postings.get(token, ()))
+
+        return math.log(
+            1 + (statement_count - document_frequency + 0.5) / (document_frequency + 0.5)
+        )
+
+    def search(self, search_text, limit):
+        """
+        Return the ids of the statements with the highest BM25 score for
+        the tokens in the search text, ordered from the highest score to
+        the lowest. Statements that share no tokens with the search text
+        are not included.
+
+        :param search_text: A string of space separated tokens, such as
+            the value produced by the tagger of a storage adapter.
+        :type search_text: str
+
+        :param limit: The maximum number of statement ids to return.
+        :type limit: int
+
+        :rtype: list
+        """
+        from heapq import nlargest
+
+        scores = {}
+
+        with self.lock:
+            if not self.statement_tokens:
+                return []
+
+            average_token_count = self.total_token_count / len(self.statement_tokens)
+
+            for token in sorted(set(search_text.split())):
+                token_counts = self.postings.get(token)
+
+                if not token_counts:
+                    continue
+
+                inverse_document_frequency = self.get_inverse_document_frequency(token)
+
+                for statement_id, token_count in token_counts.items():
+                    statement_token_count = len(self.statement_tokens[statement_id])
+
+                    normalization = self.k1 * (
+                        1 - self.b + self.b * statement_token_count / (average_token_count or 1)
+                    )
+
+                    scores[statement_id] = scores.get(statement_id, 0) + inverse_document_frequency * (
+                        token_count * (self.k1 + 1) / (token_count + normalization)
+                    )
+
+        return nlargest(limit, scores, key=scores.get)
+
+
+class MinHashIndex(StatementIndex):
+    """
+    An index for finding statements with text that is approximately
+    similar to a given text, without comparing the text to every statement.
+
+    A MinHash signature is calculated for the set of character shingles in
+    the lowercase text of each statement. The signatures are split into bands
+    and statements with an identical band in their signatures are likely
+    to have similar text (locality-sensitive hashing).
+
+    :param permutation_count: The number of hash functions used to
+        calculate each signature.
+    :type permutation_count: int
+
+    :param band_count: The number of bands each signature is split into.
+        More bands find statements that are less similar to the search text.
+    :type band_count: int
+
+    :param shingle_size: The number of characters in each shingle.
+    :type shingle_size: int
+
+    :param path: The path of a file that the signatures are saved to so that
+        they do not have to be calculated again when the index is rebuilt.
+        Defaults to None, in which case the signatures are not saved.
+    :type path: str
+
+    :param persona_not_startswith: Statements with a persona that starts
+        with this value are not added to the index.
+    :type persona_not_startswith: str
+    """
+
+    # A Mersenne prime larger than the 32 bit hash of a shingle
+    PRIME = (1 << 61) - 1
+
+    FILE_FORMAT_VERSION = 1
+
+    def __init__(self, permutation_count=64, band_count=16, shingle_size=3, path=None, persona_not_startswith=None):
+        import random
+
+        super().__init__()
+
+        if permutation_count % band_count:
+            raise self.InvalidParametersException(
+                'The permutation count must be divisible by the band count.'
+            )
+
+        self.permutation_count = permutation_count
+        self.band_count = band_count
+        self.rows_per_band = permutation_count // band_count
+        self.shingle_size = shingle_size
+        self.path = path
+        self.persona_not_startswith = persona_not_startswith
+
+        # Use a fixed seed so that saved signatures remain valid
+        random_generator = random.Random(permutation_count)
+
+        self.permutations = [
+            (random_generator.randrange(1, self.PRIME), random_generator.randrange(0, self.PRIME))
+            for _ in range(permutation_count)
+        ]
+
+        # Statement id -> (hash of the statement text, signature)
+        self.signatures = {}
+
+        # (band number, band values) -> set of statement ids
+        self.bands = {}
+
+        # Set when the signatures have changed since they were last saved
+        self.modified = False
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def get_parameters(self):
+        return (self.permutation_count, self.band_count, self.shingle_size, )
+
+    def get_text_hash(self, text):
+        import zlib
+
+        return zlib.crc32(text.encode('utf-8'))
+
+    def get_shingles(self, text):
+        """
+        Return the set of overlapping character sequences in the text.
+        """
+        text = text.lower()
+
+        if len(text) <= self.shingle_size:
+            return {text}
+
+        return {
+            text[index:index + self.shingle_size]
+            for index in range(0, len(text) - self.shingle_size + 1)
+        }
+
+    def get_signature(self, text):
+        """
+        Return the MinHash signature of the text.
+        """
+        shingle_hashes = [
+            self.get_text_hash(shingle) for shingle in self.get_shingles(text)
+        ]
+
+        return tuple(
+            min((a * shingle_hash + b) % self.PRIME for shingle_hash in shingle_hashes)
+            for a, b in self.permutations
+        )
+
+    def get_bands(self, signature):
+        for band_number in range(0, self.band_count):
+            start_index = band_number * self.rows_per_band
+
+            yield (band_number, signature[start_index:start_index + self.rows_per_band], )
+
+    def build(self, statements):
+        saved_signatures = self.load()
+
+        with self.lock:
+            self.clear()
+
+            for statement in statements:
+                self.add(statement, saved_signatures=saved_signatures)
+
+            # Only save when signatures were calculated or removed
+            self.modified = self.modified or len(saved_signatures) != len(self.signatures)
+
+        self.save()
+
+    def add(self, statement, saved_signatures=None):
+        if statement.id is None:
+            return
+
+        with self.lock:
+            self.remove(statement.id)
+
+            persona = statement.persona or ''
+
+            if self.persona_not_startswith and persona.startswith(self.persona_not_startswith):
+                return
+
+            if not statement.text:
+                return
+
+            text = str(statement.text)
+            text_hash = self.get_text_hash(text)
+
+            saved_text_hash, signature = (saved_signatures or {}).get(statement.id, (None, None, ))
+
+            if saved_text_hash != text_hash:
+                signature = self.get_signature(text)
+                self.modified = True
+
+            self.signatures[statement.id] = (text_hash, signature, )
+
+            for band in self.get_bands(signature):
+                self.bands.setdefault(band, set()).add(statement.id)
+
+    def remove(self, statement_id):
+        with self.lock:
+            entry = self.signatures.pop(statement_id, None)
+
+            if entry is None:
+                return
+
+            self.modified = True
+
+            for band in self.get_bands(entry[1]):
+                statement_ids = self.bands.get(band)
+
+                if statement_ids is not None:
+                    statement_ids.discard(statement_id)
+
+                    if not statement_ids:
+                        del self.bands[band]
+
+    def clear(self):
+        with self.lock:
+            if self.signatures:
+                self.modified = True
+
+            self.signatures = {}
+            self.bands = {}
+
+    def search(self, text, limit):
+        """
+        Return the ids of the statements that are likely to have text
+        similar to the provided text, ordered by their estimated similarity
+        from the highest to the lowest.
+
+        :param text: The text to search for.
+        :type text: str
+
+        :param limit: The maximum number of statement ids to return.
+        :type limit: int
+
+        :rtype: list
+        """
+        from heapq import nlargest
+
+        if not text:
+            return []
+
+        signature = self.get_signature(str(text))
+
+        candidate_ids = set()
+
+        with self.lock:
+            for band in self.get_bands(signature):
+                candidate_ids.update(self.bands.get(band, ()))
+
+            # The fraction of equal values estimates the Jaccard similarity
+            similarities = {
+                statement_id: sum(
+                    value == other_value for value, other_value in zip(
+                        signature, self.signatures[statement_id][1]
+                    )
+                ) for statement_id in candidate_ids
+            }
+
+        return nlargest(limit, sorted(similarities), key=similarities.get)
+
+    def load(self):
+        """
+        Return the signatures saved to the file of the index. An empty
+        dictionary is returned if there is no file or if it was saved
+        using different parameters.
+        """
+        import os
+        import pickle
+
+        if not self.path or not os.path.exists(self.path):
+            return {}
+
+        with open(self.path, 'rb') as signature_file:
+            data = pickle.load(signature_file)
+
+        if data.get('version') != self.FILE_FORMAT_VERSION or data.get('parameters') != self.get_parameters():
+            return {}
+
+        return data['signatures']
+
+    def save(self):
+        """
+        Save the signatures to the file of the index if they have changed.
+        """
+        import os
+        import pickle
+
+        if not self.path or not self.modified:
+            return
+
+        with self.lock:
+            data = {
+                'version': self.FILE_FORMAT_VERSION,
+                'parameters': self.get_parameters(),
+                'signatures': dict(self.signatures),
+            }
+            self.modified = False
+
+        # Write to a temporary file first so that other processes
+        # never read a partially written file
+        temporary_path = '{}.{}.tmp'.format(self.path, os.getpid())
+
+        with open(temporary_path, 'wb') as signature_file:
+            pickle.dump(data, signature_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temporary_path, self.path)
+
+    class InvalidParametersException(Exception):
+        pass
+
+
+class VectorIndex(StatementIndex):
+    """
+    An index of a vector for the text of each statement. The vectors are
+    normalized and kept as the rows of a contiguous float32 matrix, so the
+    cosine similarity of a text to every statement in the index is
+    calculated with a single matrix-vector product.
+
+    :param get_vectors: A callable that takes a list of texts and returns
+        a two dimensional array containing one vector for each text.
+    :type get_vectors: collections.abc.Callable
+
+    :param path: The path of a file that the matrix is saved to and
+        memory-mapped from, so that the vectors do not have to be calculated
+        again when the index is rebuilt. The ids of the statements in each row
+        are saved to a file with the same path followed by ``.ids``.
+        The saved matrix is mapped read-only and can be shared by several
+        processes. Each process copies it into its own memory the first time
+        its index changes, and saving replaces the files instead of writing
+        to them. Defaults to None, in which case the matrix is not saved.
+    :type path: str
+
+    :param persona_not_startswith: Statements with a persona that starts
+        with this value are not added to the index.
+    :type persona_not_startswith: str
+
+    :param batch_size: The maximum number of texts to pass to
+        ``get_vectors`` at a time when the index is built.
+    :type batch_size: int
+    """
+
+    FILE_FORMAT_VERSION = 2
+
+    def __init__(self, get_vectors, path=None, persona_not_startswith=None, batch_size=1000):
+        super().__init__()
+
+        self.get_vectors = get_vectors
+        self.path = path
+        self.persona_not_startswith = persona_not_startswith
+        self.batch_size = batch_size
+
+        self.matrix = None
+        self.row_count = 0
+
+        # The statement id and text hash of each row of the matrix
+        self.row_ids = []
+        self.row_text_hashes = []
+
+        # Statement id -> row number
+        self.rows = {}
+
+        # Set when the index has changed since it was last saved
+        self.modified = False
+
+    def __len__(self):
+        return self.row_count
+
+    def get_ids_path(self):
+        return '{}.ids'.format(self.path)
+
+    def get_text_hash(self, text):
+        import zlib
+
+        return zlib.crc32(text.encode('utf-8'))
+
+    def get_normalized_vectors(self, texts):
+        """
+        Return the vectors for the texts scaled to a length of one.
+        """
+        import numpy
+
+        vectors = numpy.asarray(self.get_vectors(texts), dtype=numpy.float32)
+
+        norms = numpy.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+
+        return vectors / norms
+
+    def set_modified(self):
+        """
+        Mark the index as changed. The matrix is copied out of
+        the read-only memory-mapped file before it is changed.
+        """
+        import numpy
+
+        if self.matrix is not None and not self.matrix.flags.writeable:
+            self.matrix = numpy.array(self.matrix)
+
+        self.modified = True
+
+    def allocate(self, capacity, dimensions):
+        """
+        Replace the matrix with one that has room for the given number of rows,
+        keeping the rows that are currently in use.
+        """
+        import numpy
+
+        matrix = numpy.zeros((capacity, dimensions, ), dtype=numpy.float32)
+
+        if self.matrix is not None:
+            matrix[:self.row_count] = self.matrix[:self.row_count]
+
+        self.matrix = matrix
+
+    def is_indexed(self, statement):
+        persona = statement.persona or ''
+
+        if self.persona_not_startswith and persona.startswith(self.persona_not_startswith):
+            return False
+
+        return statement.id is not None and bool(statement.text)
+
+    def add(self, statement):
+        self.add_many([statement])
+
+    def add_many(self, statements):
+        with self.lock:
+            new_statements = []
+
+            for statement in statements:
+                if statement.id is not None:
+                    self.remove(statement.id)
+
+                if self.is_indexed(statement):
+                    new_statements.append(statement)
+
+            if not new_statements:
+                return
+
+            texts = [str(statement.text) for statement in new_statements]
+            vectors = self.get_normalized_vectors(texts)
+
+            self.set_modified()
+
+            required_rows = self.row_count + len(new_statements)
+
+            if self.matrix is None or self.matrix.shape[0] < required_rows:
+                self.allocate(max(required_rows, 2 * self.row_count, 64), vectors.shape[1])
+
+            self.matrix[self.row_count:required_rows] = vectors
+
+            for statement, text in zip(new_statements, texts):
+                self.rows[statement.id] = self.row_count
+                self.row_ids.append(statement.id)
+                self.row_text_hashes.append(self.get_text_hash(text))
+                self.row_count += 1
+
+    def remove(self, statement_id):
+        with self.lock:
+            row = self.rows.pop(statement_id, None)
+
+            if row is None:
+                return
+
+            self.set_modified()
+
+            last_row = self.row_count - 1
+
+            # Move the last row into the place of the removed row
+            if row != last_row:
+                self.matrix[row] = self.matrix[last_row]
+                self.row_ids[row] = self.row_ids[last_row]
+                self.row_text_hashes[row] = self.row_text_hashes[last_row]
+                self.rows[self.row_ids[row]] = row
+
+            self.row_ids.pop()
+            self.row_text_hashes.pop()
+            self.row_count -= 1
+
+    def clear(self):
+        with self.lock:
+            if self.row_count:
+                self.set_modified()
+
+            self.rows = {}
+            self.row_ids = []
+            self.row_text_hashes = []
+            self.row_count = 0
+
+    def build(self, statements):
+        """
+        Populate the index using the provided statements. When the index has
+        a saved matrix, vectors are only calculated for statements that were
+        added or that have changed since the matrix was saved.
+        """
+        from itertools import islice
+
+        with self.lock:
+            self.clear()
+            self.load()
+
+            # Discard a saved matrix that was created using vectors of a different size
+            if self.row_count and self.matrix.shape[1] != self.get_normalized_vectors(['']).shape[1]:
+                self.matrix = None
+                self.clear()
+
+            unseen_ids = set(self.rows.keys())
+
+            statement_iterator = iter(statements)
+            batch = list(islice(statement_iterator, self.batch_size))
+
+            while batch:
+                new_statements = []
+
+                for statement in batch:
+                    row = self.rows.get(statement.id)
+
+                    if row is not None and self.is_indexed(statement):
+                        if self.row_text_hashes[row] == self.get_text_hash(str(statement.text)):
+                            unseen_ids.discard(statement.id)
+                            continue
+
+                    new_statements.append(statement)
+                    unseen_ids.discard(statement.id)
+
+                self.add_many(new_statements)
+
+                batch = list(islice(statement_iterator, self.batch_size))
+
+            # Remove statements that no longer exist
+            for statement_id in unseen_ids:
+                self.remove(statement_id)
+
+        self.save()
+
+    def search(self, text, limit):
+        """
+        Return the ids of the statements with the vectors most similar to the
+        vector of the provided text, with their cosine similarity, ordered from
+        the highest similarity to the lowest.
+
+        :param text: The text to search for.
+        :type text: str
+
+        :param limit: The maximum number of results to return.
+        :type limit: int
+
+        :rtype: list of (statement id, similarity) tuples
+        """
+        import numpy
+
+        if not text or limit < 1:
+            return []
+
+        vector = self.get_normalized_vectors([str(text)])[0]
+
+        with self.lock:
+            if not self.row_count:
+                return []
+
+            similarities = self.matrix[:self.row_count].dot(vector)
+
+            if limit < self.row_count:
+                top_rows = numpy.argpartition(-similarities, limit - 1)[:limit]
+            else:
+                top_rows = numpy.arange(self.row_count)
+
+            top_rows = top_rows[numpy.argsort(-similarities[top_rows], kind='stable')]
+
+            return [
+                (self.row_ids[row], float(similarities[row]), ) for row in top_rows
+            ]
+
+    def load(self):
+        """
+        Load the saved matrix and the ids of its rows if they exist.
+        """
+        import os
+        import pickle
+        import numpy
+
+        if not self.path or not os.path.exists(self.path) or not os.path.exists(self.get_ids_path()):
+            return
+
+        with open(self.get_ids_path(), 'rb') as ids_file:
+            data = pickle.load(ids_file)
+
+        if data.get('version') != self.FILE_FORMAT_VERSION or not data['row_ids']:
+            return
+
+        matrix_file = self.get_file_signature(self.path)
+        matrix = numpy.load(self.path, mmap_mode='r')
+
+        # Skip a matrix that was replaced by another process after the ids
+        # were saved, or while it was being opened
+        if data['matrix_file'] != matrix_file or self.get_file_signature(self.path) != matrix_file:
+            return
+
+        self.matrix = matrix
+        self.row_ids = data['row_ids']
+        self.row_text_hashes = data['row_text_hashes']
+        self.row_count = len(self.row_ids)
+        self.rows = {
+            statement_id: row for row, statement_id in enumerate(self.row_ids)
+        }
+        self.modified = False
+
+    def save(self):
+        """
+        Write the matrix to disk and save the ids of its rows if the index has changed.
+        """
+        import os
+        import pickle
+        import tempfile
+        import numpy
+
+        if not self.path or not self.modified:
+            return
+
+        with self.lock:
+            if self.matrix is None:
+                return
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+
+            # Write both files under new names and then move them into place,
+            # so that other processes never see a partially written file
+            handle, matrix_path = tempfile.mkstemp(dir=directory, suffix='.tmp.npy')
+
+            with os.fdopen(handle, 'wb') as matrix_file:
+                numpy.save(matrix_file, self.matrix[:self.row_count])
+
+            data = {
+                'version': self.FILE_FORMAT_VERSION,
+                'matrix_file': self.get_file_signature(matrix_path),
+                'row_ids': list(self.row_ids),
+                'row_text_hashes': list(self.row_text_hashes),
+            }
+
+            handle, ids_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+
+            with os.fdopen(handle, 'wb') as ids_file:
+                pickle.dump(data, ids_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(matrix_path, self.path)
+            os.replace(ids_path, self.get_ids_path())
+
+            self.modified = False
+
+    def get_file_signature(self, path):
+        """
+        Return values that identify the current version of a file, which are
+        saved with the ids to check that they belong to the saved matrix.
+        """
+        import os
+
+        file_status = os.stat(path)
+
+        return (file_status.st_ino, file_status.st_size, file_status.st_mtime_ns, )
+
+
+class ConversationIndex(StatementIndex):
+    """
+    An index of the most recent statements in each conversation.
+
+    The statements of a conversation are loaded from the database the
+    first time the conversation is read, and are then kept up to date as
+    statements are written. Only the conversations that were read most
+    recently are kept in memory.
+
+    :param size: The number of statements kept for each conversation.
+    :type size: int
+
+    :param conversation_count: The number of conversations kept in memory.
+    :type conversation_count: int
+    """
+
+    def __init__(self, size=20, conversation_count=1000):
+        super().__init__()
+
+        self.size = size
+        self.conversation_count = conversation_count
+
+        # Conversation -> the latest statements, oldest first
+        self.conversations = OrderedDict()
+
+        # Statement id -> conversation, used to update and remove entries
+        self.statement_conversations = {}
+
+    def __len__(self):
+        return len(self.statement_conversations)
+
+    def build(self, statements):
+        # Conversations are loaded when they are first read
+        self.clear()
+
+    def add(self, statement):
+        if statement.id is None:
+            return
+
+        with self.lock:
+            conversation = self.statement_conversations.get(statement.id)
+
+            if conversation == statement.conversation:
+                statements = self.conversations[conversation]
+
+                for position, existing_statement in enumerate(statements):
+                    if existing_statement.id == statement.id:
+                        statements[position] = statement
+
+                return
+
+            if conversation is not None:
+                # The statement was moved to another conversation
+                self.forget(conversation)
+
+            statements = self.conversations.get(statement.conversation)
+
+            # Conversations that have not been read are loaded when needed
+            if statements is None:
+                return
+
+            if len(statements) >= self.size:
+                del self.statement_conversations[statements.popleft().id]
+
+            statements.append(statement)
+            self.statement_conversations[statement.id] = statement.conversation
+
+    def remove(self, statement_id):
+        with self.lock:
+            conversation = self.statement_conversations.get(statement_id)
+
+            # The conversation is loaded again so that it contains
+            # the statement that came before the removed statements
+            if conversation is not None:
+                self.forget(conversation)
+
+    def clear(self):
+        with self.lock:
+            self.conversations = OrderedDict()
+            self.statement_conversations = {}
+
+    def forget(self, conversation):
+        """
+        Remove the statements of a conversation from the index.
+        """
+        with self.lock:
+            for statement in self.conversations.pop(conversation, ()):
+                self.statement_conversations.pop(statement.id, None)
+
+    def get_latest_statements(self, conversation, load):
+        """
+        Return the latest statements in a conversation, oldest first.
+
+        :param load: A function that returns the given number of the latest
+            statements in a conversation from the database, oldest first.
+            It is called if the conversation is not in the index.
+        """
+        with self.lock:
+            statements = self.conversations.get(conversation)
+
+            if statements is None:
+                statements = deque()
+
+                self.conversations[conversation] = statements
+
+                for statement in load(conversation, self.size):
+                    statements.append(statement)
+                    self.statement_conversations[statement.id] = conversation
+
+                while len(self.conversations) > self.conversation_count:
+                    self.forget(next(iter(self.conversations)))
+            else:
+                self.conversations.move_to_end(conversation)
+
+            return list(statements)
@@ -0,0 +1,210 @@
+"""
+Saving of the statements that a chat bot learns from a background thread.
+"""
+import atexit
+import logging
+import time
+from collections import OrderedDict
+from queue import Empty, Queue
+from threading import Lock, Thread
+
+
+# Queue items that tell the worker thread to write its batch immediately
+FLUSH = 'flush'
+CLOSE = 'close'
+
+
+class LearningQueue(object):
+    """
+    A bounded queue of statements that are saved to the storage adapter
+    in batches by a background thread, so that a chat bot can return a
+    response without waiting for the database.
+
+    :param storage: The storage adapter that statements are saved to.
+    :type storage: StorageAdapter
+
+    :param maximum_size: The number of writes that can be waiting to be saved.
+        Adding a write to a full queue blocks until there is space in the queue.
+    :type maximum_size: int
+
+    :param batch_size: The number of statements saved with each call to
+        the ``create_many`` method of the storage adapter.
+    :type batch_size: int
+
+    :param flush_interval: The maximum number of seconds that a statement
+        waits for more statements to be added to its batch.
+    :type flush_interval: float
+
+    Statements in a batch that can not be saved are kept as pending, and a
+    ``WriteError`` is raised by the next call to ``flush`` or ``close``.
+    """
+
+    def __init__(self, storage, maximum_size=1000, batch_size=100, flush_interval=1.0, **kwargs):
+        self.storage = storage
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.logger = kwargs.get('logger', logging.getLogger(__name__))
+
+        self.queue = Queue(maxsize=maximum_size)
+
+        # Statements that have been added but have not been saved yet
+        self.pending = OrderedDict()
+        self.pending_lock = Lock()
+
+        # Statements that could not be saved, and the first error that occurred
+        self.failed_statements = []
+        self.write_error = None
+
+        self.closed = False
+
+        self.thread = Thread(target=self.run, name='chatterbot-learning-queue', daemon=True)
+        self.thread.start()
+
+        # Save any remaining statements when the interpreter exits
+        atexit.register(self.close)
+
+    def put(self, *statements):
+        """
+        Add statements to be saved. The statements are saved together in the
+        same batch. Statements added after the queue is closed are saved
+        immediately.
+        """
+        if self.closed:
+            self.storage.create_many(list(statements))
+            return
+
+        with self.pending_lock:
+            for statement in statements:
+                self.pending[id(statement)] = statement
+
+        self.queue.put(statements)
+
+    def get_pending(self, conversation):
+        """
+        Return the statements in a conversation that have not been saved
+        yet, in the order that they were added.
+        """
+        with self.pending_lock:
+            return [
+                statement for statement in self.pending.values()
+                if statement.conversation == conversation
+            ]
+
+    def get_batch(self):
+        """
+        Wait for the next batch of queue items. A batch ends when it contains
+        enough statements, when the flush interval has passed since the first
+        item was received, or when a flush is requested.
+        """
+        items = [self.queue.get()]
+        statement_count = 0
+        deadline = time.monotonic() + self.flush_interval
+
+        while items[-1] not in (FLUSH, CLOSE, ):
+            statement_count += len(items[-1])
+
+            timeout = deadline - time.monotonic()
+
+            if statement_count >= self.batch_size or timeout <= 0:
+                break
+
+            try:
+                items.append(self.queue.get(timeout=timeout))
+            except Empty:
+                break
+
+        return items
+
+    def write(self, statements):
+        """
+        Save a batch of statements.
+        """
+        try:
+            self.storage.create_many(statements)
+        except Exception as error:
+            self.logger.exception('Unable to save {} learned statements'.format(len(statements)))
+
+            with self.pending_lock:
+                self.failed_statements.extend(statements)
+
+                if self.write_error is None:
+                    self.write_error = error
+        else:
+            with self.pending_lock:
+                for statement in statements:
+                    self.pending.pop(id(statement), None)
+
+    def raise_write_error(self):
+        """
+        Raise a ``WriteError`` for the statements that could not be saved
+        since the last time this method was called, if there are any.
+        The statements are no longer pending once the error is raised.
+        """
+        with self.pending_lock:
+            failed_statements = self.failed_statements
+            write_error = self.write_error
+
+            self.failed_statements = []
+            self.write_error = None
+
+            for statement in failed_statements:
+                self.pending.pop(id(statement), None)
+
+        if failed_statements:
+            raise self.WriteError(failed_statements, write_error)
+
+    def run(self):
+        """
+        Save the statements in the queue until the queue is closed.
+        """
+        closing = False
+
+        while not closing:
+            items = self.get_batch()
+
+            statements = [
+                statement for item in items if item not in (FLUSH, CLOSE, )
+                for statement in item
+            ]
+
+            if statements:
+                self.write(statements)
+
+            closing = CLOSE in items
+
+            for _ in items:
+                self.queue.task_done()
+
+    def flush(self):
+        """
+        Wait until every statement that has been added is saved.
+        Raises a ``WriteError`` if any of the statements could not be saved.
+        """
+        if not self.closed:
+            self.queue.put(FLUSH)
+            self.queue.join()
+
+        self.raise_write_error()
+
+    def close(self):
+        """
+        Save the remaining statements and stop the background thread.
+        Raises a ``WriteError`` if any of the statements could not be saved.
+        """
+        if not self.closed:
+            self.closed = True
+            self.queue.put(CLOSE)
+            self.thread.join()
+
+            self.raise_write_error()
+
+    class WriteError(Exception):
+        """
+        Exception raised when learned statements could not be saved.
+        The statements are available as the ``statements`` attribute.
+        """
+
+        def __init__(self, statements, error):
+            super().__init__('Unable to save {} learned statements: {}'.format(len(statements), error))
+            self.statements = statements
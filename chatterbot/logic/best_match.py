@@ -23,18 +23,16 @@ class BestMatch(LogicAdapter):
         self.excluded_words = kwargs.get('excluded_words')
 
     def process(self, input_statement, additional_response_selection_parameters=None):
-        search_results = self.search_algorithm.search(input_statement)
+        # Search for the closest match to the input statement, stopping
+        # the search if a match that is close enough is found
+        search_results = self.search_algorithm.search_top_k(
+            input_statement,
+            1,
+            early_exit_confidence=self.maximum_similarity_threshold
+        )
 
         # Use the input statement as the closest match if no other results are found
-        closest_match = next(search_results, input_statement)
-
-        # Search for the closest match to the input statement
-        for result in search_results:
-            closest_match = result
-
-            # Stop searching if a match that is close enough is found
-            if result.confidence >= self.maximum_similarity_threshold:
-                break
+        closest_match = search_results[0] if search_results else input_statement
 
         self.chatbot.logger.info('Using "{}" as a close match to "{}" with a confidence of {}'.format(
             closest_match.text, input_statement.text, closest_match.confidence
@@ -57,7 +55,7 @@ class BestMatch(LogicAdapter):
         }
 
         alternate_response_selection_parameters = {
-            'search_in_response_to': self.chatbot.storage.tagger.get_text_index_string(
+            'search_in_response_to': input_statement.search_text or self.chatbot.storage.tagger.get_text_index_string(
                 input_statement.text
             ),
             'exclude_text': recent_repeated_responses,
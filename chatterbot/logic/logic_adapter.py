@@ -44,6 +44,13 @@ class LogicAdapter(Adapter):
             self.search_algorithm_name
         ]
 
+        # Build the index of the search algorithm now, so that it is kept up to
+        # date as statements are created rather than built by the first search
+        get_index = getattr(self.search_algorithm, 'get_index', None)
+
+        if get_index is not None:
+            get_index()
+
         self.maximum_similarity_threshold = kwargs.get(
             'maximum_similarity_threshold', 0.95
         )
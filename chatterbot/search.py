@@ -1,3 +1,196 @@
+from heapq import heappush, heapreplace
+from itertools import islice
+from chatterbot import constants
+from chatterbot.exceptions import OptionalDependencyImportError
+from chatterbot.utils import get_spacy_model
+
+
+# The fields of the statements that are loaded when searching. Tags and
+# the creation date are left out because they are not used by searches.
+SEARCH_FIELDS = [
+    'text',
+    'search_text',
+    'conversation',
+    'persona',
+    'in_response_to',
+    'search_in_response_to',
+]
+
+# The largest number of statement ids that are loaded in one query. SQLite
+# versions before 3.32 do not allow more than 999 parameters in a query.
+MAXIMUM_IDS_PER_QUERY = 500
+
+
+def get_scored_statements(compare_statements, input_statement, statement_list, page_size,
+                          get_minimum_confidence=None, early_exit_confidence=None):
+    """
+    Compare each statement to the input, one page of statements at a time.
+    Comparators that provide a ``compare_many`` method are given each page
+    in a single call so that they can score the whole page at once.
+
+    :param get_minimum_confidence: A callable returning the confidence that a
+        statement currently has to exceed to be of interest. It is passed to
+        ``compare_many`` so that the comparator can skip statements that
+        cannot exceed it.
+
+    :param early_exit_confidence: Stop comparing statements as soon as one has
+        a confidence that is greater than or equal to this value.
+
+    :rtype: Generator yielding a (statement, confidence) tuple at a time.
+    """
+    compare_many = getattr(compare_statements, 'compare_many', None)
+
+    if compare_many is None:
+        scored_statements = (
+            (statement, compare_statements(input_statement, statement)) for statement in statement_list
+        )
+    else:
+        scored_statements = get_scored_pages(
+            compare_many, input_statement, statement_list, page_size, get_minimum_confidence
+        )
+
+    for statement, confidence in scored_statements:
+        yield statement, confidence
+
+        if early_exit_confidence is not None and confidence >= early_exit_confidence:
+            break
+
+
+def get_scored_pages(compare_many, input_statement, statement_list, page_size, get_minimum_confidence=None):
+    """
+    Compare each page of statements to the input with ``compare_many``.
+    The similarities are consumed one at a time, so a page is only scored
+    as far as the caller reads it, and the minimum confidence is checked
+    again before each statement is compared.
+
+    :rtype: Generator yielding a (statement, confidence) tuple at a time.
+    """
+    statement_iterator = iter(statement_list)
+    page = list(islice(statement_iterator, page_size))
+
+    while page:
+        minimum_confidence = get_minimum_confidence() if get_minimum_confidence else 0
+
+        yield from zip(page, compare_many(
+            input_statement,
+            page,
+            minimum_confidence=minimum_confidence,
+            get_minimum_confidence=get_minimum_confidence
+        ))
+
+        page = list(islice(statement_iterator, page_size))
+
+
+def get_default_index_path(storage, extension):
+    """
+    Return a path next to the database file of the storage adapter that an
+    index can be saved to, or None if the database is not a SQLite file.
+    """
+    database_uri = getattr(storage, 'database_uri', None) or ''
+
+    if database_uri.startswith('sqlite:///') and len(database_uri) > len('sqlite:///'):
+        return database_uri[len('sqlite:///'):] + extension
+
+    return None
+
+
+def get_statements_by_ids(storage, statement_ids, page_size, search_parameters):
+    """
+    Load the statements with the given ids, one page of ids at a time,
+    in the same order as the ids. Statements that do not match the search
+    parameters are not included.
+
+    :rtype: Generator yielding one statement at a time.
+    """
+    page_size = min(page_size, MAXIMUM_IDS_PER_QUERY)
+
+    for start_index in range(0, len(statement_ids), page_size):
+        page_ids = statement_ids[start_index:start_index + page_size]
+
+        statements = {
+            statement.id: statement for statement in storage.filter(
+                ids=page_ids,
+                **search_parameters
+            )
+        }
+
+        for statement_id in page_ids:
+            if statement_id in statements:
+                yield statements[statement_id]
+
+
+class StatementHeap(object):
+    """
+    A bounded heap that keeps the ``k`` statements with the highest confidence.
+    Statements that do not match the input at all are not kept. When two
+    statements have the same confidence, the one that was added first is
+    ranked higher.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+        self.sequence = 0
+
+    def get_minimum_confidence(self):
+        """
+        Return the confidence that a statement has to exceed to be kept.
+        """
+        if len(self.heap) < self.k:
+            return 0
+
+        return self.heap[0][0]
+
+    def push(self, statement, confidence):
+        # Negating the sequence ranks earlier statements higher on ties
+        entry = (confidence, -self.sequence, statement, )
+
+        self.sequence += 1
+
+        if confidence <= 0:
+            return
+
+        if len(self.heap) < self.k:
+            heappush(self.heap, entry)
+        elif entry[:2] > self.heap[0][:2]:
+            heapreplace(self.heap, entry)
+
+    def get_statements(self):
+        """
+        Return the statements ordered from the highest to the lowest confidence.
+        """
+        statements = []
+
+        for confidence, _, statement in sorted(self.heap, key=lambda entry: entry[:2], reverse=True):
+            statement.confidence = confidence
+            statements.append(statement)
+
+        return statements
+
+
+def get_top_k_statements(scored_statements, statement_heap, early_exit_confidence=None):
+    """
+    Add each scored statement to the heap and return the statements it keeps.
+
+    :param scored_statements: An iterable of (statement, confidence) tuples.
+
+    :param early_exit_confidence: Stop consuming statements as soon as one has
+        a confidence that is greater than or equal to this value.
+
+    :rtype: list
+    """
+    if statement_heap.k < 1:
+        return []
+
+    for statement, confidence in scored_statements:
+        statement_heap.push(statement, confidence)
+
+        if early_exit_confidence is not None and confidence >= early_exit_confidence:
+            break
+
+    return statement_heap.get_statements()
+
+
 class IndexedTextSearch:
     """
     :param statement_comparison_function: A comparison class.
@@ -6,6 +199,13 @@ class IndexedTextSearch:
     :param search_page_size:
         The maximum number of records to load into memory at a time when searching.
         Defaults to 1000
+
+    :param use_inverted_index:
+        Keep an in-memory index of the tokens in the ``search_text`` of each
+        statement so that only statements which share a token with the input
+        need to be loaded from the database, rather than having the database
+        scan every statement.
+        Defaults to False
     """
 
     name = 'indexed_text_search'
@@ -28,21 +228,35 @@ class IndexedTextSearch:
             'search_page_size', 1000
         )
 
-    def search(self, input_statement, **additional_parameters):
-        """
-        Search for close matches to the input. Confidence scores for
-        subsequent results will order of increasing value.
+        self.index = None
 
-        :param input_statement: A statement.
-        :type input_statement: chatterbot.conversation.Statement
+        if kwargs.get('use_inverted_index', False):
+            from chatterbot.indexes import InvertedIndex
 
-        :param **additional_parameters: Additional parameters to be passed
-            to the ``filter`` method of the storage adapter when searching.
+            self.index = InvertedIndex()
+            self.chatbot.storage.add_index(self.index)
 
-        :rtype: Generator yielding one closest matching statement at a time.
+    def get_indexed_candidates(self, search_text, search_parameters):
         """
-        self.chatbot.logger.info('Beginning search for close text match')
+        Load the statements that the inverted index lists as sharing at least
+        one token with the search text, one page of statement ids at a time.
+        """
+        statement_ids = sorted(self.index.search(search_text))
+
+        id_page_size = min(self.search_page_size, MAXIMUM_IDS_PER_QUERY)
+
+        for start_index in range(0, len(statement_ids), id_page_size):
+            end_index = start_index + id_page_size
+
+            yield from self.chatbot.storage.filter(
+                ids=statement_ids[start_index:end_index],
+                **search_parameters
+            )
 
+    def get_candidates(self, input_statement, **additional_parameters):
+        """
+        Return the statements that should be compared to the input.
+        """
         input_search_text = input_statement.search_text
 
         if not input_statement.search_text:
@@ -55,23 +269,57 @@ class IndexedTextSearch:
             )
 
         search_parameters = {
-            'search_text_contains': input_search_text,
             'persona_not_startswith': 'bot:',
-            'page_size': self.search_page_size
+            'page_size': self.search_page_size,
+            'fields': SEARCH_FIELDS
         }
 
+        if self.index is None:
+            search_parameters['search_text_contains'] = input_search_text
+
         if additional_parameters:
             search_parameters.update(additional_parameters)
 
-        statement_list = self.chatbot.storage.filter(**search_parameters)
+        if self.index is not None:
+            statement_list = self.get_indexed_candidates(
+                input_search_text, search_parameters
+            )
+        else:
+            statement_list = self.chatbot.storage.filter(**search_parameters)
+
+        return statement_list
+
+    def search(self, input_statement, **additional_parameters):
+        """
+        Search for close matches to the input. Confidence scores for
+        subsequent results will order of increasing value.
+
+        :param input_statement: A statement.
+        :type input_statement: chatterbot.conversation.Statement
+
+        :param **additional_parameters: Additional parameters to be passed
+            to the ``filter`` method of the storage adapter when searching.
+
+        :rtype: Generator yielding one closest matching statement at a time.
+        """
+        self.chatbot.logger.info('Beginning search for close text match')
+
+        statement_list = self.get_candidates(input_statement, **additional_parameters)
 
         best_confidence_so_far = 0
 
         self.chatbot.logger.info('Processing search results')
 
+        scored_statements = get_scored_statements(
+            self.compare_statements,
+            input_statement,
+            statement_list,
+            self.search_page_size,
+            get_minimum_confidence=lambda: best_confidence_so_far
+        )
+
         # Find the closest matching known statement
-        for statement in statement_list:
-            confidence = self.compare_statements(input_statement, statement)
+        for statement, confidence in scored_statements:
 
             if confidence > best_confidence_so_far:
                 best_confidence_so_far = confidence
@@ -83,6 +331,54 @@ class IndexedTextSearch:
 
                 yield statement
 
+    def search_top_k(self, input_statement, k, early_exit_confidence=None, **additional_parameters):
+        """
+        Return the ``k`` closest matches to the input, ordered
+        from the highest to the lowest confidence.
+
+        :param input_statement: A statement.
+        :type input_statement: chatterbot.conversation.Statement
+
+        :param k: The maximum number of statements to return.
+        :type k: int
+
+        :param early_exit_confidence: Stop searching as soon as a statement with a
+            confidence greater than or equal to this value is found.
+        :type early_exit_confidence: float
+
+        :param **additional_parameters: Additional parameters to be passed
+            to the ``filter`` method of the storage adapter when searching.
+
+        :rtype: list
+        """
+        self.chatbot.logger.info('Beginning search for the {} closest text matches'.format(k))
+
+        statement_heap = StatementHeap(k)
+
+        statement_list = self.get_candidates(input_statement, **additional_parameters)
+
+        scored_statements = get_scored_statements(
+            self.compare_statements,
+            input_statement,
+            statement_list,
+            self.search_page_size,
+            get_minimum_confidence=statement_heap.get_minimum_confidence,
+            early_exit_confidence=early_exit_confidence
+        )
+
+        results = get_top_k_statements(
+            scored_statements,
+            statement_heap,
+            early_exit_confidence=early_exit_confidence
+        )
+
+        for statement in results:
+            self.chatbot.logger.info('Similar text found: {} {}'.format(
+                statement.text, statement.confidence
+            ))
+
+        return results
+
 
 class TextSearch:
     """
@@ -92,6 +388,16 @@ class TextSearch:
     :param search_page_size:
         The maximum number of records to load into memory at a time when searching.
         Defaults to 1000
+
+    :param use_length_index:
+        Keep an in-memory index of statement ids grouped by the length of
+        their text. Statements are then loaded starting with the lengths
+        closest to the length of the input, and groups of statements that
+        are too long or too short to be a closer match than the best one
+        found so far are skipped entirely. Lengths are only used to skip
+        statements when the comparison function provides a
+        ``get_length_upper_bound`` method.
+        Defaults to False
     """
 
     name = 'text_search'
@@ -114,6 +420,77 @@ class TextSearch:
             'search_page_size', 1000
         )
 
+        self.index = None
+
+        if kwargs.get('use_length_index', False):
+            from chatterbot.indexes import LengthIndex
+
+            self.index = LengthIndex()
+            self.chatbot.storage.add_index(self.index)
+
+    def get_length_indexed_candidates(self, input_statement, search_parameters, get_minimum_confidence=None):
+        """
+        Load statements one length bucket at a time, starting with the
+        lengths that could be most similar to the length of the input.
+        """
+        get_length_upper_bound = getattr(
+            self.compare_statements, 'get_length_upper_bound', None
+        )
+
+        input_length = self.index.get_text_length(input_statement.text)
+
+        id_page_size = min(self.search_page_size, MAXIMUM_IDS_PER_QUERY)
+
+        lengths = self.index.get_lengths()
+
+        if get_length_upper_bound:
+            lengths.sort(
+                key=lambda length: get_length_upper_bound(input_length, length),
+                reverse=True
+            )
+
+        for length in lengths:
+
+            if get_length_upper_bound and get_minimum_confidence:
+                upper_bound = get_length_upper_bound(input_length, length)
+
+                # The remaining lengths can not be a closer match
+                if upper_bound <= get_minimum_confidence():
+                    break
+
+            statement_ids = sorted(self.index.get_statement_ids(length))
+
+            for start_index in range(0, len(statement_ids), id_page_size):
+                end_index = start_index + id_page_size
+
+                yield from self.chatbot.storage.filter(
+                    ids=statement_ids[start_index:end_index],
+                    **search_parameters
+                )
+
+    def get_candidates(self, input_statement, get_minimum_confidence=None, **additional_parameters):
+        """
+        Return the statements that should be compared to the input.
+
+        :param get_minimum_confidence: A callable returning the confidence that a
+            statement currently has to exceed to be of interest.
+        """
+        search_parameters = {
+            'persona_not_startswith': 'bot:',
+            'page_size': self.search_page_size,
+            'fields': SEARCH_FIELDS
+        }
+
+        if additional_parameters:
+            search_parameters.update(additional_parameters)
+
+        if self.index is not None:
+            return self.get_length_indexed_candidates(
+                input_statement, search_parameters, get_minimum_confidence
+            )
+
+        return self.chatbot.storage.filter(**search_parameters)
+
     def search(self, input_statement, **additional_parameters):
         """
         Search for close matches to the input. Confidence scores for
@@ -129,23 +506,29 @@ class TextSearch:
         """
         self.chatbot.logger.info('Beginning search for close text match')
 
-        search_parameters = {
-            'persona_not_startswith': 'bot:',
-            'page_size': self.search_page_size
-        }
-
-        if additional_parameters:
-            search_parameters.update(additional_parameters)
+        best_confidence_so_far = 0
 
-        statement_list = self.chatbot.storage.filter(**search_parameters)
+        def get_minimum_confidence():
+            return best_confidence_so_far
 
-        best_confidence_so_far = 0
+        statement_list = self.get_candidates(
+            input_statement,
+            get_minimum_confidence=get_minimum_confidence,
+            **additional_parameters
+        )
 
         self.chatbot.logger.info('Processing search results')
 
+        scored_statements = get_scored_statements(
+            self.compare_statements,
+            input_statement,
+            statement_list,
+            self.search_page_size,
+            get_minimum_confidence=get_minimum_confidence
+        )
+
         # Find the closest matching known statement
-        for statement in statement_list:
-            confidence = self.compare_statements(input_statement, statement)
+        for statement, confidence in scored_statements:
 
             if confidence > best_confidence_so_far:
                 best_confidence_so_far = confidence
@@ -156,3 +539,464 @@ class TextSearch:
                 ))
 
                 yield statement
+
+    def search_top_k(self, input_statement, k, early_exit_confidence=None, **additional_parameters):
+        """
+        Return the ``k`` closest matches to the input, ordered
+        from the highest to the lowest confidence.
+
+        :param input_statement: A statement.
+        :type input_statement: chatterbot.conversation.Statement
+
+        :param k: The maximum number of statements to return.
+        :type k: int
+
+        :param early_exit_confidence: Stop searching as soon as a statement with a
+            confidence greater than or equal to this value is found.
+        :type early_exit_confidence: float
+
+        :param **additional_parameters: Additional parameters to be passed
+            to the ``filter`` method of the storage adapter when searching.
+
+        :rtype: list
+        """
+        self.chatbot.logger.info('Beginning search for the {} closest text matches'.format(k))
+
+        statement_heap = StatementHeap(k)
+
+        statement_list = self.get_candidates(
+            input_statement,
+            get_minimum_confidence=statement_heap.get_minimum_confidence,
+            **additional_parameters
+        )
+
+        scored_statements = get_scored_statements(
+            self.compare_statements,
+            input_statement,
+            statement_list,
+            self.search_page_size,
+            get_minimum_confidence=statement_heap.get_minimum_confidence,
+            early_exit_confidence=early_exit_confidence
+        )
+
+        results = get_top_k_statements(
+            scored_statements,
+            statement_heap,
+            early_exit_confidence=early_exit_confidence
+        )
+
+        for statement in results:
+            self.chatbot.logger.info('Similar text found: {} {}'.format(
+                statement.text, statement.confidence
+            ))
+
+        return results
+
+
+class BM25TextSearch(IndexedTextSearch):
+    """
+    Ranks the statements that share tokens with the input using the Okapi
+    BM25 ranking function, which weights tokens that occur in few statements
+    above tokens that occur in many. Only the highest ranked statements are
+    then compared to the input.
+
+    The statistics used for ranking are kept in memory. They are built from
+    the statements in the database when a logic adapter that uses this search
+    algorithm is created and are kept up to date by the storage adapter after
+    that, including while the chat bot is trained.
+
+    :param statement_comparison_function: A comparison class.
+        Defaults to ``LevenshteinDistance``.
+
+    :param search_page_size:
+        The maximum number of records to load into memory at a time when searching.
+        Defaults to 1000
+
+    :param bm25_candidate_count:
+        The maximum number of the highest ranked statements to compare to the input.
+        Defaults to 100
+
+    :param bm25_k1:
+        Controls how quickly the weight of a token saturates as it is repeated.
+        Defaults to 1.2
+
+    :param bm25_b:
+        Controls how much the weight of a token is reduced in statements that
+        contain more tokens than average.
+        Defaults to 0.75
+    """
+
+    name = 'bm25_text_search'
+
+    def __init__(self, chatbot, **kwargs):
+        from threading import Lock
+
+        # The ranking statistics take the place of the inverted index
+        kwargs['use_inverted_index'] = False
+
+        super().__init__(chatbot, **kwargs)
+
+        self.candidate_count = kwargs.get('bm25_candidate_count', 100)
+        self.k1 = kwargs.get('bm25_k1', 1.2)
+        self.b = kwargs.get('bm25_b', 0.75)
+
+        self.index_lock = Lock()
+
+    def get_index(self):
+        """
+        Return the index of ranking statistics, building it
+        from the statements in the database if needed.
+        """
+        from chatterbot.indexes import BM25Index
+
+        with self.index_lock:
+            if self.index is None:
+                index = BM25Index(
+                    k1=self.k1,
+                    b=self.b,
+                    persona_not_startswith='bot:'
+                )
+
+                self.chatbot.storage.add_index(index)
+                self.index = index
+
+        return self.index
+
+    def get_candidates(self, input_statement, **additional_parameters):
+        """
+        Return the highest ranked statements for the input,
+        ordered from the highest rank to the lowest.
+        """
+        input_search_text = input_statement.search_text
+
+        if not input_statement.search_text:
+            self.chatbot.logger.warn(
+                'No value for search_text was available on the provided input'
+            )
+
+            input_search_text = self.chatbot.storage.tagger.get_text_index_string(
+                input_statement.text
+            )
+
+        search_parameters = {
+            'persona_not_startswith': 'bot:',
+            'page_size': self.search_page_size,
+            'fields': SEARCH_FIELDS
+        }
+
+        if additional_parameters:
+            search_parameters.update(additional_parameters)
+
+        statement_ids = self.get_index().search(input_search_text, self.candidate_count)
+
+        return get_statements_by_ids(
+            self.chatbot.storage,
+            statement_ids,
+            self.search_page_size,
+            search_parameters
+        )
+
+
+class MinHashTextSearch(IndexedTextSearch):
+    """
+    Finds statements with text that is approximately similar to the input
+    using MinHash signatures of the characters in the text of each statement,
+    grouped using locality-sensitive hashing. Only the statements that are
+    likely to be similar are compared to the input, so some close matches
+    may not be found in exchange for not having to consider every statement.
+
+    The signatures are kept in memory. They are built from the statements in
+    the database when a logic adapter that uses this search algorithm is
+    created and are kept up to date by the storage adapter after that,
+    including while the chat bot is trained. The signatures can be saved to a file
+    so that they do not need to be calculated again when the chat bot restarts.
+
+    :param statement_comparison_function: A comparison class.
+        Defaults to ``LevenshteinDistance``.
+
+    :param search_page_size:
+        The maximum number of records to load into memory at a time when searching.
+        Defaults to 1000
+
+    :param minhash_candidate_count:
+        The maximum number of statements to compare to the input.
+        Defaults to 100
+
+    :param minhash_permutation_count:
+        The number of hash values in the signature of each statement.
+        Defaults to 64
+
+    :param minhash_band_count:
+        The number of bands that the signatures are split into. Using more bands
+        finds statements that are less similar to the input.
+        Defaults to 16
+
+    :param minhash_index_path:
+        The path of the file that the signatures are saved to. When a file based
+        SQLite database is used this defaults to the path of the database file
+        followed by ``.minhash``, otherwise the signatures are not saved.
+    """
+
+    name = 'minhash_text_search'
+
+    def __init__(self, chatbot, **kwargs):
+        from threading import Lock
+
+        # The signatures take the place of the inverted index
+        kwargs['use_inverted_index'] = False
+
+        super().__init__(chatbot, **kwargs)
+
+        self.candidate_count = kwargs.get('minhash_candidate_count', 100)
+        self.permutation_count = kwargs.get('minhash_permutation_count', 64)
+        self.band_count = kwargs.get('minhash_band_count', 16)
+
+        self.index_path = kwargs.get(
+            'minhash_index_path',
+            get_default_index_path(self.chatbot.storage, '.minhash')
+        )
+
+        self.index_lock = Lock()
+
+    def get_index(self):
+        """
+        Return the index of signatures, building it
+        from the statements in the database if needed.
+        """
+        import atexit
+        from chatterbot.indexes import MinHashIndex
+
+        with self.index_lock:
+            if self.index is None:
+                index = MinHashIndex(
+                    permutation_count=self.permutation_count,
+                    band_count=self.band_count,
+                    path=self.index_path,
+                    persona_not_startswith='bot:'
+                )
+
+                self.chatbot.storage.add_index(index)
+                self.index = index
+
+                # Save signatures calculated for new statements on exit
+                atexit.register(index.save)
+
+        return self.index
+
+    def get_candidates(self, input_statement, **additional_parameters):
+        """
+        Return the statements that are likely to be similar to the input,
+        ordered by their estimated similarity from the highest to the lowest.
+        """
+        search_parameters = {
+            'persona_not_startswith': 'bot:',
+            'page_size': self.search_page_size,
+            'fields': SEARCH_FIELDS
+        }
+
+        if additional_parameters:
+            search_parameters.update(additional_parameters)
+
+        statement_ids = self.get_index().search(input_statement.text, self.candidate_count)
+
+        return get_statements_by_ids(
+            self.chatbot.storage,
+            statement_ids,
+            self.search_page_size,
+            search_parameters
+        )
+
+
+class VectorSearch:
+    """
+    Finds the statements with text that has the most similar meaning to the
+    input, using the same document vectors and cosine similarity as the
+    ``SpacySimilarity`` comparison function.
+
+    A vector is calculated for each statement once and kept as a row of a
+    float32 matrix, so the input only needs to be processed by spaCy once and
+    is compared to every statement with a single matrix-vector product. The
+    matrix is built from the statements in the database when a logic adapter
+    that uses this search algorithm is created, and the storage adapter adds
+    the vector of each statement that is created after that, including while
+    the chat bot is trained. It can be memory-mapped from a file so that the
+    vectors do not need to be calculated again when the chat bot restarts.
+
+    :param search_page_size:
+        The maximum number of records to load into memory at a time when searching.
+        Defaults to 1000
+
+    :param vector_candidate_count:
+        The number of the most similar statements to load from the database.
+        Statements that do not match the parameters of the search are skipped,
+        so fewer statements may be returned.
+        Defaults to 100
+
+    :param vector_index_path:
+        The path of the file that the matrix is memory-mapped from. When a file
+        based SQLite database is used this defaults to the path of the database
+        file followed by ``.vectors.npy``, otherwise the matrix is kept in memory.
+    """
+
+    name = 'vector_search'
+
+    def __init__(self, chatbot, **kwargs):
+        from threading import Lock
+
+        self.chatbot = chatbot
+
+        self.search_page_size = kwargs.get(
+            'search_page_size', 1000
+        )
+
+        self.candidate_count = kwargs.get('vector_candidate_count', 100)
+
+        self.index_path = kwargs.get(
+            'vector_index_path',
+            get_default_index_path(self.chatbot.storage, '.vectors.npy')
+        )
+
+        self.nlp = None
+        self.index = None
+        self.index_lock = Lock()
+
+    def get_vectors(self, texts):
+        """
+        Return an array containing the document vector of each text.
+        """
+        import numpy
+
+        return numpy.array([
+            document.vector for document in self.nlp.pipe(texts)
+        ], dtype=numpy.float32)
+
+    def get_index(self):
+        """
+        Return the index of statement vectors, building it
+        from the statements in the database if needed.
+        """
+        import atexit
+
+        with self.index_lock:
+            if self.index is None:
+                from chatterbot.indexes import VectorIndex
+
+                try:
+                    import spacy  # NOQA
+                except ImportError:
+                    message = (
+                        'Unable to import "spacy".\n'
+                        'Please install "spacy" before using the vector search algorithm:\n'
+                        'pip3 install "spacy>=2.1,<2.2"'
+                    )
+                    raise OptionalDependencyImportError(message)
+
+                self.nlp = get_spacy_model(
+                    self.chatbot.storage.tagger.language,
+                    constants.DISABLED_SPACY_PIPES
+                )
+
+                index = VectorIndex(
+                    self.get_vectors,
+                    path=self.index_path,
+                    persona_not_startswith='bot:',
+                    batch_size=self.search_page_size
+                )
+
+                self.chatbot.storage.add_index(index)
+                self.index = index
+
+                # Save the ids of the rows of the matrix on exit
+                atexit.register(index.save)
+
+        return self.index
+
+    def get_ranked_statements(self, input_statement, **additional_parameters):
+        """
+        Return the statements most similar to the input, with their
+        confidence set, ordered from the highest confidence to the lowest.
+        """
+        search_parameters = {
+            'persona_not_startswith': 'bot:',
+            'page_size': self.search_page_size,
+            'fields': SEARCH_FIELDS
+        }
+
+        if additional_parameters:
+            search_parameters.update(additional_parameters)
+
+        similarities = dict(
+            self.get_index().search(input_statement.text, self.candidate_count)
+        )
+
+        statement_ids = [
+            statement_id for statement_id, similarity in similarities.items() if similarity > 0
+        ]
+
+        for statement in get_statements_by_ids(
+            self.chatbot.storage,
+            statement_ids,
+            self.search_page_size,
+            search_parameters
+        ):
+            statement.confidence = similarities[statement.id]
+            yield statement
+
+    def search(self, input_statement, **additional_parameters):
+        """
+        Search for close matches to the input. Confidence scores for
+        subsequent results will order of increasing value.
+
+        :param input_statement: A statement.
+        :type input_statement: chatterbot.conversation.Statement
+
+        :param **additional_parameters: Additional parameters to be passed
+            to the ``filter`` method of the storage adapter when searching.
+
+        :rtype: Generator yielding one closest matching statement at a time.
+        """
+        self.chatbot.logger.info('Beginning vector search for close text match')
+
+        results = list(self.get_ranked_statements(input_statement, **additional_parameters))
+
+        best_confidence_so_far = 0
+
+        for statement in reversed(results):
+            if statement.confidence > best_confidence_so_far:
+                best_confidence_so_far = statement.confidence
+
+                self.chatbot.logger.info('Similar text found: {} {}'.format(
+                    statement.text, statement.confidence
+                ))
+
+                yield statement
+
+    def search_top_k(self, input_statement, k, early_exit_confidence=None, **additional_parameters):
+        """
+        Return the ``k`` closest matches to the input, ordered
+        from the highest to the lowest confidence.
+
+        :param input_statement: A statement.
+        :type input_statement: chatterbot.conversation.Statement
+
+        :param k: The maximum number of statements to return.
+        :type k: int
+
+        :param early_exit_confidence: Accepted for compatibility with the other
+            search algorithms. The similarity to every statement is always
+            calculated at once, so there is no search to stop early.
+        :type early_exit_confidence: float
+
+        :param **additional_parameters: Additional parameters to be passed
+            to the ``filter`` method of the storage adapter when searching.
+
+        :rtype: list
+        """
+        self.chatbot.logger.info('Beginning vector search for the {} closest text matches'.format(k))
+
+        if k < 1:
+            return []
+
+        return list(islice(
+            self.get_ranked_statements(input_statement, **additional_parameters), k
+        ))
@@ -33,17 +33,21 @@ class DjangoStorageAdapter(StorageAdapter):
         Returns a list of statements in the database
         that match the parameters specified.
         """
-        from django.db.models import Q
+        from django import VERSION as DJANGO_VERSION
+        from django.db.models import Q, prefetch_related_objects
 
         Statement = self.get_model('statement')
 
-        kwargs.pop('page_size', 1000)
+        page_size = kwargs.pop('page_size', 1000)
         order_by = kwargs.pop('order_by', None)
         tags = kwargs.pop('tags', [])
         exclude_text = kwargs.pop('exclude_text', None)
         exclude_text_words = kwargs.pop('exclude_text_words', [])
         persona_not_startswith = kwargs.pop('persona_not_startswith', None)
         search_text_contains = kwargs.pop('search_text_contains', None)
+        ids = kwargs.pop('ids', None)
+        load_tags = kwargs.pop('load_tags', True)
+        fields = kwargs.pop('fields', None)
 
         # Convert a single sting into a list if only one tag is provided
         if type(tags) == str:
@@ -52,6 +56,9 @@ class DjangoStorageAdapter(StorageAdapter):
         if tags:
             kwargs['tags__name__in'] = tags
 
+        if ids is not None:
+            kwargs['id__in'] = ids
+
         statements = Statement.objects.filter(**kwargs)
 
         if exclude_text:
@@ -86,14 +93,50 @@ class DjangoStorageAdapter(StorageAdapter):
         if order_by:
             statements = statements.order_by(*order_by)
 
-        for statement in statements.iterator():
-            yield statement
+        column_names = [
+            field_name for field_name in fields or [] if field_name != 'tags'
+        ]
+
+        if column_names:
+            # Defer loading every other column of the statements
+            statements = statements.only(*column_names)
+
+        # Tags are loaded for each page of statements in a single query,
+        # unless they are not needed
+        if fields:
+            load_tags = 'tags' in fields
+
+        # The number of rows fetched at a time can only be set since Django 2.0
+        if DJANGO_VERSION >= (2, 0):
+            statement_iterator = statements.iterator(chunk_size=page_size)
+        else:
+            statement_iterator = statements.iterator()
+
+        page = []
+
+        for statement in statement_iterator:
+            page.append(statement)
+
+            if len(page) == page_size:
+                if load_tags:
+                    prefetch_related_objects(page, 'tags')
+
+                yield from page
+
+                page = []
+
+        if load_tags:
+            prefetch_related_objects(page, 'tags')
+
+        yield from page
 
     def create(self, **kwargs):
         """
         Creates a new statement matching the keyword arguments specified.
         Returns the created statement.
         """
+        from django.db import transaction
+
         Statement = self.get_model('statement')
         Tag = self.get_model('tag')
 
@@ -118,48 +161,185 @@ class DjangoStorageAdapter(StorageAdapter):
 
         statement.tags.add(*tags_to_add)
 
+        # Inside a transaction, the indexes are updated once it is committed
+        transaction.on_commit(lambda: self.update_indexes(statement))
+
         return statement
 
-    def create_many(self, statements):
+    def create_many(self, statements, batch_size=1000):
         """
         Creates multiple statement entries.
+
+        Statements are created in chunks of ``batch_size``, each saved in one
+        transaction with a bulk insert for the statements, one for the tags that
+        do not exist yet and one for the relations between them.
+
+        :param statements: The statements to create. Any iterable is accepted.
+
+        :param batch_size: The number of statements saved in each transaction.
+        :type batch_size: int
+
+        :returns: The number of statements created.
+        :rtype: int
+        """
+        from itertools import islice
+
+        statements = iter(statements)
+        created_count = 0
+
+        while True:
+            chunk = list(islice(statements, batch_size))
+
+            if not chunk:
+                break
+
+            self._create_chunk(chunk)
+            created_count += len(chunk)
+
+        return created_count
+
+    def _create_chunk(self, statements):
+        """
+        Insert a chunk of statements and their tags in a single transaction.
         """
+        from django.db import transaction
+
         Statement = self.get_model('statement')
-        Tag = self.get_model('tag')
 
-        tag_cache = {}
+        search_texts = self.get_search_texts(statements)
+
+        statement_model_objects = []
+        tag_lists = []
 
-        for statement in statements:
+        for statement, (search_text, search_in_response_to) in zip(statements, search_texts):
 
             statement_data = statement.serialize()
-            tag_data = statement_data.pop('tags', [])
+            tag_lists.append(set(statement_data.pop('tags', [])))
 
             statement_model_object = Statement(**statement_data)
 
-            if not statement.search_text:
-                statement_model_object.search_text = self.tagger.get_text_index_string(statement.text)
+            statement_model_object.search_text = search_text
+            statement_model_object.search_in_response_to = search_in_response_to
+
+            statement_model_objects.append(statement_model_object)
+
+        # The ids of the new statements are only needed to add tags or update indexes
+        ids_required = self.indexes or any(tag_lists)
+
+        with transaction.atomic():
+            self._insert_statements(statement_model_objects, ids_required)
+
+            tag_names = set(
+                tag_name for tag_list in tag_lists for tag_name in tag_list
+            )
+
+            if tag_names:
+                tag_ids = self._get_or_create_tag_ids(tag_names)
+
+                StatementTag = Statement.tags.through
+
+                StatementTag.objects.bulk_create([
+                    StatementTag(statement_id=statement_model_object.pk, tag_id=tag_ids[tag_name])
+                    for statement_model_object, tag_list in zip(statement_model_objects, tag_lists)
+                    for tag_name in tag_list
+                ])
+
+        if self.indexes:
+            transaction.on_commit(lambda: self.update_indexes(*statement_model_objects))
 
-            if not statement.search_in_response_to and statement.in_response_to:
-                statement_model_object.search_in_response_to = self.tagger.get_text_index_string(statement.in_response_to)
+    def _insert_statements(self, statement_model_objects, ids_required):
+        """
+        Insert statements in bulk. When their ids are required, the ids are
+        set on the statements, using a separate insert for each statement on
+        databases that do not return the ids of rows created in bulk.
+        """
+        from django.db import connections
+        from django.db.models import Max
+
+        Statement = self.get_model('statement')
+
+        connection = connections[Statement.objects.db]
+
+        # The name of this feature changed in Django 3.0
+        returns_bulk_ids = getattr(
+            connection.features, 'can_return_rows_from_bulk_insert',
+            getattr(connection.features, 'can_return_ids_from_bulk_insert', False)
+        )
+
+        if not ids_required or returns_bulk_ids:
+            Statement.objects.bulk_create(statement_model_objects)
+        elif connection.vendor == 'sqlite':
+            last_id = Statement.objects.aggregate(Max('id'))['id__max'] or 0
+
+            Statement.objects.bulk_create(statement_model_objects)
+
+            # SQLite holds the write lock until the transaction ends, so the new
+            # rows are the ones after the previous highest id
+            statement_ids = Statement.objects.filter(
+                id__gt=last_id
+            ).order_by('id').values_list('id', flat=True)[:len(statement_model_objects)]
+
+            for statement_model_object, statement_id in zip(statement_model_objects, statement_ids):
+                statement_model_object.pk = statement_id
+        else:
+            # Other databases can number the rows of concurrent transactions
+            # in any order, so each statement is saved on its own to get its id
+            for statement_model_object in statement_model_objects:
+                statement_model_object.save(force_insert=True)
+
+    def _get_or_create_tag_ids(self, tag_names):
+        """
+        Return a dictionary of tag ids keyed by tag name,
+        creating the tags that do not exist yet.
+        """
+        from django.db import IntegrityError, transaction
+
+        Tag = self.get_model('tag')
+
+        tag_ids = dict(
+            Tag.objects.filter(name__in=tag_names).values_list('name', 'id')
+        )
 
-            statement_model_object.save()
+        missing_tag_names = tag_names - set(tag_ids.keys())
+
+        if missing_tag_names:
+            try:
+                with transaction.atomic():
+                    Tag.objects.bulk_create([
+                        Tag(name=tag_name) for tag_name in missing_tag_names
+                    ])
+            except IntegrityError:
+                # Some of the tags were created by another process at the
+                # same time, so the tags are created one at a time instead
+                for tag_name in missing_tag_names:
+                    try:
+                        with transaction.atomic():
+                            Tag.objects.create(name=tag_name)
+                    except IntegrityError:
+                        pass
+
+            tag_ids = dict(
+                Tag.objects.filter(name__in=tag_names).values_list('name', 'id')
+            )
 
-            tags_to_add = []
+        return tag_ids
 
-            for tag_name in tag_data:
-                if tag_name in tag_cache:
-                    tag = tag_cache[tag_name]
-                else:
-                    tag, _ = Tag.objects.get_or_create(name=tag_name)
-                    tag_cache[tag_name] = tag
-                tags_to_add.append(tag)
+    def create_pair(self, statement, response):
+        """
+        Save a statement and the response to it in a single transaction.
+        """
+        from django.db import transaction
 
-            statement_model_object.tags.add(*tags_to_add)
+        with transaction.atomic():
+            self.create(**statement.serialize())
+            self.create(**response.serialize())
 
     def update(self, statement):
         """
         Update the provided statement.
         """
+        from django.db import transaction
+
         Statement = self.get_model('statement')
         Tag = self.get_model('tag')
 
@@ -180,20 +360,51 @@ class DjangoStorageAdapter(StorageAdapter):
 
             statement.tags.add(tag)
 
+        transaction.on_commit(lambda: self.update_indexes(statement))
+
         return statement
 
+    def get_latest_statements(self, conversation, limit):
+        """
+        Returns the most recent statements in a conversation,
+        ordered from the oldest to the newest.
+        """
+        Statement = self.get_model('statement')
+
+        statements = Statement.objects.filter(
+            conversation=conversation
+        ).prefetch_related('tags').order_by('-id')[:limit]
+
+        return list(reversed(statements))
+
     def get_random(self):
         """
-        Returns a random statement from the database
+        Returns a random statement from the database.
+
+        An id is picked at random between the lowest and highest statement
+        ids, so that the statement can be found through the primary key
+        without sorting the table. If there is no statement with the picked
+        id after a few attempts, the next statement after the last picked
+        id is returned.
         """
+        import random
+        from django.db.models import Max, Min
+
         Statement = self.get_model('statement')
 
-        statement = Statement.objects.order_by('?').first()
+        id_range = Statement.objects.aggregate(Min('id'), Max('id'))
 
-        if statement is None:
+        if id_range['id__max'] is None:
             raise self.EmptyDatabaseException()
 
-        return statement
+        for _ in range(3):
+            random_id = random.randint(id_range['id__min'], id_range['id__max'])
+            statement = Statement.objects.filter(id=random_id).first()
+
+            if statement is not None:
+                return statement
+
+        return Statement.objects.filter(id__gte=random_id).order_by('id').first()
 
     def remove(self, statement_text):
         """
@@ -201,12 +412,17 @@ class DjangoStorageAdapter(StorageAdapter):
         Removes any responses from statements if the response text matches the
         input text.
         """
+        from django.db import transaction
+
         Statement = self.get_model('statement')
 
         statements = Statement.objects.filter(text=statement_text)
+        statement_ids = list(statements.values_list('id', flat=True))
 
         statements.delete()
 
+        transaction.on_commit(lambda: self.remove_from_indexes(*statement_ids))
+
     def drop(self):
         """
         Remove all data from the database.
@@ -216,3 +432,5 @@ class DjangoStorageAdapter(StorageAdapter):
 
         Statement.objects.all().delete()
         Tag.objects.all().delete()
+
+        self.clear_indexes()
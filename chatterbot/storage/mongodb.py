@@ -41,6 +41,9 @@ class MongoDatabaseAdapter(StorageAdapter):
         # The mongo collection of statement documents
         self.statements = self.database['statements']
 
+        self.create_search_tokens()
+        self.create_indexes()
+
     def get_statement_model(self):
         """
         Return the class for the statement model.
@@ -53,6 +56,68 @@ class MongoDatabaseAdapter(StorageAdapter):
 
         return statement
 
+    def create_indexes(self):
+        """
+        Create the indexes used by the adapter's queries.
+        Indexes that already exist are left unchanged.
+        """
+        import pymongo
+
+        # A multikey index on each of the search text tokens
+        self.statements.create_index('search_tokens')
+
+        # The statements of a conversation, in the order they were created
+        self.statements.create_index([
+            ('conversation', pymongo.ASCENDING),
+            ('_id', pymongo.ASCENDING)
+        ])
+
+        # Responses to a statement, excluding those said by the bot
+        self.statements.create_index([
+            ('search_in_response_to', pymongo.ASCENDING),
+            ('persona', pymongo.ASCENDING)
+        ])
+
+        # Statements with a given text in a conversation
+        self.statements.create_index([
+            ('text', pymongo.ASCENDING),
+            ('conversation', pymongo.ASCENDING)
+        ])
+
+    def create_search_tokens(self, batch_size=1000):
+        """
+        Add the search tokens to statements that were saved
+        by an earlier version without them.
+        """
+        from pymongo import UpdateOne
+
+        statements = self.statements.find(
+            {'search_tokens': {'$exists': False}},
+            {'search_text': True}
+        )
+
+        updates = []
+
+        for statement in statements:
+            updates.append(UpdateOne(
+                {'_id': statement['_id']},
+                {'$set': {'search_tokens': self.get_search_tokens(statement.get('search_text'))}}
+            ))
+
+            if len(updates) >= batch_size:
+                self.statements.bulk_write(updates, ordered=False)
+                updates = []
+
+        if updates:
+            self.statements.bulk_write(updates, ordered=False)
+
+    def get_search_tokens(self, search_text):
+        """
+        Return the list of unique tokens in a statement's search text,
+        which is stored in the multikey indexed ``search_tokens`` field.
+        """
+        return list(set((search_text or '').split()))
+
     def count(self):
         return self.statements.count()
 
@@ -81,6 +146,22 @@ class MongoDatabaseAdapter(StorageAdapter):
         exclude_text_words = kwargs.pop('exclude_text_words', [])
         persona_not_startswith = kwargs.pop('persona_not_startswith', None)
         search_text_contains = kwargs.pop('search_text_contains', None)
+        ids = kwargs.pop('ids', None)
+        load_tags = kwargs.pop('load_tags', True)
+        fields = kwargs.pop('fields', None)
+
+        # Leave the tags out of the returned documents if they are not needed
+        projection = None if load_tags else {'tags': False}
+
+        if fields:
+            projection = {
+                field_name: True for field_name in fields if field_name != 'id'
+            }
+
+        if ids is not None:
+            kwargs['_id'] = {
+                '$in': ids
+            }
 
         if tags:
             kwargs['tags'] = {
@@ -121,10 +202,9 @@ class MongoDatabaseAdapter(StorageAdapter):
             kwargs['persona']['$not'] = re.compile('^bot:*')
 
         if search_text_contains:
-            or_regex = '|'.join([
-                '{}'.format(re.escape(word)) for word in search_text_contains.split(' ')
-            ])
-            kwargs['search_text'] = re.compile(or_regex)
+            kwargs['search_tokens'] = {
+                '$in': search_text_contains.split()
+            }
 
         mongo_ordering = []
 
@@ -136,17 +216,29 @@ class MongoDatabaseAdapter(StorageAdapter):
                 mongo_ordering.append(('created_at', pymongo.DESCENDING, ))
 
             for order in order_by:
+                # The id of a statement is stored in the _id field
+                if order == 'id':
+                    order = '_id'
+
                 mongo_ordering.append((order, pymongo.ASCENDING))
 
-        total_statements = self.statements.find(kwargs).count()
+            # Break ties by id so that statements with equal values
+            # are always returned in the same order
+            if '_id' not in [order for order, _ in mongo_ordering]:
+                mongo_ordering.append(('_id', pymongo.ASCENDING))
 
-        for start_index in range(0, total_statements, page_size):
-            if mongo_ordering:
-                for match in self.statements.find(kwargs).sort(mongo_ordering).skip(start_index).limit(page_size):
-                    yield self.mongo_to_object(match)
-            else:
-                for match in self.statements.find(kwargs).skip(start_index).limit(page_size):
-                    yield self.mongo_to_object(match)
+        # Stream the results from a single cursor, which
+        # fetches them from the server in batches of page_size
+        statements = self.statements.find(kwargs, projection, batch_size=page_size)
+
+        if mongo_ordering:
+            statements = statements.sort(mongo_ordering)
+
+        try:
+            for match in statements:
+                yield self.mongo_to_object(match)
+        finally:
+            statements.close()
 
     def create(self, **kwargs):
         """
@@ -165,32 +257,137 @@ class MongoDatabaseAdapter(StorageAdapter):
             if kwargs.get('in_response_to'):
                 kwargs['search_in_response_to'] = self.tagger.get_text_index_string(kwargs['in_response_to'])
 
+        kwargs['search_tokens'] = self.get_search_tokens(kwargs['search_text'])
+
         inserted = self.statements.insert_one(kwargs)
 
         kwargs['id'] = inserted.inserted_id
 
-        return Statement(**kwargs)
+        statement = Statement(**kwargs)
+
+        self.update_indexes(statement)
 
-    def create_many(self, statements):
+        return statement
+
+    def create_many(self, statements, batch_size=1000, max_pending_batches=2):
         """
         Creates multiple statement entries.
+
+        Statements are read from the iterable in chunks of ``batch_size``, and each
+        chunk is sent in an unordered ``insert_many`` from a background thread, so
+        that the next chunk can be prepared while the previous one is written.
+        If a chunk cannot be written completely the error is logged, the rest of
+        the chunks are still written, and the first error is raised at the end.
+
+        :param statements: The statements to create. Any iterable is accepted.
+
+        :param batch_size: The number of statements sent in each insert.
+        :type batch_size: int
+
+        :param max_pending_batches: The number of chunks that can be waiting to
+            be written before reading more statements from the iterable.
+        :type max_pending_batches: int
+
+        :returns: The number of statements created.
+        :rtype: int
         """
-        create_statements = []
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor
+        from itertools import islice
+        from time import perf_counter
+        from bson import ObjectId
+        from pymongo.errors import BulkWriteError
 
-        for statement in statements:
-            statement_data = statement.serialize()
-            tag_data = list(set(statement_data.pop('tags', [])))
-            statement_data['tags'] = tag_data
+        statements = iter(statements)
+        pending_batches = deque()
+        created_count = 0
+        errors = []
+        start_time = perf_counter()
+
+        def finish_batch():
+            nonlocal created_count
+
+            batch_number, create_statements, future = pending_batches.popleft()
+
+            failed_positions = set()
+
+            try:
+                created_count += len(future.result().inserted_ids)
+            except BulkWriteError as error:
+                write_errors = error.details.get('writeErrors', [])
+
+                created_count += error.details.get('nInserted', 0)
+                failed_positions = set(write_error['index'] for write_error in write_errors)
+                errors.append(error)
+
+                self.logger.error('Unable to create {} of the statements in batch {}: {}'.format(
+                    len(write_errors),
+                    batch_number,
+                    write_errors[0]['errmsg'] if write_errors else error
+                ))
+
+            if self.indexes:
+                # The inserted documents are updated in place with their ids
+                self.update_indexes(*[
+                    self.mongo_to_object(statement_data)
+                    for position, statement_data in enumerate(create_statements)
+                    if position not in failed_positions
+                ])
+
+        with ThreadPoolExecutor(max_workers=max_pending_batches) as executor:
+            batch_number = 0
+
+            while True:
+                batch = list(islice(statements, batch_size))
+
+                if not batch:
+                    break
+
+                batch_number += 1
+
+                create_statements = []
+
+                search_texts = self.get_search_texts(batch)
+
+                for statement, (search_text, search_in_response_to) in zip(batch, search_texts):
+                    statement_data = statement.serialize()
+                    tag_data = list(set(statement_data.pop('tags', [])))
+                    statement_data['tags'] = tag_data
+
+                    statement_data['search_text'] = search_text
+                    statement_data['search_in_response_to'] = search_in_response_to
+                    statement_data['search_tokens'] = self.get_search_tokens(search_text)
+
+                    # The ids are assigned here rather than by the insert on the worker
+                    # thread, so that they increase in the order the statements were read
+                    statement_data['_id'] = ObjectId()
 
-            if not statement.search_text:
-                statement_data['search_text'] = self.tagger.get_text_index_string(statement.text)
+                    create_statements.append(statement_data)
 
-            if not statement.search_in_response_to and statement.in_response_to:
-                statement_data['search_in_response_to'] = self.tagger.get_text_index_string(statement.in_response_to)
+                if len(pending_batches) >= max_pending_batches:
+                    finish_batch()
 
-            create_statements.append(statement_data)
+                pending_batches.append((
+                    batch_number,
+                    create_statements,
+                    executor.submit(self.statements.insert_many, create_statements, ordered=False)
+                ))
 
-        self.statements.insert_many(create_statements)
+            while pending_batches:
+                finish_batch()
+
+        elapsed_time = perf_counter() - start_time
+
+        self.logger.info('Created {} statements in {:.2f} seconds ({:.0f} rows per second)'.format(
+            created_count,
+            elapsed_time,
+            created_count / elapsed_time if elapsed_time else 0
+        ))
+
+        if errors:
+            raise errors[0]
+
+        return created_count
 
     def update(self, statement):
         data = statement.serialize()
@@ -198,6 +395,7 @@ class MongoDatabaseAdapter(StorageAdapter):
         data.pop('tags', None)
 
         data['search_text'] = self.tagger.get_text_index_string(data['text'])
+        data['search_tokens'] = self.get_search_tokens(data['search_text'])
 
         if data.get('in_response_to'):
             data['search_in_response_to'] = self.tagger.get_text_index_string(data['in_response_to'])
@@ -230,33 +428,62 @@ class MongoDatabaseAdapter(StorageAdapter):
         if update_operation.acknowledged:
             statement.id = update_operation.upserted_id
 
+        if self.indexes:
+            statement_id = search_parameters.get('_id', update_operation.upserted_id)
+
+            if statement_id is None:
+                statement_id = self.statements.find_one(search_parameters, {'_id': 1})['_id']
+
+            self.update_indexes(self.mongo_to_object(
+                dict(data, _id=statement_id)
+            ))
+
         return statement
 
-    def get_random(self):
+    def get_latest_statements(self, conversation, limit):
         """
-        Returns a random statement from the database
+        Returns the most recent statements in a conversation,
+        ordered from the oldest to the newest.
         """
-        from random import randint
+        import pymongo
 
-        count = self.count()
+        statements = self.statements.find({'conversation': conversation}).sort(
+            '_id', pymongo.DESCENDING
+        ).limit(limit)
 
-        if count < 1:
-            raise self.EmptyDatabaseException()
+        return [
+            self.mongo_to_object(statement) for statement in reversed(list(statements))
+        ]
 
-        random_integer = randint(0, count - 1)
+    def get_random(self):
+        """
+        Returns a random statement from the database
+        """
+        statements = list(self.statements.aggregate([
+            {'$sample': {'size': 1}}
+        ]))
 
-        statements = self.statements.find().limit(1).skip(random_integer)
+        if not statements:
+            raise self.EmptyDatabaseException()
 
-        return self.mongo_to_object(list(statements)[0])
+        return self.mongo_to_object(statements[0])
 
     def remove(self, statement_text):
         """
         Removes the statement that matches the input text.
         """
-        self.statements.delete_one({'text': statement_text})
+        deleted = self.statements.find_one_and_delete({'text': statement_text})
+
+        if deleted:
+            self.remove_from_indexes(deleted['_id'])
 
     def drop(self):
         """
         Remove the database.
         """
         self.client.drop_database(self.database.name)
+
+        # Keep the adapter usable after the database is removed
+        self.create_indexes()
+
+        self.clear_indexes()
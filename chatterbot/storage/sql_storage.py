@@ -43,8 +43,14 @@ class SQLStorageAdapter(StorageAdapter):
                 dbapi_connection.execute('PRAGMA journal_mode=WAL')
                 dbapi_connection.execute('PRAGMA synchronous=NORMAL')
 
-        if not self.engine.dialect.has_table(self.engine, 'Statement'):
+        Statement = self.get_model('statement')
+
+        # Table names are case sensitive in some databases, such as PostgreSQL
+        if not self.engine.dialect.has_table(self.engine, Statement.__tablename__):
             self.create_database()
+        else:
+            self.create_missing_indexes()
+            self.full_text_search = self.create_full_text_search_index()
 
         self.Session = sessionmaker(bind=self.engine, expire_on_commit=True)
 
@@ -62,11 +68,27 @@ class SQLStorageAdapter(StorageAdapter):
         from chatterbot.ext.sqlalchemy_app.models import Tag
         return Tag
 
-    def model_to_object(self, statement):
+    def model_to_object(self, statement, load_tags=True):
         from chatterbot.conversation import Statement as StatementObject
 
+        if not load_tags:
+            return StatementObject(**{
+                field_name: getattr(statement, field_name)
+                for field_name in statement.get_statement_field_names()
+                if field_name != 'tags'
+            })
+
         return StatementObject(**statement.serialize())
 
+    def row_to_object(self, row):
+        """
+        Return a statement object containing only the
+        values of the columns that were selected.
+        """
+        from chatterbot.conversation import Statement as StatementObject
+
+        return StatementObject(**row._asdict())
+
     def count(self):
         """
         Return the number of entries in the database.
@@ -89,10 +111,12 @@ class SQLStorageAdapter(StorageAdapter):
 
         query = session.query(Statement).filter_by(text=statement_text)
         record = query.first()
+        statement_id = record.id
 
         session.delete(record)
 
-        self._session_finish(session)
+        if self._session_finish(session):
+            self.remove_from_indexes(statement_id)
 
     def filter(self, **kwargs):
         """
@@ -103,6 +127,7 @@ class SQLStorageAdapter(StorageAdapter):
         for all listed attributes will be returned.
         """
         from sqlalchemy import or_
+        from sqlalchemy.orm import selectinload
 
         Statement = self.get_model('statement')
         Tag = self.get_model('tag')
@@ -116,19 +141,43 @@ class SQLStorageAdapter(StorageAdapter):
         exclude_text_words = kwargs.pop('exclude_text_words', [])
         persona_not_startswith = kwargs.pop('persona_not_startswith', None)
         search_text_contains = kwargs.pop('search_text_contains', None)
+        ids = kwargs.pop('ids', None)
+        load_tags = kwargs.pop('load_tags', True)
+        fields = kwargs.pop('fields', None)
 
         # Convert a single sting into a list if only one tag is provided
         if type(tags) == str:
             tags = [tags]
 
+        # Tags are stored in another table, so statements are loaded in full
+        # when their tags are needed. Otherwise, only the requested columns
+        # (and the id) are selected.
+        select_columns = fields and 'tags' not in fields
+
+        if select_columns:
+            statements = session.query(Statement.id, *[
+                getattr(Statement, field_name) for field_name in fields if field_name != 'id'
+            ])
+        else:
+            statements = session.query(Statement)
+
         if len(kwargs) == 0:
-            statements = session.query(Statement).filter()
+            statements = statements.filter()
         else:
-            statements = session.query(Statement).filter_by(**kwargs)
+            statements = statements.filter_by(**kwargs)
+
+        if load_tags and not select_columns:
+            # Load the tags of each page of statements in a single query
+            statements = statements.options(selectinload(Statement.tags))
+
+        if ids is not None:
+            statements = statements.filter(
+                Statement.id.in_(ids)
+            )
 
         if tags:
-            statements = statements.join(Statement.tags).filter(
-                Tag.name.in_(tags)
+            statements = statements.filter(
+                Statement.tags.any(Tag.name.in_(tags))
             )
 
         if exclude_text:
@@ -149,7 +198,29 @@ class SQLStorageAdapter(StorageAdapter):
                 ~Statement.persona.startswith('bot:')
             )
 
-        if search_text_contains:
+        full_text_search_query = None
+
+        if search_text_contains and self.full_text_search:
+            full_text_search_query = self.get_full_text_search_query(search_text_contains)
+
+        if full_text_search_query:
+            from sqlalchemy import column, table, text
+
+            statement_fts = table('statement_fts', column('rowid'), column('rank'))
+
+            statements = statements.join(
+                statement_fts, statement_fts.c.rowid == Statement.id
+            ).filter(
+                text('statement_fts MATCH :search_text_query').bindparams(
+                    search_text_query=full_text_search_query
+                )
+            )
+
+            # Return the closest matches first unless another order is requested
+            if not order_by:
+                order_by = [statement_fts.c.rank]
+
+        elif search_text_contains:
             or_query = [
                 Statement.search_text.contains(word) for word in search_text_contains.split(' ')
             ]
@@ -157,21 +228,67 @@ class SQLStorageAdapter(StorageAdapter):
                 or_(*or_query)
             )
 
-        if order_by:
+        try:
+            if order_by:
 
-            if 'created_at' in order_by:
-                index = order_by.index('created_at')
-                order_by[index] = Statement.created_at.asc()
+                if 'created_at' in order_by:
+                    index = order_by.index('created_at')
+                    order_by[index] = Statement.created_at.asc()
 
-            statements = statements.order_by(*order_by)
+                statements = statements.order_by(*order_by)
 
-        total_statements = statements.count()
+                if load_tags and not select_columns:
+                    # The tags of each page are loaded with a second query, which
+                    # some database drivers can not run while the results of the
+                    # first one are streamed, so each page is loaded in full.
+                    # The id makes the order of the pages stable.
+                    statements = statements.order_by(Statement.id)
+                    offset = 0
 
-        for start_index in range(0, total_statements, page_size):
-            for statement in statements.slice(start_index, start_index + page_size):
-                yield self.model_to_object(statement)
+                    while True:
+                        page = statements.limit(page_size).offset(offset).all()
 
-        session.close()
+                        for statement in page:
+                            yield self.model_to_object(statement, load_tags)
+
+                        if len(page) < page_size:
+                            break
+
+                        offset += page_size
+                else:
+                    # Stream the ordered results from the database in pages
+                    for statement in statements.yield_per(page_size):
+                        if select_columns:
+                            yield self.row_to_object(statement)
+                        else:
+                            yield self.model_to_object(statement, load_tags)
+            else:
+                statements = statements.order_by(Statement.id)
+                last_id = None
+
+                # Load each page of results following the last id of the
+                # previous page, so the cost of a page does not depend on
+                # how many pages came before it
+                while True:
+                    page = statements
+
+                    if last_id is not None:
+                        page = page.filter(Statement.id > last_id)
+
+                    page = page.limit(page_size).all()
+
+                    for statement in page:
+                        if select_columns:
+                            yield self.row_to_object(statement)
+                        else:
+                            yield self.model_to_object(statement, load_tags)
+
+                    if len(page) < page_size:
+                        break
+
+                    last_id = page[-1].id
+        finally:
+            session.close()
 
     def create(self, **kwargs):
         """
@@ -206,19 +323,239 @@ class SQLStorageAdapter(StorageAdapter):
 
         session.add(statement)
 
+        # Any columns set by the database are loaded when they are accessed
         session.flush()
 
-        session.refresh(statement)
-
         statement_object = self.model_to_object(statement)
 
-        self._session_finish(session)
+        if self._session_finish(session):
+            self.update_indexes(statement_object)
 
         return statement_object
 
-    def create_many(self, statements):
+    def create_many(self, statements, batch_size=1000):
         """
         Creates multiple statement entries.
+
+        Statements are inserted in chunks of ``batch_size`` rows, each saved in
+        its own transaction with one bulk insert for the statements and one for
+        their tag associations, so that memory use is bounded by the chunk size.
+
+        :param statements: The statements to create. Any iterable is accepted.
+
+        :param batch_size: The number of statements saved in each transaction.
+        :type batch_size: int
+
+        :returns: The number of statements created.
+        :rtype: int
+        """
+        from itertools import islice
+        from time import perf_counter
+
+        statements = iter(statements)
+        created_count = 0
+        start_time = perf_counter()
+
+        while True:
+            chunk = list(islice(statements, batch_size))
+
+            if not chunk:
+                break
+
+            self._create_chunk(chunk)
+            created_count += len(chunk)
+
+        elapsed_time = perf_counter() - start_time
+
+        self.logger.info('Created {} statements in {:.2f} seconds ({:.0f} rows per second)'.format(
+            created_count,
+            elapsed_time,
+            created_count / elapsed_time if elapsed_time else 0
+        ))
+
+        return created_count
+
+    def _create_chunk(self, statements):
+        """
+        Insert a chunk of statements and their tags in a single transaction.
+        """
+        from chatterbot.conversation import Statement as StatementObject
+        from chatterbot.ext.sqlalchemy_app.models import tag_association_table
+
+        search_texts = self.get_search_texts(statements)
+
+        rows = []
+        tag_lists = []
+
+        for statement, (search_text, search_in_response_to) in zip(statements, search_texts):
+            statement_data = statement.serialize()
+            statement_data.pop('id', None)
+
+            tag_lists.append(statement_data.pop('tags', []))
+
+            statement_data['search_text'] = search_text
+            statement_data['search_in_response_to'] = search_in_response_to
+
+            rows.append(statement_data)
+
+        # The ids of the new rows are only needed to add tags or update indexes
+        ids_required = self.indexes or any(tag_lists)
+
+        session = self.Session()
+
+        try:
+            statement_ids = self._insert_statement_rows(session, rows, ids_required)
+
+            tag_names = set(
+                tag_name for tag_list in tag_lists for tag_name in tag_list
+            )
+
+            if tag_names:
+                tag_ids = self._get_or_create_tag_ids(session, tag_names)
+
+                session.execute(tag_association_table.insert(), [
+                    {'statement_id': statement_id, 'tag_id': tag_ids[tag_name]}
+                    for statement_id, tag_list in zip(statement_ids, tag_lists)
+                    for tag_name in set(tag_list)
+                ])
+
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        if self.indexes:
+            self.update_indexes(*[
+                StatementObject(id=statement_id, tags=tag_list, **row)
+                for statement_id, row, tag_list in zip(statement_ids, rows, tag_lists)
+            ])
+
+    def _insert_statement_rows(self, session, rows, ids_required):
+        """
+        Insert statement rows and return their ids, in the same order as the
+        rows, if they are required. Otherwise an empty list is returned.
+        """
+        from sqlalchemy import select
+
+        Statement = self.get_model('statement')
+
+        statement_table = Statement.__table__
+
+        if not ids_required:
+            session.execute(statement_table.insert(), rows)
+            return []
+
+        if self.engine.dialect.name == 'sqlite':
+            session.execute(statement_table.insert(), rows)
+
+            # SQLite holds the write lock of the database from the first insert
+            # until the commit, and numbers each new row after the highest id in
+            # the table, so the new rows are the ones with the highest ids
+            statement_ids = [
+                row[0] for row in session.execute(
+                    select([statement_table.c.id]).order_by(
+                        statement_table.c.id.desc()
+                    ).limit(len(rows))
+                )
+            ]
+
+            return statement_ids[::-1]
+
+        if self.engine.dialect.name == 'postgresql':
+            # The ids of the rows in a single insert are taken from the sequence
+            # in the order of the rows, although other transactions can take ids
+            # in between them, so the returned ids are matched to the rows in order.
+            # Each insert stays below the limit of 65535 parameters in a query.
+            rows_per_insert = 65535 // len(rows[0])
+            statement_ids = []
+
+            for start_index in range(0, len(rows), rows_per_insert):
+                inserted_ids = session.execute(
+                    statement_table.insert().values(
+                        rows[start_index:start_index + rows_per_insert]
+                    ).returning(statement_table.c.id)
+                )
+
+                statement_ids.extend(sorted(row[0] for row in inserted_ids))
+
+            return statement_ids
+
+        # Other databases can number the rows of concurrent transactions in
+        # any order, so each row is inserted on its own to get its id
+        return [
+            session.execute(statement_table.insert(), row).inserted_primary_key[0]
+            for row in rows
+        ]
+
+    def _get_or_create_tag_ids(self, session, tag_names):
+        """
+        Return a dictionary of tag ids keyed by tag name,
+        inserting the tags that do not exist yet.
+        """
+        from sqlalchemy import select
+
+        Tag = self.get_model('tag')
+
+        tag_table = Tag.__table__
+
+        def select_tag_ids():
+            return dict(
+                (name, tag_id) for tag_id, name in session.execute(
+                    select([tag_table.c.id, tag_table.c.name]).where(
+                        tag_table.c.name.in_(tag_names)
+                    )
+                )
+            )
+
+        tag_ids = select_tag_ids()
+
+        missing_tag_names = tag_names - set(tag_ids.keys())
+
+        if missing_tag_names:
+            self._insert_tags(session, missing_tag_names)
+
+            tag_ids = select_tag_ids()
+
+        return tag_ids
+
+    def _insert_tags(self, session, tag_names):
+        """
+        Insert tags, skipping any that were created by another
+        transaction after the existing tags were selected.
+        """
+        from sqlalchemy.exc import IntegrityError
+
+        Tag = self.get_model('tag')
+
+        tag_table = Tag.__table__
+
+        rows = [{'name': tag_name} for tag_name in tag_names]
+
+        dialect_name = self.engine.dialect.name
+
+        if dialect_name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+
+            session.execute(insert(tag_table).on_conflict_do_nothing(index_elements=['name']), rows)
+        elif dialect_name == 'sqlite':
+            session.execute(tag_table.insert().prefix_with('OR IGNORE'), rows)
+        elif dialect_name == 'mysql':
+            session.execute(tag_table.insert().prefix_with('IGNORE'), rows)
+        else:
+            # Each tag is inserted in a savepoint, so a tag that already
+            # exists does not roll back the rest of the transaction
+            for row in rows:
+                try:
+                    with session.begin_nested():
+                        session.execute(tag_table.insert(), row)
+                except IntegrityError:
+                    pass
+
+    def create_pair(self, statement, response):
+        """
+        Save a statement and the response to it in a single transaction.
         """
         Statement = self.get_model('statement')
         Tag = self.get_model('tag')
@@ -228,43 +565,45 @@ class SQLStorageAdapter(StorageAdapter):
         create_statements = []
         create_tags = {}
 
-        for statement in statements:
+        statement_data_list = [statement.serialize(), response.serialize()]
 
-            statement_data = statement.serialize()
-            tag_data = statement_data.pop('tags', [])
-
-            statement_model_object = Statement(**statement_data)
+        tag_names = set()
 
-            if not statement.search_text:
-                statement_model_object.search_text = self.tagger.get_text_index_string(statement.text)
+        for statement_data in statement_data_list:
+            tag_names.update(statement_data['tags'])
 
-            if not statement.search_in_response_to and statement.in_response_to:
-                statement_model_object.search_in_response_to = self.tagger.get_text_index_string(statement.in_response_to)
+        if tag_names:
+            for existing_tag in session.query(Tag).filter(Tag.name.in_(tag_names)):
+                create_tags[existing_tag.name] = existing_tag
 
-            new_tags = set(tag_data) - set(create_tags.keys())
+        for statement_data in statement_data_list:
+            tag_data = set(statement_data.pop('tags', []))
 
-            if new_tags:
-                existing_tags = session.query(Tag).filter(
-                    Tag.name.in_(new_tags)
-                )
-
-                for existing_tag in existing_tags:
-                    create_tags[existing_tag.name] = existing_tag
+            statement_model_object = Statement(**statement_data)
 
             for tag_name in tag_data:
-                if tag_name in create_tags:
-                    tag = create_tags[tag_name]
-                else:
+                if tag_name not in create_tags:
                     # Create the tag if it does not exist
-                    tag = Tag(name=tag_name)
+                    create_tags[tag_name] = Tag(name=tag_name)
 
-                    create_tags[tag_name] = tag
+                statement_model_object.tags.append(create_tags[tag_name])
 
-                statement_model_object.tags.append(tag)
             create_statements.append(statement_model_object)
 
         session.add_all(create_statements)
-        session.commit()
+
+        statement_objects = []
+
+        if self.indexes:
+            # Flush to have ids assigned to the new statements
+            session.flush()
+            statement_objects = [
+                self.model_to_object(statement) for statement in create_statements
+            ]
+
+        # The indexes are only updated once the statements have been saved
+        if self._session_finish(session) and statement_objects:
+            self.update_indexes(*statement_objects)
 
     def update(self, statement):
         """
@@ -315,44 +654,101 @@ class SQLStorageAdapter(StorageAdapter):
 
             session.add(record)
 
-            self._session_finish(session)
+            statement_object = None
+
+            if self.indexes:
+                session.flush()
+                statement_object = self.model_to_object(record)
+
+            if self._session_finish(session) and statement_object is not None:
+                self.update_indexes(statement_object)
+
+    def get_latest_statements(self, conversation, limit):
+        """
+        Returns the most recent statements in a conversation,
+        ordered from the oldest to the newest.
+        """
+        from sqlalchemy.orm import selectinload
+
+        Statement = self.get_model('statement')
+
+        session = self.Session()
+
+        try:
+            statements = session.query(Statement).filter_by(
+                conversation=conversation
+            ).options(
+                selectinload(Statement.tags)
+            ).order_by(
+                Statement.id.desc()
+            ).limit(limit).all()
+
+            return [
+                self.model_to_object(statement) for statement in reversed(statements)
+            ]
+        finally:
+            session.close()
 
     def get_random(self):
         """
         Returns a random statement from the database.
+
+        An id is picked at random between the lowest and highest statement
+        ids, so that the statement can be found through the primary key
+        without counting or scanning the table. If there is no statement with
+        the picked id after a few attempts, the next statement after the last
+        picked id is returned.
         """
         import random
+        from sqlalchemy import func
 
         Statement = self.get_model('statement')
 
         session = self.Session()
-        count = self.count()
-        if count < 1:
-            raise self.EmptyDatabaseException()
 
-        random_index = random.randrange(0, count)
-        random_statement = session.query(Statement)[random_index]
+        try:
+            minimum_id, maximum_id = session.query(
+                func.min(Statement.id), func.max(Statement.id)
+            ).one()
 
-        statement = self.model_to_object(random_statement)
+            if maximum_id is None:
+                raise self.EmptyDatabaseException()
 
-        session.close()
-        return statement
+            for _ in range(3):
+                random_id = random.randint(minimum_id, maximum_id)
+                random_statement = session.query(Statement).get(random_id)
+
+                if random_statement is not None:
+                    break
+            else:
+                random_statement = session.query(Statement).filter(
+                    Statement.id >= random_id
+                ).order_by(Statement.id).first()
+
+            return self.model_to_object(random_statement)
+        finally:
+            session.close()
 
     def drop(self):
         """
         Drop the database.
         """
+        from chatterbot.ext.sqlalchemy_app.models import tag_association_table
+
         Statement = self.get_model('statement')
         Tag = self.get_model('tag')
 
         session = self.Session()
 
+        session.execute(tag_association_table.delete())
         session.query(Statement).delete()
         session.query(Tag).delete()
 
         session.commit()
         session.close()
 
+        self.clear_indexes()
+
     def create_database(self):
         """
         Populate the database with the tables.
@@ -360,12 +756,118 @@ class SQLStorageAdapter(StorageAdapter):
         from chatterbot.ext.sqlalchemy_app.models import Base
         Base.metadata.create_all(self.engine)
 
+        self.full_text_search = self.create_full_text_search_index()
+
+    def create_missing_indexes(self):
+        """
+        Create any indexes of the statement table that do not exist
+        in a database that was created by an earlier version.
+        """
+        from sqlalchemy import inspect
+
+        Statement = self.get_model('statement')
+
+        existing_index_names = set(
+            index['name'] for index in inspect(self.engine).get_indexes(Statement.__tablename__)
+        )
+
+        for index in Statement.__table__.indexes:
+            if index.name not in existing_index_names:
+                index.create(bind=self.engine)
+
+    def create_full_text_search_index(self):
+        """
+        Create a SQLite FTS5 table that mirrors the search text fields of
+        the statement table, along with the triggers that keep it in sync
+        when statements are created, updated or removed.
+
+        :returns: True if the database supports full text search.
+        :rtype: bool
+        """
+        from sqlalchemy.exc import OperationalError
+
+        if self.engine.dialect.name != 'sqlite':
+            return False
+
+        with self.engine.begin() as connection:
+            exists = connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'statement_fts'"
+            ).first()
+
+            if exists:
+                return True
+
+            try:
+                connection.execute(
+                    'CREATE VIRTUAL TABLE statement_fts USING fts5('
+                    'search_text, search_in_response_to, '
+                    "content='statement', content_rowid='id')"
+                )
+            except OperationalError:
+                self.logger.warning(
+                    'SQLite FTS5 is not available, search text will be matched without an index'
+                )
+                return False
+
+            connection.execute(
+                'CREATE TRIGGER statement_fts_insert AFTER INSERT ON statement BEGIN '
+                'INSERT INTO statement_fts (rowid, search_text, search_in_response_to) '
+                'VALUES (new.id, new.search_text, new.search_in_response_to); '
+                'END'
+            )
+
+            connection.execute(
+                'CREATE TRIGGER statement_fts_delete AFTER DELETE ON statement BEGIN '
+                'INSERT INTO statement_fts (statement_fts, rowid, search_text, search_in_response_to) '
+                "VALUES ('delete', old.id, old.search_text, old.search_in_response_to); "
+                'END'
+            )
+
+            connection.execute(
+                'CREATE TRIGGER statement_fts_update AFTER UPDATE ON statement BEGIN '
+                'INSERT INTO statement_fts (statement_fts, rowid, search_text, search_in_response_to) '
+                "VALUES ('delete', old.id, old.search_text, old.search_in_response_to); "
+                'INSERT INTO statement_fts (rowid, search_text, search_in_response_to) '
+                'VALUES (new.id, new.search_text, new.search_in_response_to); '
+                'END'
+            )
+
+            # Index any statements that already exist in the database
+            connection.execute(
+                "INSERT INTO statement_fts (statement_fts) VALUES ('rebuild')"
+            )
+
+        return True
+
+    def get_full_text_search_query(self, search_text_contains):
+        """
+        Return a FTS5 query matching statements with search text that
+        contains any of the space separated words. None is returned if
+        any of the words cannot be matched by the full text search index.
+        """
+        words = [word for word in search_text_contains.split(' ') if word]
+
+        # Words without any letters or numbers are not tokenized by FTS5
+        if not words or not all(any(character.isalnum() for character in word) for word in words):
+            return None
+
+        phrases = [
+            '"{}"'.format(word.replace('"', '""')) for word in words
+        ]
+
+        return 'search_text : ({})'.format(' OR '.join(phrases))
+
     def _session_finish(self, session, statement_text=None):
+        """
+        Commit and close the session. Returns True if the changes were saved.
+        """
         from sqlalchemy.exc import InvalidRequestError
         try:
             session.commit()
+            return True
         except InvalidRequestError:
             # Log the statement text and the exception
             self.logger.exception(statement_text)
+            return False
         finally:
             session.close()
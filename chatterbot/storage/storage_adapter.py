@@ -1,6 +1,6 @@
 import logging
 from chatterbot import languages
-from chatterbot.tagging import PosLemmaTagger
+from chatterbot.tagging import PosLemmaTagger, get_text_index_strings
 
 
 class StorageAdapter(object):
@@ -14,14 +14,29 @@ class StorageAdapter(object):
         Initialize common attributes shared by all storage adapters.
 
         :param str tagger_language: The language that the tagger uses to remove stopwords.
+
+        :param int tagger_cache_size: The number of index strings that the tagger keeps in memory.
+
+        :param str tagger_cache_path: The path of a database that the tagger saves index strings to.
         """
         self.logger = kwargs.get('logger', logging.getLogger(__name__))
 
         Tagger = kwargs.get('tagger', PosLemmaTagger)
 
-        self.tagger = Tagger(language=kwargs.get(
-            'tagger_language', languages.ENG
-        ))
+        tagger_parameters = {
+            'language': kwargs.get('tagger_language', languages.ENG)
+        }
+
+        if 'tagger_cache_size' in kwargs:
+            tagger_parameters['cache_size'] = kwargs['tagger_cache_size']
+
+        if 'tagger_cache_path' in kwargs:
+            tagger_parameters['cache_path'] = kwargs['tagger_cache_path']
+
+        self.tagger = Tagger(**tagger_parameters)
+
+        # In-process indexes that are kept up to date by the adapter
+        self.indexes = []
 
     def get_model(self, model_name):
         """
@@ -58,6 +73,45 @@ class StorageAdapter(object):
 
         return Statement
 
+    def add_index(self, index):
+        """
+        Attach an in-process index to the storage adapter.
+        The index is built from the statements that currently exist in
+        the database and is kept up to date as statements are created,
+        updated and removed.
+
+        :param index: The index to attach.
+        :type index: chatterbot.indexes.StatementIndex
+        """
+        index.build(self.filter(load_tags=False))
+
+        self.indexes.append(index)
+
+    def update_indexes(self, *statements):
+        """
+        Add or replace the entries for the given statements in each of the
+        indexes attached to the storage adapter. Adapters should call this
+        after writing statements to the database.
+        """
+        for index in self.indexes:
+            index.add_many(statements)
+
+    def remove_from_indexes(self, *statement_ids):
+        """
+        Remove the statements with the given ids from each of the
+        indexes attached to the storage adapter.
+        """
+        for index in self.indexes:
+            for statement_id in statement_ids:
+                index.remove(statement_id)
+
+    def clear_indexes(self):
+        """
+        Remove all entries from the indexes attached to the storage adapter.
+        """
+        for index in self.indexes:
+            index.clear()
+
     def count(self):
         """
         Return the number of entries in the database.
@@ -116,6 +170,20 @@ class StorageAdapter(object):
             this parameter, then the statement will be included in the
             result set.
             Defaults to None
+
+        :param ids: A list of statement ids. When specified, the results will
+            only include statements that have an id in the provided list.
+            Defaults to None
+
+        :param load_tags: When False, the tags of the statements are not
+            loaded and the returned statements will not have any tags.
+            Defaults to True
+
+        :param fields: A list of the names of the fields that the returned
+            statements need. Only these fields, and the id, are loaded from
+            the database. The other fields of the returned statements are
+            left with their default values.
+            Defaults to None (all fields)
         """
         raise self.AdapterMethodNotImplementedError(
             'The `filter` method is not implemented by this adapter.'
@@ -138,6 +206,49 @@ class StorageAdapter(object):
             'The `create_many` method is not implemented by this adapter.'
         )
 
+    def get_search_texts(self, statements):
+        """
+        Return a tuple containing the search text and the search in response
+        to text of each statement. Any of these values that are missing from
+        the statements are generated by the tagger in a single batch.
+        """
+        texts_to_tag = []
+
+        for statement in statements:
+            if not statement.search_text:
+                texts_to_tag.append(statement.text)
+
+            if not statement.search_in_response_to and statement.in_response_to:
+                texts_to_tag.append(statement.in_response_to)
+
+        index_strings = iter(get_text_index_strings(self.tagger, texts_to_tag))
+
+        search_texts = []
+
+        for statement in statements:
+            search_text = statement.search_text
+            search_in_response_to = statement.search_in_response_to
+
+            if not statement.search_text:
+                search_text = next(index_strings)
+
+            if not statement.search_in_response_to and statement.in_response_to:
+                search_in_response_to = next(index_strings)
+
+            search_texts.append((search_text, search_in_response_to))
+
+        return search_texts
+
+    def create_pair(self, statement, response):
+        """
+        Save a statement and the response to it. The fields of both
+        statements are saved as they are, without tagging any text.
+        Adapters that support transactions save both statements in
+        a single transaction.
+        """
+        self.create(**statement.serialize())
+        self.create(**response.serialize())
+
     def update(self, statement):
         """
         Modifies an entry in the database.
@@ -147,6 +258,21 @@ class StorageAdapter(object):
             'The `update` method is not implemented by this adapter.'
         )
 
+    def get_latest_statements(self, conversation, limit):
+        """
+        Returns the most recent statements in a conversation,
+        ordered from the oldest to the newest.
+
+        Adapters should override this method to query only
+        the latest statements instead of the whole conversation.
+        """
+        statements = list(self.filter(
+            conversation=conversation,
+            order_by=['id']
+        ))
+
+        return statements[-limit:]
+
     def get_random(self):
         """
         Returns a random statement from the database.
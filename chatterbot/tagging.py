@@ -1,5 +1,151 @@
 import string
-from chatterbot import languages
+from collections import OrderedDict
+from threading import Lock
+from chatterbot import constants, languages
+from chatterbot.utils import get_spacy_model
+
+
+class IndexStringCache(object):
+    """
+    A thread-safe, least recently used cache of the index strings that
+    a tagger has created for text. When a path is provided, index strings
+    are also saved to a SQLite database so that they can be reused after
+    the process restarts.
+
+    :param maximum_size: The number of index strings kept in memory.
+    :type maximum_size: int
+
+    :param path: The path of the SQLite database used to save index strings.
+    :type path: str
+
+    :param get_version: A callable returning a string identifying the
+        language and model that create the index strings. Index strings
+        saved by a different version are not reused.
+    :type get_version: callable
+    """
+
+    def __init__(self, maximum_size=10000, path=None, get_version=None):
+        self.maximum_size = maximum_size
+        self.path = path
+        self.get_version = get_version or (lambda: '')
+
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.lock = Lock()
+        self.connection = None
+        self.version = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_connection(self):
+        """
+        Return the connection to the database of saved index
+        strings, opening it if it is not already open.
+        """
+        if self.connection is None:
+            import sqlite3
+
+            self.version = self.get_version()
+
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS index_string ('
+                'version TEXT, text TEXT, index_string TEXT, '
+                'PRIMARY KEY (version, text))'
+            )
+            self.connection.commit()
+
+        return self.connection
+
+    def remember(self, text, index_string):
+        """
+        Keep an index string in memory, discarding the least
+        recently used entries if the cache is too large.
+        """
+        if self.maximum_size <= 0:
+            return
+
+        self.entries[text] = index_string
+        self.entries.move_to_end(text)
+
+        while len(self.entries) > self.maximum_size:
+            self.entries.popitem(last=False)
+
+    def get(self, text):
+        """
+        Return the cached index string of the text, or None if
+        the text has not been cached.
+        """
+        with self.lock:
+            index_string = self.entries.get(text)
+
+            if index_string is not None:
+                self.entries.move_to_end(text)
+            elif self.path:
+                row = self.get_connection().execute(
+                    'SELECT index_string FROM index_string WHERE version = ? AND text = ?',
+                    (self.version, text, )
+                ).fetchone()
+
+                if row:
+                    index_string = row[0]
+                    self.remember(text, index_string)
+
+            if index_string is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+            return index_string
+
+    def set_many(self, index_strings):
+        """
+        Cache the index strings of multiple texts.
+
+        :param index_strings: A dictionary mapping each text to its index string.
+        """
+        with self.lock:
+            for text, index_string in index_strings.items():
+                self.remember(text, index_string)
+
+            if self.path and index_strings:
+                connection = self.get_connection()
+                connection.executemany(
+                    'INSERT OR REPLACE INTO index_string (version, text, index_string) VALUES (?, ?, ?)',
+                    [
+                        (self.version, text, index_string, )
+                        for text, index_string in index_strings.items()
+                    ]
+                )
+                connection.commit()
+
+    def set(self, text, index_string):
+        """
+        Cache the index string of the text.
+        """
+        self.set_many({text: index_string})
+
+    def clear(self):
+        """
+        Remove all index strings from the cache and reset its counters.
+        Index strings saved to the database are not removed.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        """
+        Close the connection to the database of saved index strings.
+        """
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
 
 
 class LowercaseTagger(object):
@@ -7,36 +153,92 @@ class LowercaseTagger(object):
     Returns the text in lowercase.
     """
 
-    def __init__(self, language=None):
+    def __init__(self, language=None, **kwargs):
         self.language = language or languages.ENG
 
     def get_text_index_string(self, text):
         return text.lower()
 
+    def get_text_index_strings(self, texts, batch_size=None, n_process=None):
+        """
+        Return the lowercase form of each text.
+        """
+        return [text.lower() for text in texts]
+
 
 class PosLemmaTagger(object):
+    """
+    Creates index strings made up of the part-of-speech, lemma pairs
+    of the text. Index strings are cached, so text that has already
+    been tagged does not need to be processed by spaCy again.
 
-    def __init__(self, language=None):
-        import spacy
+    :param cache_size: The number of index strings to keep in memory.
+        Set to 0 to disable the in-memory cache.
+    :type cache_size: int
+
+    :param cache_path: The path of a SQLite database that index strings
+        are saved to so that they are reused after restarting.
+    :type cache_path: str
+    """
+
+    def __init__(self, language=None, disabled_pipes=constants.DISABLED_SPACY_PIPES, cache_size=10000, cache_path=None):
+        import spacy  # NOQA
 
         self.language = language or languages.ENG
 
+        self.disabled_pipes = disabled_pipes
+
         self.punctuation_table = str.maketrans(dict.fromkeys(string.punctuation))
 
-        self.nlp = spacy.load(self.language.ISO_639_1.lower())
+        self._nlp = None
 
-    def get_text_index_string(self, text):
+        self.cache = IndexStringCache(
+            maximum_size=cache_size,
+            path=cache_path,
+            get_version=self.get_model_version
+        )
+
+    @property
+    def nlp(self):
         """
-        Return a string of text containing part-of-speech, lemma pairs.
+        The spaCy model used to tag text. The model is shared with
+        any other component that uses the same language and pipeline.
         """
-        bigram_pairs = []
+        if self._nlp is None:
+            self._nlp = get_spacy_model(self.language, self.disabled_pipes)
+
+        return self._nlp
+
+    def get_model_version(self):
+        """
+        Return a string identifying the language
+        and version of the spaCy model.
+        """
+        return '{}_{}-{}'.format(
+            self.nlp.meta.get('lang', self.language.ISO_639_1.lower()),
+            self.nlp.meta.get('name', ''),
+            self.nlp.meta.get('version', '')
+        )
 
+    def get_tagging_text(self, text):
+        """
+        Return the text that should be processed by the spaCy model.
+        Punctuation is removed from very short text unless the text
+        is made up of only punctuation.
+        """
         if len(text) <= 2:
             text_without_punctuation = text.translate(self.punctuation_table)
             if len(text_without_punctuation) >= 1:
                 text = text_without_punctuation
 
-        document = self.nlp(text)
+        return text
+
+    def get_document_index_string(self, text, document):
+        """
+        Return a string containing the part-of-speech, lemma pairs
+        of a document that was created from the text.
+        """
+        bigram_pairs = []
 
         if len(text) <= 2:
             bigram_pairs = [
@@ -64,3 +266,76 @@ class PosLemmaTagger(object):
             ]
 
         return ' '.join(bigram_pairs)
+
+    def get_text_index_string(self, text):
+        """
+        Return a string of text containing part-of-speech, lemma pairs.
+        """
+        index_string = self.cache.get(text)
+
+        if index_string is None:
+            tagging_text = self.get_tagging_text(text)
+
+            document = self.nlp(tagging_text)
+
+            index_string = self.get_document_index_string(tagging_text, document)
+
+            self.cache.set(text, index_string)
+
+        return index_string
+
+    def get_text_index_strings(self, texts, batch_size=1000, n_process=1):
+        """
+        Return the part-of-speech, lemma pair string of each text.
+        The texts that are not cached are processed by the spaCy model
+        in batches, which is much faster than tagging each text on its own.
+
+        :param batch_size: The number of texts in each batch.
+        :param n_process: The number of processes used to tag the texts.
+            Using more than one process requires spaCy 2.2 or later.
+        """
+        index_strings = {}
+
+        for text in texts:
+            if text not in index_strings:
+                index_strings[text] = self.cache.get(text)
+
+        uncached_texts = [
+            text for text, index_string in index_strings.items() if index_string is None
+        ]
+
+        if uncached_texts:
+            tagging_texts = [self.get_tagging_text(text) for text in uncached_texts]
+
+            pipe_parameters = {
+                'batch_size': batch_size
+            }
+
+            if n_process != 1:
+                pipe_parameters['n_process'] = n_process
+
+            documents = self.nlp.pipe(tagging_texts, **pipe_parameters)
+
+            new_index_strings = {
+                text: self.get_document_index_string(tagging_text, document)
+                for text, tagging_text, document in zip(uncached_texts, tagging_texts, documents)
+            }
+
+            self.cache.set_many(new_index_strings)
+            index_strings.update(new_index_strings)
+
+        return [index_strings[text] for text in texts]
+
+
+def get_text_index_strings(tagger, texts):
+    """
+    Return the index string of each text, tagged in a single batch when the
+    tagger supports it. Taggers that only implement ``get_text_index_string``
+    tag each text on its own.
+    """
+    tag_many = getattr(tagger, 'get_text_index_strings', None)
+
+    if tag_many is not None:
+        return tag_many(texts)
+
+    return [tagger.get_text_index_string(text) for text in texts]
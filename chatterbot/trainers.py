@@ -4,7 +4,7 @@ import csv
 import time
 from dateutil import parser as date_parser
 from chatterbot.conversation import Statement
-from chatterbot.tagging import PosLemmaTagger
+from chatterbot.tagging import PosLemmaTagger, get_text_index_strings
 from chatterbot import utils
 
 
@@ -90,6 +90,9 @@ class ListTrainer(Trainer):
 
         statements_to_create = []
 
+        # Tag the text of every statement in the conversation in one batch
+        search_texts = get_text_index_strings(self.chatbot.storage.tagger, conversation)
+
         for conversation_count, text in enumerate(conversation):
             if self.show_training_progress:
                 utils.print_progress_bar(
@@ -97,7 +100,7 @@ class ListTrainer(Trainer):
                     conversation_count + 1, len(conversation)
                 )
 
-            statement_search_text = self.chatbot.storage.tagger.get_text_index_string(text)
+            statement_search_text = search_texts[conversation_count]
 
             statement = self.get_preprocessed_statement(
                 Statement(
@@ -136,6 +139,11 @@ class ChatterBotCorpusTrainer(Trainer):
 
             statements_to_create = []
 
+            # Tag the text of every statement in the corpus file in one batch
+            search_texts = iter(get_text_index_strings(self.chatbot.storage.tagger, [
+                text for conversation in corpus for text in conversation
+            ]))
+
             # Train the chat bot with each statement and response pair
             for conversation_count, conversation in enumerate(corpus):
 
@@ -151,7 +159,7 @@ class ChatterBotCorpusTrainer(Trainer):
 
                 for text in conversation:
 
-                    statement_search_text = self.chatbot.storage.tagger.get_text_index_string(text)
+                    statement_search_text = next(search_texts)
 
                     statement = Statement(
                         text=text,
@@ -316,13 +324,14 @@ class UbuntuCorpusTrainer(Trainer):
         for tsv_files in file_groups:
 
             statements_from_file = []
+            conversations = []
 
             for tsv_file in tsv_files:
                 with open(tsv_file, 'r', encoding='utf-8') as tsv:
                     reader = csv.reader(tsv, delimiter='\t')
 
                     previous_statement_text = None
-                    previous_statement_search_text = ''
+                    conversation = []
 
                     for row in reader:
                         if len(row) > 0:
@@ -337,13 +346,27 @@ class UbuntuCorpusTrainer(Trainer):
                             for preprocessor in self.chatbot.preprocessors:
                                 statement = preprocessor(statement)
 
-                            statement.search_text = tagger.get_text_index_string(statement.text)
-                            statement.search_in_response_to = previous_statement_search_text
-
                             previous_statement_text = statement.text
-                            previous_statement_search_text = statement.search_text
 
-                            statements_from_file.append(statement)
+                            conversation.append(statement)
+
+                    conversations.append(conversation)
+
+            # Tag the text of every statement in the group of files in one batch
+            search_texts = iter(get_text_index_strings(tagger, [
+                statement.text for conversation in conversations for statement in conversation
+            ]))
+
+            for conversation in conversations:
+                previous_statement_search_text = ''
+
+                for statement in conversation:
+                    statement.search_text = next(search_texts)
+                    statement.search_in_response_to = previous_statement_search_text
+
+                    previous_statement_search_text = statement.search_text
+
+                    statements_from_file.append(statement)
 
             self.chatbot.storage.create_many(statements_from_file)
 
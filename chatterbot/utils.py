@@ -1,6 +1,12 @@
 """
 ChatterBot utility functions
 """
+from threading import Lock
+
+
+# spaCy models that have been loaded, shared by everything in the process
+_spacy_models = {}
+_spacy_models_lock = Lock()
 
 
 def import_module(dotted_path):
@@ -117,3 +123,29 @@ def print_progress_bar(description, iteration_counter, total_items, progress_bar
     sys.stdout.flush()
     if total_items == iteration_counter:
         print('\r')
+
+
+def get_spacy_model(language, disabled_pipes=()):
+    """
+    Return the spaCy model for a language. The model is loaded the first
+    time it is requested and the same instance is returned to every caller
+    that requests the language with the same pipeline components.
+
+    :param language: The language of the model.
+    :type language: languages
+
+    :param disabled_pipes: The names of pipeline components, such as
+        "parser" or "ner", that should not be loaded.
+    :type disabled_pipes: tuple
+
+    :returns: The loaded spaCy language model.
+    """
+    key = (language.ISO_639_1.lower(), tuple(sorted(disabled_pipes)))
+
+    with _spacy_models_lock:
+        if key not in _spacy_models:
+            import spacy
+
+            _spacy_models[key] = spacy.load(key[0], disable=list(key[1]))
+
+        return _spacy_models[key]
@@ -164,3 +164,53 @@ class BestMatchTestCase(ChatBotTestCase):
 
         self.assertEqual(match.confidence, 0.82)
         self.assertEqual(match.text, 'Sure, what seems to be the problem?')
+
+    def test_search_algorithm_index_built_when_created(self):
+        """
+        The index of the search algorithm should be built when the logic
+        adapter is created, so that statements created afterwards are added
+        to it before the first search.
+        """
+        self.adapter = BestMatch(
+            self.chatbot,
+            search_algorithm_name='bm25_text_search'
+        )
+
+        index = self.chatbot.search_algorithms['bm25_text_search'].index
+
+        self.assertIsNotNone(index)
+        self.assertIn(index, self.chatbot.storage.indexes)
+
+        self.chatbot.storage.create(text='Can you help me?')
+
+        self.assertEqual(len(index), 1)
+
+    def test_bm25_text_search_algorithm(self):
+        """
+        Test that a close match is found when the bm25_text_search algorithm is used.
+        """
+        self.adapter = BestMatch(
+            self.chatbot,
+            search_algorithm_name='bm25_text_search'
+        )
+
+        self.chatbot.storage.create(
+            text='I am hungry.'
+        )
+        self.chatbot.storage.create(
+            text='Okay, what would you like to eat?',
+            in_response_to='I am hungry.'
+        )
+        self.chatbot.storage.create(
+            text='Can you help me?'
+        )
+        self.chatbot.storage.create(
+            text='Sure, what seems to be the problem?',
+            in_response_to='Can you help me?'
+        )
+
+        statement = Statement(text='Could you help me?')
+        match = self.adapter.process(statement)
+
+        self.assertEqual(match.confidence, 0.82)
+        self.assertEqual(match.text, 'Sure, what seems to be the problem?')
@@ -319,6 +319,36 @@ class MongoAdapterFilterTestCase(MongoAdapterTestCase):
 
         self.assertEqual(len(results), 2)
 
+    def test_search_text_contains_whole_tokens(self):
+        self.adapter.create(text='Hello!', search_text='hello exclamation')
+
+        results = list(self.adapter.filter(
+            search_text_contains='hell'
+        ))
+
+        self.assertEqual(len(results), 0)
+
+    def test_search_text_contains_uses_index(self):
+        self.adapter.create(text='Hi everyone!', search_text='hi everyone')
+
+        plan = self.adapter.statements.find({
+            'search_tokens': {'$in': ['everyone']}
+        }).explain()
+
+        self.assertIn('search_tokens_1', str(plan['queryPlanner']['winningPlan']))
+
+    def test_create_search_tokens(self):
+        self.adapter.statements.insert_one({'text': 'Hi everyone!', 'search_text': 'hi everyone'})
+
+        self.adapter.create_search_tokens()
+
+        results = list(self.adapter.filter(
+            search_text_contains='everyone'
+        ))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].text, 'Hi everyone!')
+
 
 class MongoOrderingTestCase(MongoAdapterTestCase):
     """
@@ -362,6 +392,22 @@ class MongoOrderingTestCase(MongoAdapterTestCase):
         self.assertEqual(statement_a.text, results[0].text)
         self.assertEqual(statement_b.text, results[1].text)
 
+    def test_order_by_id(self):
+        self.adapter.create(text='B')
+        self.adapter.create(text='A')
+
+        results = list(self.adapter.filter(order_by=['id']))
+
+        self.assertEqual([result.text for result in results], ['B', 'A'])
+
+    def test_order_by_equal_values_is_stable(self):
+        for text in 'ABCDE':
+            self.adapter.create(text=text, conversation='test')
+
+        results = list(self.adapter.filter(order_by=['conversation'], page_size=2))
+
+        self.assertEqual([result.text for result in results], ['A', 'B', 'C', 'D', 'E'])
+
 
 class StorageAdapterCreateTestCase(MongoAdapterTestCase):
     """
@@ -484,6 +530,55 @@ class StorageAdapterCreateTestCase(MongoAdapterTestCase):
         self.assertEqual(len(results[0].get_tags()), 1)
         self.assertEqual(results[0].get_tags(), ['ab'])
 
+    def test_create_many_in_chunks(self):
+        created_count = self.adapter.create_many((
+            Statement(text=text) for text in 'ABCDE'
+        ), batch_size=2)
+
+        results = list(self.adapter.filter(order_by=['id']))
+
+        self.assertEqual(created_count, 5)
+        self.assertEqual([result.text for result in results], ['A', 'B', 'C', 'D', 'E'])
+
+    def test_create_many_ids_follow_statement_order(self):
+        from unittest import mock
+
+        inserted_documents = []
+        insert_many = self.adapter.statements.insert_many
+
+        def record_insert_many(documents, **kwargs):
+            # The ids must already be set when the insert runs on a worker thread
+            inserted_documents.extend(dict(document) for document in documents)
+            return insert_many(documents, **kwargs)
+
+        with mock.patch.object(self.adapter.statements, 'insert_many', side_effect=record_insert_many):
+            self.adapter.create_many((
+                Statement(text=text) for text in 'ABCDE'
+            ), batch_size=1)
+
+        self.assertTrue(all('_id' in document for document in inserted_documents))
+        self.assertEqual(
+            [document['text'] for document in sorted(inserted_documents, key=lambda document: document['_id'])],
+            ['A', 'B', 'C', 'D', 'E']
+        )
+
+    def test_create_many_continues_after_failed_chunk(self):
+        from pymongo.errors import BulkWriteError
+
+        self.adapter.statements.create_index('text', unique=True)
+
+        try:
+            with self.assertRaises(BulkWriteError):
+                self.adapter.create_many([
+                    Statement(text=text) for text in 'ABBCD'
+                ], batch_size=2)
+        finally:
+            self.adapter.statements.drop_index('text_1')
+
+        results = list(self.adapter.filter(order_by=['id']))
+
+        self.assertEqual([result.text for result in results], ['A', 'B', 'C', 'D'])
+
 
 class StorageAdapterUpdateTestCase(MongoAdapterTestCase):
     """
@@ -1,4 +1,5 @@
 from unittest import TestCase
+from unittest.mock import patch
 from chatterbot.conversation import Statement
 from chatterbot.storage.sql_storage import SQLStorageAdapter
 
@@ -29,6 +30,52 @@ class SQLStorageAdapterTests(SQLStorageAdapterTestCase):
         adapter = SQLStorageAdapter(database_uri='sqlite:///db.sqlite3')
         self.assertEqual(adapter.database_uri, 'sqlite:///db.sqlite3')
 
+    def test_create_missing_indexes(self):
+        from sqlalchemy import inspect
+
+        adapter = SQLStorageAdapter(database_uri=None)
+        adapter.engine.execute('DROP INDEX ix_statement_conversation_id')
+
+        adapter.create_missing_indexes()
+
+        index_names = [
+            index['name'] for index in inspect(adapter.engine).get_indexes('statement')
+        ]
+
+        self.assertIn('ix_statement_conversation_id', index_names)
+        self.assertIn('ix_statement_search_in_response_to_persona', index_names)
+        self.assertIn('ix_statement_text_conversation', index_names)
+
+    def test_create_missing_indexes_in_existing_database(self):
+        import os
+        import tempfile
+        from unittest.mock import patch
+        from sqlalchemy import inspect
+        from sqlalchemy.dialects.sqlite.base import SQLiteDialect
+
+        def case_sensitive_has_table(dialect, connection, table_name, schema=None):
+            return table_name in inspect(connection).get_table_names()
+
+        handle, database_path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+
+        try:
+            adapter = SQLStorageAdapter(database_uri='sqlite:///' + database_path)
+            adapter.engine.execute('DROP INDEX ix_statement_conversation_id')
+            adapter.engine.dispose()
+
+            with patch.object(SQLiteDialect, 'has_table', case_sensitive_has_table):
+                adapter = SQLStorageAdapter(database_uri='sqlite:///' + database_path)
+
+            index_names = [
+                index['name'] for index in inspect(adapter.engine).get_indexes('statement')
+            ]
+            adapter.engine.dispose()
+        finally:
+            os.remove(database_path)
+
+        self.assertIn('ix_statement_conversation_id', index_names)
+
     def test_count_returns_zero(self):
         """
         The count method should return a value of 0
@@ -104,6 +151,26 @@ class SQLStorageAdapterTests(SQLStorageAdapterTestCase):
         with self.assertRaises(StorageAdapter.EmptyDatabaseException):
             self.adapter.get_random()
 
+    def test_get_latest_statements(self):
+        self.adapter.create_many([
+            Statement(text=text, conversation='test', tags=[text]) for text in 'ABC'
+        ])
+        self.adapter.create(text='D', conversation='other')
+
+        statements = self.adapter.get_latest_statements('test', 2)
+
+        self.assertEqual([statement.text for statement in statements], ['B', 'C'])
+        self.assertEqual(statements[1].get_tags(), ['C'])
+
+    def test_get_random_skips_missing_ids(self):
+        self.adapter.create_many([Statement(text=text) for text in 'ABCDE'])
+        self.adapter.remove('B')
+        self.adapter.remove('C')
+        self.adapter.remove('D')
+
+        for _ in range(20):
+            self.assertIn(self.adapter.get_random().text, ['A', 'E'])
+
     def test_remove(self):
         text = "Sometimes you have to run before you can walk."
         self.adapter.create(text=text)
@@ -210,6 +277,161 @@ class SQLStorageAdapterFilterTests(SQLStorageAdapterTestCase):
         self.assertIn('B', results_text_list)
         self.assertIn('C', results_text_list)
 
+    def test_filter_page_size_full_pages(self):
+        self.adapter.create_many([
+            Statement(text=text) for text in 'ABCDEF'
+        ])
+
+        results = self.adapter.filter(page_size=2)
+
+        self.assertEqual([statement.text for statement in results], list('ABCDEF'))
+
+    def test_filter_page_size_ordered(self):
+        self.adapter.create_many([
+            Statement(text=text) for text in 'CAB'
+        ])
+
+        results = self.adapter.filter(page_size=2, order_by=['text'])
+
+        self.assertEqual([statement.text for statement in results], list('ABC'))
+
+    def test_filter_statements_created_while_iterating(self):
+        self.adapter.create(text='A')
+        self.adapter.create(text='B')
+
+        results = self.adapter.filter(page_size=1)
+
+        results_text_list = [next(results).text]
+
+        # Statements created during iteration must not repeat earlier results
+        self.adapter.create(text='C')
+
+        results_text_list.extend(statement.text for statement in results)
+
+        self.assertEqual(results_text_list, ['A', 'B', 'C'])
+
+    def get_query_count(self, **kwargs):
+        """
+        Return the statements matching the filter and the number
+        of queries that were run to load them.
+        """
+        from sqlalchemy import event
+
+        queries = []
+
+        def count_query(*args):
+            queries.append(args)
+
+        event.listen(self.adapter.engine, 'before_cursor_execute', count_query)
+
+        try:
+            results = list(self.adapter.filter(**kwargs))
+        finally:
+            event.remove(self.adapter.engine, 'before_cursor_execute', count_query)
+
+        return results, len(queries)
+
+    def test_filter_tags_loaded_per_page(self):
+        self.adapter.create_many([
+            Statement(text=text, tags=['letter', text]) for text in 'ABCD'
+        ])
+
+        results, query_count = self.get_query_count(page_size=2)
+
+        # One query for each page of statements and one for the tags of each page
+        self.assertEqual(query_count, 5)
+        self.assertEqual(sorted(results[3].get_tags()), ['D', 'letter'])
+
+    def test_filter_tags_loaded_ordered(self):
+        self.adapter.create_many([
+            Statement(text=text, tags=[text]) for text in 'BA'
+        ])
+
+        results, query_count = self.get_query_count(order_by=['text'])
+
+        self.assertEqual(query_count, 2)
+        self.assertEqual(results[0].get_tags(), ['A'])
+        self.assertEqual(results[1].get_tags(), ['B'])
+
+    def test_filter_tags_loaded_ordered_pages(self):
+        from unittest.mock import patch
+
+        self.adapter.create_many([
+            Statement(text=text, tags=[text]) for text in 'CBAD'
+        ])
+
+        # The tags query must not run while the statements are still being streamed
+        with patch('sqlalchemy.orm.Query.yield_per', side_effect=AssertionError('yield_per was used')):
+            results, query_count = self.get_query_count(order_by=['text'], page_size=2)
+
+        # One query for each page of statements and one for the tags of each page
+        self.assertEqual(query_count, 5)
+        self.assertEqual([statement.text for statement in results], list('ABCD'))
+        self.assertEqual([statement.get_tags() for statement in results], [['A'], ['B'], ['C'], ['D']])
+
+    def test_filter_load_tags_false(self):
+        self.adapter.create_many([
+            Statement(text=text, tags=['letter']) for text in 'ABCD'
+        ])
+
+        results, query_count = self.get_query_count(load_tags=False)
+
+        self.assertEqual(query_count, 1)
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[0].get_tags(), [])
+
+    def test_filter_fields(self):
+        self.adapter.create(text='Hi', conversation='test', tags=['greeting'])
+
+        results, query_count = self.get_query_count(fields=['text'])
+
+        self.assertEqual(query_count, 1)
+        self.assertEqual(len(results), 1)
+        self.assertIsNotNone(results[0].id)
+        self.assertEqual(results[0].text, 'Hi')
+        self.assertEqual(results[0].conversation, '')
+        self.assertEqual(results[0].get_tags(), [])
+
+    def test_filter_fields_with_parameters(self):
+        self.adapter.create(text='Hi', search_text='hi', conversation='test', tags=['greeting'])
+        self.adapter.create(text='Bye', search_text='bye', conversation='test')
+
+        results = list(self.adapter.filter(
+            fields=['text', 'search_text'],
+            conversation='test',
+            tags=['greeting'],
+            search_text_contains='hi',
+            page_size=1
+        ))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].text, 'Hi')
+        self.assertEqual(results[0].search_text, 'hi')
+
+    def test_filter_fields_ordered(self):
+        self.adapter.create_many([
+            Statement(text=text) for text in 'CAB'
+        ])
+
+        results = list(self.adapter.filter(fields=['text'], order_by=['text'], page_size=2))
+
+        self.assertEqual([statement.text for statement in results], list('ABC'))
+
+    def test_filter_fields_tags(self):
+        self.adapter.create(text='Hi', tags=['greeting'])
+
+        results = list(self.adapter.filter(fields=['text', 'tags']))
+
+        self.assertEqual(results[0].text, 'Hi')
+        self.assertEqual(results[0].get_tags(), ['greeting'])
+
+    def test_filter_multiple_tags_no_duplicates(self):
+        self.adapter.create(text='Hello!', tags=['greeting', 'salutation'])
+
+        results = list(self.adapter.filter(tags=['greeting', 'salutation'], page_size=1))
+
+        self.assertEqual(len(results), 1)
+
     def test_exclude_text(self):
         self.adapter.create(text='Hello!')
         self.adapter.create(text='Hi everyone!')
@@ -269,6 +491,90 @@ class SQLStorageAdapterFilterTests(SQLStorageAdapterTestCase):
 
         self.assertEqual(len(results), 2)
 
+    def test_search_text_contains_uses_full_text_search(self):
+        self.assertTrue(self.adapter.full_text_search)
+
+        query = self.adapter.get_full_text_search_query('VERB:hello NOUN:"world"')
+
+        self.assertEqual(query, 'search_text : ("VERB:hello" OR "NOUN:""world""")')
+
+    def test_search_text_contains_ranked(self):
+        self.adapter.create(text='A', search_text='NOUN:cat VERB:sit')
+        self.adapter.create(text='B', search_text='NOUN:dog VERB:sit NOUN:cat')
+        self.adapter.create(text='C', search_text='NOUN:bird')
+
+        results = list(self.adapter.filter(
+            search_text_contains='NOUN:dog NOUN:cat'
+        ))
+
+        self.assertEqual([result.text for result in results], ['B', 'A'])
+
+    def test_search_text_contains_after_update(self):
+        self.adapter.create(text='Hi everyone!', search_text='NOUN:placeholder')
+
+        # Updating the statement replaces its search text with the tagged text
+        statement = list(self.adapter.filter(text='Hi everyone!'))[0]
+        self.adapter.update(statement)
+
+        updated_statement = list(self.adapter.filter(text='Hi everyone!'))[0]
+
+        results = list(self.adapter.filter(
+            search_text_contains='NOUN:placeholder'
+        ))
+
+        updated_results = list(self.adapter.filter(
+            search_text_contains=updated_statement.search_text
+        ))
+
+        self.assertEqual(len(results), 0)
+        self.assertEqual(len(updated_results), 1)
+
+    def test_search_text_contains_after_remove(self):
+        self.adapter.create(text='Hi everyone!', search_text='hi everyone')
+        self.adapter.remove('Hi everyone!')
+        self.adapter.create(text='Hello', search_text='hello everyone')
+
+        results = list(self.adapter.filter(
+            search_text_contains='everyone'
+        ))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].text, 'Hello')
+
+    def test_search_text_contains_punctuation(self):
+        self.adapter.create(text='?', search_text='?')
+        self.adapter.create(text='Hello', search_text='hello')
+
+        results = list(self.adapter.filter(
+            search_text_contains='?'
+        ))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].text, '?')
+
+    def test_search_text_contains_without_full_text_search(self):
+        self.adapter.create(text='Hello!', search_text='hello exclamation')
+        self.adapter.create(text='Hi everyone!', search_text='hi everyone')
+
+        with patch.object(self.adapter, 'full_text_search', False):
+            results = list(self.adapter.filter(
+                search_text_contains='everyone'
+            ))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].text, 'Hi everyone!')
+
+    def test_filter_ids(self):
+        first = self.adapter.create(text='Hello!')
+        self.adapter.create(text='Hi everyone!')
+
+        results = list(self.adapter.filter(
+            ids=[first.id]
+        ))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].text, 'Hello!')
+
 
 class SQLOrderingTests(SQLStorageAdapterTestCase):
     """
@@ -406,6 +712,24 @@ class StorageAdapterCreateTests(SQLStorageAdapterTestCase):
         self.assertEqual(results[0].search_in_response_to, 'a')
         self.assertEqual(results[1].search_in_response_to, 'b')
 
+    def test_create_many_tags_text_in_one_batch(self):
+        tagger = self.adapter.tagger
+
+        with patch.object(tagger, 'get_text_index_strings', wraps=tagger.get_text_index_strings) as mock:
+            self.adapter.create_many([
+                Statement(text='A', search_text='a'),
+                Statement(text='B', in_response_to='A'),
+                Statement(text='C', in_response_to='B', search_in_response_to='b')
+            ])
+
+        mock.assert_called_once_with(['B', 'A', 'C'])
+
+        results = list(self.adapter.filter(order_by=['id']))
+
+        self.assertEqual(results[0].search_text, 'a')
+        self.assertEqual(results[1].search_in_response_to, tagger.get_text_index_string('A'))
+        self.assertEqual(results[2].search_in_response_to, 'b')
+
     def test_create_many_tags(self):
         self.adapter.create_many([
             Statement(text='A', tags=['first', 'letter']),
@@ -434,6 +758,66 @@ class StorageAdapterCreateTests(SQLStorageAdapterTestCase):
         self.assertEqual(len(results[0].get_tags()), 1)
         self.assertEqual(results[0].get_tags(), ['ab'])
 
+    def test_create_many_in_chunks(self):
+        self.adapter.create(text='Hey', tags=['greeting'])
+
+        created_count = self.adapter.create_many((
+            Statement(text=text, tags=['greeting', text]) for text in 'ABCDE'
+        ), batch_size=2)
+
+        results = list(self.adapter.filter(tags=['greeting'], order_by=['id']))
+
+        self.assertEqual(created_count, 5)
+        self.assertEqual([result.text for result in results], ['Hey', 'A', 'B', 'C', 'D', 'E'])
+        self.assertEqual(sorted(results[3].get_tags()), ['C', 'greeting'])
+        self.assertEqual(self.adapter.Session().query(self.adapter.get_model('tag')).count(), 6)
+
+    def test_create_many_commits_each_chunk(self):
+        from sqlalchemy import event
+
+        commits = []
+
+        def count_commit(connection):
+            commits.append(connection)
+
+        event.listen(self.adapter.engine, 'commit', count_commit)
+
+        try:
+            self.adapter.create_many([Statement(text=text) for text in 'ABCDE'], batch_size=2)
+        finally:
+            event.remove(self.adapter.engine, 'commit', count_commit)
+
+        self.assertEqual(len(commits), 3)
+
+    def test_create_pair(self):
+        self.adapter.create_pair(
+            Statement(text='Hi', search_text='hi', tags=['greeting']),
+            Statement(text='Hello', in_response_to='Hi', persona='bot:test', tags=['greeting', 'bot'])
+        )
+
+        results = list(self.adapter.filter(order_by=['id']))
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0].text, 'Hi')
+        self.assertEqual(results[0].search_text, 'hi')
+        self.assertEqual(results[0].get_tags(), ['greeting'])
+        self.assertEqual(results[1].text, 'Hello')
+        self.assertEqual(results[1].in_response_to, 'Hi')
+        self.assertEqual(results[1].persona, 'bot:test')
+        self.assertEqual(sorted(results[1].get_tags()), ['bot', 'greeting'])
+
+    def test_create_pair_existing_tag(self):
+        self.adapter.create(text='Hey', tags=['greeting'])
+
+        self.adapter.create_pair(
+            Statement(text='Hi', tags=['greeting']),
+            Statement(text='Hello', in_response_to='Hi')
+        )
+
+        results = list(self.adapter.filter(tags=['greeting']))
+
+        self.assertEqual(len(results), 2)
+
 
 class StorageAdapterUpdateTests(SQLStorageAdapterTestCase):
     """
@@ -465,3 +849,193 @@ class StorageAdapterUpdateTests(SQLStorageAdapterTestCase):
         self.assertEqual(len(statements), 1)
         self.assertEqual(len(statements[0].get_tags()), 1)
         self.assertEqual(statements[0].get_tags(), ['ab'])
+
+
+class StorageAdapterIndexTests(SQLStorageAdapterTestCase):
+    """
+    Tests for keeping in-process indexes up to date.
+    """
+
+    def setUp(self):
+        from chatterbot.indexes import InvertedIndex
+
+        super().setUp()
+        self.index = InvertedIndex()
+        self.adapter.add_index(self.index)
+
+    def tearDown(self):
+        super().tearDown()
+        self.adapter.indexes.remove(self.index)
+
+    def test_add_index_builds_from_existing_statements(self):
+        from chatterbot.indexes import InvertedIndex
+
+        self.adapter.create(text='Hello', search_text='hello')
+
+        index = InvertedIndex()
+        self.adapter.add_index(index)
+        self.adapter.indexes.remove(index)
+
+        self.assertEqual(len(index), 1)
+
+    def test_create_updates_index(self):
+        statement = self.adapter.create(text='Hello', search_text='hello')
+
+        self.assertEqual(self.index.search('hello'), {statement.id})
+
+    def test_create_many_updates_index(self):
+        self.adapter.create_many([
+            Statement(text='Hello', search_text='hello'),
+            Statement(text='Hi', search_text='hi')
+        ])
+
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(len(self.index.search('hello hi')), 2)
+
+    def test_create_many_ids_without_sqlite(self):
+        self.adapter.create(text='Hey', search_text='hey')
+
+        # Rows are inserted one at a time to get their ids on other databases
+        with patch.object(self.adapter.engine.dialect, 'name', 'oracle'):
+            self.adapter.create_many([
+                Statement(text='Hello', search_text='hello', tags=['a']),
+                Statement(text='Hi', search_text='hi', tags=['b'])
+            ])
+
+        results = list(self.adapter.filter(order_by=['id']))
+
+        self.assertEqual([result.get_tags() for result in results], [[], ['a'], ['b']])
+        self.assertEqual(self.index.search('hi'), {results[2].id})
+
+    def test_insert_statement_rows_returning_ids(self):
+        from sqlalchemy.dialects import postgresql
+
+        class ReturningSession(object):
+
+            def __init__(self):
+                self.statements = []
+
+            def execute(self, statement):
+                self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+                # Rows are not required to be returned in the order they were inserted
+                return [(12, ), (11, )]
+
+        session = ReturningSession()
+
+        with patch.object(self.adapter.engine.dialect, 'name', 'postgresql'):
+            statement_ids = self.adapter._insert_statement_rows(session, [
+                {'text': 'Hello', 'search_text': 'hello'},
+                {'text': 'Hi', 'search_text': 'hi'}
+            ], True)
+
+        self.assertEqual(statement_ids, [11, 12])
+        self.assertEqual(len(session.statements), 1)
+        self.assertIn('RETURNING statement.id', session.statements[0])
+
+    def test_insert_tags_skips_existing_tags(self):
+        self.adapter.create(text='Hello', tags=['a'])
+
+        session = self.adapter.Session()
+
+        try:
+            self.adapter._insert_tags(session, {'a', 'b'})
+            session.commit()
+        finally:
+            session.close()
+
+        Tag = self.adapter.get_model('tag')
+        session = self.adapter.Session()
+
+        self.assertEqual(sorted(tag.name for tag in session.query(Tag)), ['a', 'b'])
+
+        session.close()
+
+    def test_insert_tags_skips_existing_tags_without_sqlite(self):
+        self.adapter.create(text='Hello', tags=['a'])
+
+        session = self.adapter.Session()
+
+        try:
+            with patch.object(self.adapter.engine.dialect, 'name', 'oracle'):
+                self.adapter._insert_tags(session, {'a', 'b'})
+            session.commit()
+        finally:
+            session.close()
+
+        Tag = self.adapter.get_model('tag')
+        session = self.adapter.Session()
+
+        self.assertEqual(sorted(tag.name for tag in session.query(Tag)), ['a', 'b'])
+
+        session.close()
+
+    def test_create_many_failed_commit_does_not_update_index(self):
+        from sqlalchemy import event
+
+        def fail_commit(connection):
+            raise RuntimeError('Commit failed')
+
+        event.listen(self.adapter.engine, 'commit', fail_commit)
+
+        try:
+            with self.assertRaises(RuntimeError):
+                self.adapter.create_many([Statement(text='Hello', search_text='hello')])
+        finally:
+            event.remove(self.adapter.engine, 'commit', fail_commit)
+
+        self.assertEqual(len(self.index), 0)
+
+    def test_create_pair_failed_commit_does_not_update_index(self):
+        from sqlalchemy import event
+        from sqlalchemy.exc import InvalidRequestError
+
+        def fail_commit(connection):
+            raise InvalidRequestError('Commit failed')
+
+        event.listen(self.adapter.engine, 'commit', fail_commit)
+
+        try:
+            self.adapter.create_pair(
+                Statement(text='Hello', search_text='hello'),
+                Statement(text='Hi', search_text='hi', in_response_to='Hello')
+            )
+        finally:
+            event.remove(self.adapter.engine, 'commit', fail_commit)
+
+        self.assertEqual(len(self.index), 0)
+
+    def test_update_failed_commit_does_not_update_index(self):
+        from sqlalchemy import event
+        from sqlalchemy.exc import InvalidRequestError
+
+        def fail_commit(connection):
+            raise InvalidRequestError('Commit failed')
+
+        event.listen(self.adapter.engine, 'commit', fail_commit)
+
+        try:
+            self.adapter.update(Statement(text='Hello', search_text='hello'))
+        finally:
+            event.remove(self.adapter.engine, 'commit', fail_commit)
+
+        self.assertEqual(len(self.index), 0)
+
+    def test_update_updates_index(self):
+        statement = self.adapter.create(text='Hello', search_text='hello')
+        statement.text = 'Hi'
+        self.adapter.update(statement)
+
+        self.assertEqual(len(self.index), 1)
+        self.assertEqual(self.index.search('hello'), set())
+
+    def test_remove_updates_index(self):
+        self.adapter.create(text='Hello', search_text='hello')
+        self.adapter.remove('Hello')
+
+        self.assertEqual(len(self.index), 0)
+
+    def test_drop_clears_index(self):
+        self.adapter.create(text='Hello', search_text='hello')
+        self.adapter.drop()
+
+        self.assertEqual(len(self.index), 0)
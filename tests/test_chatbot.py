@@ -253,6 +253,30 @@ class ChatterBotResponseTestCase(ChatBotTestCase):
 
         self.assertIsLength(results, 1)
 
+    def test_get_response_saves_input_and_response_together(self):
+        from sqlalchemy import event
+
+        commits = []
+
+        def count_commit(connection):
+            commits.append(connection)
+
+        event.listen(self.chatbot.storage.engine, 'commit', count_commit)
+
+        try:
+            response = self.chatbot.get_response('Hi!')
+        finally:
+            event.remove(self.chatbot.storage.engine, 'commit', count_commit)
+
+        input_results = list(self.chatbot.storage.filter(text='Hi!', persona_not_startswith='bot:'))
+        response_results = list(self.chatbot.storage.filter(persona='bot:' + self.chatbot.name))
+
+        self.assertEqual(len(commits), 1)
+        self.assertIsLength(input_results, 1)
+        self.assertIsLength(response_results, 1)
+        self.assertEqual(response_results[0].text, response.text)
+        self.assertEqual(response_results[0].in_response_to, 'Hi!')
+
     def test_get_response_does_not_add_new_statement(self):
         """
         Test that a new statement is not learned if `read_only` is set to True.
@@ -295,6 +319,14 @@ class ChatterBotResponseTestCase(ChatBotTestCase):
 
         self.assertEqual(response.text, 'C')
 
+    def test_get_latest_statements_limit(self):
+        for text in 'ABC':
+            self.chatbot.storage.create(text=text, conversation='test')
+
+        self.assertEqual(
+            [statement.text for statement in self.chatbot.get_latest_statements('test', 2)], ['B', 'C']
+        )
+
     def test_search_text_results_after_training(self):
         """
         ChatterBot should return close matches to an input
@@ -317,6 +349,51 @@ class ChatterBotResponseTestCase(ChatBotTestCase):
         self.assertEqual('Example A for search.', results[0].text)
 
 
+class ChatBotConversationCacheTestCase(ChatBotTestCase):
+
+    def get_kwargs(self):
+        kwargs = super().get_kwargs()
+        kwargs['conversation_cache_size'] = 2
+        return kwargs
+
+    def test_get_latest_response_after_new_statement(self):
+        from unittest.mock import patch
+
+        self.chatbot.storage.create(text='A', conversation='test')
+        self.chatbot.storage.create(text='B', conversation='test', in_response_to='A')
+
+        self.chatbot.get_latest_response('test')
+
+        self.chatbot.storage.create(text='C', conversation='test', in_response_to='B')
+
+        # The conversation is kept up to date without reading it again
+        with patch.object(self.chatbot.storage, 'get_latest_statements') as get_latest_statements:
+            response = self.chatbot.get_latest_response('test')
+
+        get_latest_statements.assert_not_called()
+        self.assertEqual(response.text, 'B')
+
+    def test_get_latest_response_before_cached_statements(self):
+        self.chatbot.storage.create(text='A', conversation='test')
+        self.chatbot.storage.create(text='B', conversation='test', in_response_to='A')
+        self.chatbot.storage.create(text='C', conversation='test', in_response_to='A')
+
+        response = self.chatbot.get_latest_response('test')
+
+        self.assertEqual(response.text, 'A')
+
+    def test_get_latest_statements_limit(self):
+        for text in 'ABC':
+            self.chatbot.storage.create(text=text, conversation='test')
+
+        self.assertEqual(
+            [statement.text for statement in self.chatbot.get_latest_statements('test', 1)], ['C']
+        )
+        self.assertEqual(
+            [statement.text for statement in self.chatbot.get_latest_statements('test', 3)], ['A', 'B', 'C']
+        )
+
+
 class TestAdapterA(LogicAdapter):
 
     def process(self, statement, additional_response_selection_parameters=None):
@@ -62,6 +62,75 @@ class LevenshteinDistanceTestCase(TestCase):
 
         self.assertEqual(value, 1)
 
+    def test_compare_many(self):
+        """
+        Comparing a batch of statements should give the same
+        values as comparing each statement individually.
+        """
+        statement = Statement(text='Where is the post office?')
+        other_statements = [
+            Statement(text='Looking for the post office'),
+            Statement(text='where is the POST office?'),
+            Statement(text=''),
+            Statement(text='xyz'),
+        ]
+
+        values = list(self.compare.compare_many(statement, other_statements))
+
+        self.assertEqual(values, [
+            self.compare(statement, other_statement) for other_statement in other_statements
+        ])
+
+    def test_compare_many_statement_false(self):
+        statement = Statement(text='')
+        other_statements = [Statement(text='Hello'), Statement(text='Hi')]
+
+        values = list(self.compare.compare_many(statement, other_statements))
+
+        self.assertEqual(values, [0, 0])
+
+    def test_compare_many_minimum_confidence(self):
+        """
+        Statements that can not be more similar than the minimum
+        confidence should be given a similarity of zero.
+        """
+        statement = Statement(text='Where is the post office?')
+        other_statements = [
+            Statement(text='Where is the post office'),
+            Statement(text='Hi'),
+            Statement(text='qqqqqqqqqqqqqqqqqqqqqqqqq'),
+        ]
+
+        values = list(self.compare.compare_many(
+            statement, other_statements, minimum_confidence=0.5
+        ))
+
+        self.assertEqual(values, [0.98, 0, 0])
+
+    def test_compare_many_get_minimum_confidence(self):
+        """
+        The minimum confidence should be checked again before each
+        statement is compared.
+        """
+        statement = Statement(text='Where is the post office?')
+        other_statements = [
+            Statement(text='Where is the post office'),
+            Statement(text='Where is the post'),
+        ]
+
+        minimum_confidences = iter([0, 0.9])
+
+        values = list(self.compare.compare_many(
+            statement, other_statements, get_minimum_confidence=lambda: next(minimum_confidences)
+        ))
+
+        self.assertEqual(values, [0.98, 0])
+
+    def test_get_length_upper_bound(self):
+        self.assertEqual(self.compare.get_length_upper_bound(4, 4), 1)
+        self.assertEqual(self.compare.get_length_upper_bound(2, 6), 0.5)
+        self.assertEqual(self.compare.get_length_upper_bound(0, 6), 0)
+
 
 class SpacySimilarityTests(TestCase):
 
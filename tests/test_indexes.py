@@ -0,0 +1,351 @@
+from unittest import TestCase
+from unittest.mock import patch
+from chatterbot.conversation import Statement
+from chatterbot.indexes import InvertedIndex, LengthIndex, BM25Index, MinHashIndex, VectorIndex, ConversationIndex
+
+
+class InvertedIndexTests(TestCase):
+
+    def setUp(self):
+        self.index = InvertedIndex()
+
+    def test_search_empty_index(self):
+        self.assertEqual(self.index.search('NOUN:cat'), set())
+
+    def test_search_shared_token(self):
+        self.index.add(Statement(id=1, text='A', search_text='NOUN:cat VERB:sit'))
+        self.index.add(Statement(id=2, text='B', search_text='NOUN:dog VERB:sit'))
+        self.index.add(Statement(id=3, text='C', search_text='NOUN:dog'))
+
+        self.assertEqual(self.index.search('VERB:sit'), {1, 2})
+        self.assertEqual(self.index.search('NOUN:cat NOUN:dog'), {1, 2, 3})
+
+    def test_add_without_id_is_ignored(self):
+        self.index.add(Statement(text='A', search_text='NOUN:cat'))
+
+        self.assertEqual(len(self.index), 0)
+
+    def test_add_replaces_existing_entry(self):
+        self.index.add(Statement(id=1, text='A', search_text='NOUN:cat'))
+        self.index.add(Statement(id=1, text='A', search_text='NOUN:dog'))
+
+        self.assertEqual(self.index.search('NOUN:cat'), set())
+        self.assertEqual(self.index.search('NOUN:dog'), {1})
+
+    def test_remove(self):
+        self.index.add(Statement(id=1, text='A', search_text='NOUN:cat'))
+        self.index.remove(1)
+
+        self.assertEqual(self.index.search('NOUN:cat'), set())
+        self.assertEqual(self.index.postings, {})
+
+    def test_build(self):
+        self.index.add(Statement(id=1, text='A', search_text='NOUN:cat'))
+        self.index.build([
+            Statement(id=2, text='B', search_text='NOUN:dog')
+        ])
+
+        self.assertEqual(len(self.index), 1)
+        self.assertEqual(self.index.search('NOUN:cat NOUN:dog'), {2})
+
+
+class LengthIndexTests(TestCase):
+
+    def setUp(self):
+        self.index = LengthIndex()
+
+    def test_get_lengths_empty_index(self):
+        self.assertEqual(self.index.get_lengths(), [])
+
+    def test_add(self):
+        self.index.add(Statement(id=1, text='Hi'))
+        self.index.add(Statement(id=2, text='Hello'))
+        self.index.add(Statement(id=3, text='hi'))
+
+        self.assertEqual(self.index.get_lengths(), [2, 5])
+        self.assertEqual(self.index.get_statement_ids(2), {1, 3})
+        self.assertEqual(self.index.get_statement_ids(5), {2})
+
+    def test_add_replaces_existing_entry(self):
+        self.index.add(Statement(id=1, text='Hi'))
+        self.index.add(Statement(id=1, text='Hello'))
+
+        self.assertEqual(self.index.get_lengths(), [5])
+
+    def test_remove(self):
+        self.index.add(Statement(id=1, text='Hi'))
+        self.index.remove(1)
+
+        self.assertEqual(self.index.get_lengths(), [])
+        self.assertEqual(len(self.index), 0)
+
+
+class BM25IndexTests(TestCase):
+
+    def setUp(self):
+        self.index = BM25Index()
+
+    def test_search_empty_index(self):
+        self.assertEqual(self.index.search('NOUN:cat', 10), [])
+
+    def test_rare_tokens_rank_higher(self):
+        self.index.add(Statement(id=1, text='A', search_text='VERB:be NOUN:cat'))
+        self.index.add(Statement(id=2, text='B', search_text='VERB:be NOUN:dog'))
+        self.index.add(Statement(id=3, text='C', search_text='VERB:be NOUN:bird'))
+
+        results = self.index.search('VERB:be NOUN:dog', 10)
+
+        self.assertEqual(results[0], 2)
+        self.assertEqual(set(results), {1, 2, 3})
+
+    def test_search_limit(self):
+        self.index.add(Statement(id=1, text='A', search_text='VERB:be NOUN:cat'))
+        self.index.add(Statement(id=2, text='B', search_text='VERB:be NOUN:dog'))
+
+        self.assertEqual(self.index.search('NOUN:dog VERB:be', 1), [2])
+
+    def test_remove(self):
+        self.index.add(Statement(id=1, text='A', search_text='NOUN:cat NOUN:cat'))
+        self.index.remove(1)
+
+        self.assertEqual(self.index.search('NOUN:cat', 10), [])
+        self.assertEqual(self.index.total_token_count, 0)
+
+    def test_persona_not_startswith(self):
+        self.index = BM25Index(persona_not_startswith='bot:')
+
+        self.index.add(Statement(id=1, text='A', search_text='NOUN:cat', persona='bot:Test'))
+        self.index.add(Statement(id=2, text='B', search_text='NOUN:cat', persona='user'))
+
+        self.assertEqual(self.index.search('NOUN:cat', 10), [2])
+
+
+class MinHashIndexTests(TestCase):
+
+    def setUp(self):
+        self.index = MinHashIndex()
+
+    def test_search_empty_index(self):
+        self.assertEqual(self.index.search('What is your quest?', 10), [])
+
+    def test_search_similar_text(self):
+        self.index.add(Statement(id=1, text='What is your quest?'))
+        self.index.add(Statement(id=2, text='Yuck, black licorice jelly beans.'))
+
+        results = self.index.search('what is your quest', 10)
+
+        self.assertEqual(results, [1])
+
+    def test_search_limit(self):
+        self.index.add(Statement(id=1, text='What is your quest?'))
+        self.index.add(Statement(id=2, text='What is your quest?!'))
+
+        self.assertEqual(self.index.search('What is your quest?', 1), [1])
+
+    def test_remove(self):
+        self.index.add(Statement(id=1, text='What is your quest?'))
+        self.index.remove(1)
+
+        self.assertEqual(self.index.search('What is your quest?', 10), [])
+        self.assertEqual(self.index.bands, {})
+
+    def test_invalid_band_count(self):
+        with self.assertRaises(MinHashIndex.InvalidParametersException):
+            MinHashIndex(permutation_count=64, band_count=10)
+
+    def test_saved_signatures_are_reused(self):
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'signatures.minhash')
+            statements = [Statement(id=1, text='What is your quest?')]
+
+            MinHashIndex(path=path).build(statements)
+
+            index = MinHashIndex(path=path)
+
+            with patch.object(index, 'get_signature') as get_signature:
+                index.build(statements)
+
+            get_signature.assert_not_called()
+            self.assertEqual(len(index), 1)
+            self.assertEqual(index.search('What is your quest?', 10), [1])
+
+
+def get_letter_count_vectors(texts):
+    """
+    Return vectors containing the number of times that
+    each of the letters a, b and c occurs in each text.
+    """
+    return [
+        [text.count(letter) for letter in 'abc'] for text in texts
+    ]
+
+
+class VectorIndexTests(TestCase):
+
+    def setUp(self):
+        self.index = VectorIndex(get_letter_count_vectors)
+
+    def test_search_empty_index(self):
+        self.assertEqual(self.index.search('aaa', 10), [])
+
+    def test_search(self):
+        self.index.add_many([
+            Statement(id=1, text='aaa'),
+            Statement(id=2, text='ab'),
+            Statement(id=3, text='cc'),
+        ])
+
+        results = self.index.search('a', 10)
+
+        self.assertEqual([result[0] for result in results], [1, 2, 3])
+        self.assertAlmostEqual(results[0][1], 1)
+        self.assertAlmostEqual(results[2][1], 0)
+
+    def test_search_limit(self):
+        self.index.add_many([
+            Statement(id=1, text='aaa'),
+            Statement(id=2, text='ab'),
+            Statement(id=3, text='cc'),
+        ])
+
+        results = self.index.search('c', 1)
+
+        self.assertEqual(results[0][0], 3)
+        self.assertEqual(len(results), 1)
+
+    def test_remove_moves_last_row(self):
+        self.index.add_many([
+            Statement(id=1, text='aaa'),
+            Statement(id=2, text='cc'),
+        ])
+        self.index.remove(1)
+
+        self.assertEqual(len(self.index), 1)
+        self.assertEqual(self.index.search('c', 10)[0][0], 2)
+
+    def test_saved_vectors_are_reused(self):
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'vectors.npy')
+            statements = [
+                Statement(id=1, text='aaa'),
+                Statement(id=2, text='cc'),
+            ]
+
+            VectorIndex(get_letter_count_vectors, path=path).build(statements)
+
+            calls = []
+
+            def get_vectors(texts):
+                calls.append(texts)
+                return get_letter_count_vectors(texts)
+
+            index = VectorIndex(get_vectors, path=path)
+            index.build(statements + [Statement(id=3, text='b')])
+
+            # Only the new statement (and the size check) needs a vector
+            self.assertEqual(calls, [[''], ['b']])
+            self.assertEqual(len(index), 3)
+            self.assertEqual(index.search('b', 1)[0][0], 3)
+
+    def test_indexes_sharing_a_saved_matrix(self):
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'vectors.npy')
+            statements = [
+                Statement(id=1, text='aaa'),
+                Statement(id=2, text='cc'),
+            ]
+
+            VectorIndex(get_letter_count_vectors, path=path).build(statements)
+
+            index_a = VectorIndex(get_letter_count_vectors, path=path)
+            index_a.build(statements)
+
+            index_b = VectorIndex(get_letter_count_vectors, path=path)
+            index_b.build(statements)
+
+            index_a.add(Statement(id=3, text='b'))
+            index_b.add(Statement(id=4, text='c'))
+
+            # Each index keeps its own rows
+            self.assertEqual(list(index_a.matrix[index_a.rows[3]]), [0, 1, 0])
+            self.assertEqual(list(index_b.matrix[index_b.rows[4]]), [0, 0, 1])
+            self.assertEqual(index_a.search('b', 1), [(3, 1.0)])
+
+            index_a.save()
+            index_b.save()
+
+            # The last saved index is the one that is loaded
+            index = VectorIndex(get_letter_count_vectors, path=path)
+            index.load()
+
+            self.assertEqual(sorted(index.rows.keys()), [1, 2, 4])
+            self.assertEqual(list(index.matrix[index.rows[4]]), [0, 0, 1])
+            self.assertEqual(index.search('aaa', 1), [(1, 1.0)])
+
+
+class ConversationIndexTests(TestCase):
+
+    def setUp(self):
+        self.index = ConversationIndex(size=2, conversation_count=2)
+        self.loaded = []
+
+    def load(self, conversation, limit):
+        self.loaded.append(conversation)
+
+        return [
+            Statement(id=1, text='A', conversation=conversation),
+            Statement(id=2, text='B', conversation=conversation),
+        ][-limit:]
+
+    def get_texts(self, conversation):
+        return [
+            statement.text for statement in self.index.get_latest_statements(conversation, self.load)
+        ]
+
+    def test_conversation_is_loaded_once(self):
+        self.assertEqual(self.get_texts('a'), ['A', 'B'])
+        self.assertEqual(self.get_texts('a'), ['A', 'B'])
+        self.assertEqual(self.loaded, ['a'])
+
+    def test_add_to_unread_conversation_is_ignored(self):
+        self.index.add(Statement(id=3, text='C', conversation='a'))
+
+        self.assertEqual(len(self.index), 0)
+
+    def test_add_keeps_latest_statements(self):
+        self.get_texts('a')
+        self.index.add(Statement(id=3, text='C', conversation='a'))
+
+        self.assertEqual(self.get_texts('a'), ['B', 'C'])
+        self.assertEqual(len(self.index), 2)
+
+    def test_add_replaces_existing_entry(self):
+        self.get_texts('a')
+        self.index.add(Statement(id=1, text='A2', conversation='a'))
+
+        self.assertEqual(self.get_texts('a'), ['A2', 'B'])
+
+    def test_remove_reloads_conversation(self):
+        self.get_texts('a')
+        self.index.remove(2)
+
+        self.get_texts('a')
+
+        self.assertEqual(self.loaded, ['a', 'a'])
+
+    def test_least_recently_read_conversation_is_removed(self):
+        self.get_texts('a')
+        self.get_texts('b')
+        self.get_texts('a')
+        self.get_texts('c')
+
+        self.assertEqual(list(self.index.conversations.keys()), ['a', 'c'])
@@ -0,0 +1,201 @@
+import os
+import tempfile
+from threading import Event
+from unittest import TestCase
+from chatterbot import ChatBot
+from chatterbot.conversation import Statement
+from chatterbot.learning import LearningQueue
+
+
+class BlockingStorage(object):
+    """
+    A storage adapter that records each batch it is asked to save and
+    waits to save it until it is released.
+    """
+
+    def __init__(self):
+        self.batches = []
+        self.saving = Event()
+        self.released = Event()
+
+    def create_many(self, statements):
+        self.saving.set()
+        self.released.wait()
+        self.batches.append([statement.text for statement in statements])
+
+
+class FailingStorage(object):
+    """
+    A storage adapter that is unable to save any statements.
+    """
+
+    def create_many(self, statements):
+        raise RuntimeError('Unable to connect to the database')
+
+
+class LearningQueueTests(TestCase):
+
+    def setUp(self):
+        self.storage = BlockingStorage()
+        self.queue = LearningQueue(self.storage, maximum_size=1, batch_size=10, flush_interval=0.01)
+
+    def tearDown(self):
+        self.storage.released.set()
+        self.queue.close()
+
+    def test_flush_saves_pending_statements(self):
+        self.queue.put(Statement(text='A', conversation='test'), Statement(text='B', conversation='test'))
+
+        self.storage.released.set()
+        self.queue.flush()
+
+        self.assertEqual(self.storage.batches, [['A', 'B']])
+        self.assertEqual(self.queue.get_pending('test'), [])
+
+    def test_get_pending(self):
+        self.queue.put(Statement(text='A', conversation='test'))
+
+        self.assertEqual(
+            [statement.text for statement in self.queue.get_pending('test')], ['A']
+        )
+        self.assertEqual(self.queue.get_pending('other'), [])
+
+    def test_put_blocks_when_queue_is_full(self):
+        from threading import Thread
+
+        # The worker waits in create_many with the first item, the second fills the queue
+        self.queue.put(Statement(text='A'))
+        self.storage.saving.wait()
+        self.queue.put(Statement(text='B'))
+
+        third = Thread(target=self.queue.put, args=(Statement(text='C'), ))
+        third.start()
+        third.join(0.1)
+
+        self.assertTrue(third.is_alive())
+
+        self.storage.released.set()
+        third.join()
+        self.queue.flush()
+
+        self.assertEqual(
+            [text for batch in self.storage.batches for text in batch], ['A', 'B', 'C']
+        )
+
+    def test_close_saves_pending_statements(self):
+        self.queue.put(Statement(text='A'))
+
+        self.storage.released.set()
+        self.queue.close()
+
+        self.assertEqual(self.storage.batches, [['A']])
+        self.assertFalse(self.queue.thread.is_alive())
+
+    def test_put_after_close_saves_immediately(self):
+        self.storage.released.set()
+        self.queue.close()
+
+        self.queue.put(Statement(text='A'))
+
+        self.assertEqual(self.storage.batches, [['A']])
+
+
+class LearningQueueWriteErrorTests(TestCase):
+
+    def setUp(self):
+        self.queue = LearningQueue(FailingStorage(), flush_interval=0.01)
+
+    def tearDown(self):
+        try:
+            self.queue.close()
+        except LearningQueue.WriteError:
+            pass
+
+    def test_flush_raises_write_error(self):
+        statement = Statement(text='A', conversation='test')
+
+        self.queue.put(statement)
+
+        with self.assertRaises(LearningQueue.WriteError) as context:
+            self.queue.flush()
+
+        self.assertEqual(context.exception.statements, [statement])
+        self.assertEqual(self.queue.get_pending('test'), [])
+
+        # The error is only raised once
+        self.queue.flush()
+
+    def test_failed_statements_stay_pending_until_flush(self):
+        self.queue.put(Statement(text='A', conversation='test'))
+
+        # Wait for the worker thread to try to save the statement
+        self.queue.queue.join()
+
+        self.assertEqual(
+            [statement.text for statement in self.queue.get_pending('test')], ['A']
+        )
+
+        with self.assertRaises(LearningQueue.WriteError):
+            self.queue.flush()
+
+    def test_close_raises_write_error(self):
+        self.queue.put(Statement(text='A'))
+
+        with self.assertRaises(LearningQueue.WriteError):
+            self.queue.close()
+
+
+class ChatBotWriteBehindTests(TestCase):
+
+    def setUp(self):
+        # The worker thread needs a database that is shared between threads
+        handle, self.database_path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+
+        self.chatbot = ChatBot(
+            'Test Bot',
+            database_uri='sqlite:///' + self.database_path,
+            initialize=False,
+            write_behind=True,
+            write_behind_flush_interval=0.01
+        )
+
+    def tearDown(self):
+        self.chatbot.learning_queue.close()
+        self.chatbot.storage.drop()
+        os.remove(self.database_path)
+
+    def test_in_memory_database_is_rejected(self):
+        with self.assertRaises(ChatBot.ChatBotException):
+            ChatBot('Test Bot', database_uri=None, initialize=False, write_behind=True)
+
+    def test_get_response_saves_statements(self):
+        response = self.chatbot.get_response('Hi!')
+
+        self.chatbot.learning_queue.flush()
+
+        input_results = list(self.chatbot.storage.filter(text='Hi!', persona_not_startswith='bot:'))
+        response_results = list(self.chatbot.storage.filter(persona='bot:' + self.chatbot.name))
+
+        self.assertEqual(len(input_results), 1)
+        self.assertEqual(len(response_results), 1)
+        self.assertEqual(response_results[0].text, response.text)
+        self.assertEqual(response_results[0].in_response_to, 'Hi!')
+
+    def test_get_latest_response_includes_pending_statements(self):
+        self.chatbot.storage.released = Event()
+        create_many = self.chatbot.storage.create_many
+
+        def blocking_create_many(statements):
+            self.chatbot.storage.released.wait()
+            return create_many(statements)
+
+        self.chatbot.storage.create_many = blocking_create_many
+
+        response = self.chatbot.get_response('Hi!', conversation='test')
+        latest_response = self.chatbot.get_latest_response('test')
+
+        self.chatbot.storage.released.set()
+
+        self.assertEqual(latest_response.text, 'Hi!')
+        self.assertEqual(response.in_response_to, 'Hi!')
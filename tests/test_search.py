@@ -1,6 +1,6 @@
 from tests.base_case import ChatBotTestCase
 from chatterbot.conversation import Statement
-from chatterbot.search import TextSearch, IndexedTextSearch
+from chatterbot.search import TextSearch, IndexedTextSearch, BM25TextSearch, MinHashTextSearch, VectorSearch
 from chatterbot import comparisons
 
 
@@ -49,6 +49,139 @@ class SearchTestCase(ChatBotTestCase):
         self.assertEqual(results[0].text, 'A')
         self.assertEqual(results[0].conversation, 'test_1')
 
+    def test_search_top_k_no_results(self):
+        statement = Statement(text='What is your quest?')
+
+        results = self.search_algorithm.search_top_k(statement, 3)
+
+        self.assertEqual(results, [])
+
+
+class SearchTopKTestCase(ChatBotTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.search_algorithm = TextSearch(self.chatbot)
+
+        self.chatbot.storage.create_many([
+            Statement(text='What is the meaning of life?'),
+            Statement(text='What... is your quest?'),
+            Statement(text='Yuck, black licorice jelly beans.'),
+            Statement(text='I hear you are going on a quest?'),
+        ])
+
+    def test_search_top_k(self):
+        statement = Statement(text='What is your quest?')
+
+        results = self.search_algorithm.search_top_k(statement, 2)
+
+        self.assertIsLength(results, 2)
+        self.assertEqual(results[0].text, 'What... is your quest?')
+        self.assertGreaterEqual(results[0].confidence, results[1].confidence)
+
+    def test_search_top_k_larger_than_results(self):
+        statement = Statement(text='What is your quest?')
+
+        results = self.search_algorithm.search_top_k(statement, 10)
+
+        self.assertIsLength(results, 4)
+
+    def test_search_top_k_early_exit_confidence(self):
+        statement = Statement(text='What is the meaning of life?')
+
+        results = self.search_algorithm.search_top_k(
+            statement, 3, early_exit_confidence=1
+        )
+
+        # The exact match is the first statement so the search stops there
+        self.assertIsLength(results, 1)
+        self.assertEqual(results[0].confidence, 1)
+
+    def test_search_top_k_early_exit_stops_comparing(self):
+        compared_texts = []
+
+        class RecordingComparator(comparisons.Comparator):
+
+            def compare(self, statement_a, statement_b):
+                compared_texts.append(statement_b.text)
+                return int(statement_a.text == statement_b.text)
+
+        self.search_algorithm.compare_statements = RecordingComparator(self.chatbot.storage.tagger.language)
+
+        statement = Statement(text='What is the meaning of life?')
+
+        self.search_algorithm.search_top_k(statement, 3, early_exit_confidence=1)
+
+        # The rest of the page is not compared after the exact match
+        self.assertEqual(compared_texts, ['What is the meaning of life?'])
+
+
+class IndexedTextSearchInvertedIndexTests(ChatBotTestCase):
+    """
+    Test that the search algorithm works correctly when
+    an in-memory inverted index is used to find candidates.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.search_algorithm = IndexedTextSearch(
+            self.chatbot,
+            use_inverted_index=True
+        )
+
+    def tearDown(self):
+        self.chatbot.storage.indexes.remove(self.search_algorithm.index)
+        super().tearDown()
+
+    def test_search_no_results(self):
+        statement = Statement(text='What is your quest?')
+
+        results = list(self.search_algorithm.search(statement))
+
+        self.assertEqual(results, [])
+
+    def test_search_only_loads_candidates_sharing_tokens(self):
+        self.chatbot.storage.create(text='What is your quest?', search_text='NOUN:quest')
+        self.chatbot.storage.create(text='Yuck, black licorice.', search_text='ADJ:licorice')
+
+        statement = Statement(text='What is your quest?', search_text='NOUN:quest')
+        results = list(self.search_algorithm.search(statement))
+
+        self.assertIsLength(results, 1)
+        self.assertEqual(results[0].text, 'What is your quest?')
+        self.assertEqual(results[0].confidence, 1)
+
+    def test_search_limits_ids_per_query(self):
+        from unittest.mock import patch
+        from chatterbot.search import MAXIMUM_IDS_PER_QUERY
+
+        self.chatbot.storage.create_many([
+            Statement(text='A {}'.format(number), search_text='a') for number in range(MAXIMUM_IDS_PER_QUERY + 100)
+        ])
+
+        statement = Statement(text='A', search_text='a')
+
+        with patch.object(self.chatbot.storage, 'filter', wraps=self.chatbot.storage.filter) as mock:
+            list(self.search_algorithm.search(statement))
+
+        self.assertEqual(mock.call_count, 2)
+        self.assertLessEqual(max(len(call[1]['ids']) for call in mock.call_args_list), MAXIMUM_IDS_PER_QUERY)
+
+    def test_search_additional_parameters(self):
+        self.chatbot.storage.create_many([
+            Statement(text='A', search_text='a', conversation='test_1'),
+            Statement(text='A', search_text='a', conversation='test_2')
+        ])
+
+        statement = Statement(text='A', search_text='a')
+
+        results = list(self.search_algorithm.search(
+            statement, conversation='test_2'
+        ))
+
+        self.assertIsLength(results, 1)
+        self.assertEqual(results[0].conversation, 'test_2')
+
 
 class IndexedTextSearchComparisonFunctionSpacySimilarityTests(ChatBotTestCase):
     """
@@ -284,3 +417,208 @@ class TextSearchComparisonFunctionLevenshteinDistanceComparisonTests(ChatBotTest
         results = list(self.search_algorithm.search(statement))
 
         self.assertIsLength(results, 0)
+
+
+class TextSearchLengthIndexTests(ChatBotTestCase):
+    """
+    Test that the search algorithm works correctly when an
+    in-memory index of text lengths is used to skip statements.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.search_algorithm = TextSearch(
+            self.chatbot,
+            use_length_index=True
+        )
+
+    def tearDown(self):
+        self.chatbot.storage.indexes.remove(self.search_algorithm.index)
+        super().tearDown()
+
+    def test_get_closest_statement(self):
+        self.chatbot.storage.create_many([
+            Statement(text='What is the meaning of life?'),
+            Statement(text='I am Iron Man.'),
+            Statement(text='What... is your quest?'),
+            Statement(text='Yuck, black licorice jelly beans.'),
+            Statement(text='I hear you are going on a quest?'),
+        ])
+
+        statement = Statement(text='What is your quest?')
+
+        results = list(self.search_algorithm.search(statement))
+
+        self.assertEqual(results[-1].text, 'What... is your quest?')
+
+    def test_search_limits_ids_per_query(self):
+        from unittest.mock import patch
+        from chatterbot.search import MAXIMUM_IDS_PER_QUERY
+
+        self.chatbot.storage.create_many([
+            Statement(text='A') for _ in range(MAXIMUM_IDS_PER_QUERY + 100)
+        ])
+
+        statement = Statement(text='B')
+
+        with patch.object(self.chatbot.storage, 'filter', wraps=self.chatbot.storage.filter) as mock:
+            list(self.search_algorithm.search(statement))
+
+        self.assertEqual(mock.call_count, 2)
+        self.assertLessEqual(max(len(call[1]['ids']) for call in mock.call_args_list), MAXIMUM_IDS_PER_QUERY)
+
+    def test_search_top_k(self):
+        self.chatbot.storage.create_many([
+            Statement(text='What is your quest?'),
+            Statement(text='What is your name?'),
+            Statement(text='Yuck, black licorice jelly beans.'),
+        ])
+
+        statement = Statement(text='What is your quest?')
+
+        results = self.search_algorithm.search_top_k(statement, 2)
+
+        self.assertIsLength(results, 2)
+        self.assertEqual(results[0].text, 'What is your quest?')
+        self.assertEqual(results[0].confidence, 1)
+        self.assertEqual(results[1].text, 'What is your name?')
+
+
+class BM25TextSearchTests(ChatBotTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.search_algorithm = BM25TextSearch(self.chatbot)
+
+    def tearDown(self):
+        if self.search_algorithm.index is not None:
+            self.chatbot.storage.indexes.remove(self.search_algorithm.index)
+        super().tearDown()
+
+    def test_search_no_results(self):
+        statement = Statement(text='What is your quest?')
+
+        results = list(self.search_algorithm.search(statement))
+
+        self.assertEqual(results, [])
+
+    def test_index_is_built_from_existing_statements(self):
+        self.chatbot.storage.create(text='What is your quest?', search_text='NOUN:quest')
+
+        statement = Statement(text='What is your quest?', search_text='NOUN:quest')
+        results = list(self.search_algorithm.search(statement))
+
+        self.assertIsLength(results, 1)
+        self.assertEqual(results[0].confidence, 1)
+
+    def test_search_top_k(self):
+        statement = Statement(text='What is your quest?', search_text='VERB:be NOUN:quest')
+
+        # Build the index before the statements are created
+        self.search_algorithm.search_top_k(statement, 2)
+
+        self.chatbot.storage.create_many([
+            Statement(text='What is your quest?', search_text='VERB:be NOUN:quest'),
+            Statement(text='What is your name?', search_text='VERB:be NOUN:name'),
+            Statement(text='Where is the bridge?', search_text='VERB:be NOUN:bridge'),
+            Statement(text='I seek the grail.', search_text='VERB:seek NOUN:grail'),
+        ])
+
+        results = self.search_algorithm.search_top_k(statement, 2)
+
+        self.assertIsLength(results, 2)
+        self.assertEqual(results[0].text, 'What is your quest?')
+        self.assertEqual(results[1].text, 'What is your name?')
+
+    def test_search_excludes_bot_statements(self):
+        self.chatbot.storage.create(text='What is your quest?', search_text='NOUN:quest', persona='bot:Test')
+
+        statement = Statement(text='What is your quest?', search_text='NOUN:quest')
+        results = list(self.search_algorithm.search(statement))
+
+        self.assertEqual(results, [])
+
+
+class MinHashTextSearchTests(ChatBotTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.search_algorithm = MinHashTextSearch(self.chatbot)
+
+    def tearDown(self):
+        if self.search_algorithm.index is not None:
+            self.chatbot.storage.indexes.remove(self.search_algorithm.index)
+        super().tearDown()
+
+    def test_search_no_results(self):
+        statement = Statement(text='What is your quest?')
+
+        results = list(self.search_algorithm.search(statement))
+
+        self.assertEqual(results, [])
+
+    def test_in_memory_database_is_not_saved(self):
+        self.assertIsNone(self.search_algorithm.index_path)
+
+    def test_get_closest_statement(self):
+        self.chatbot.storage.create_many([
+            Statement(text='What is the meaning of life?'),
+            Statement(text='What... is your quest?'),
+            Statement(text='Yuck, black licorice jelly beans.'),
+        ])
+
+        statement = Statement(text='What is your quest?')
+
+        results = self.search_algorithm.search_top_k(statement, 1)
+
+        self.assertIsLength(results, 1)
+        self.assertEqual(results[0].text, 'What... is your quest?')
+
+
+class VectorSearchTests(ChatBotTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.search_algorithm = VectorSearch(self.chatbot)
+
+    def tearDown(self):
+        if self.search_algorithm.index is not None:
+            self.chatbot.storage.indexes.remove(self.search_algorithm.index)
+        super().tearDown()
+
+    def test_search_no_results(self):
+        statement = Statement(text='What is your quest?')
+
+        results = list(self.search_algorithm.search(statement))
+
+        self.assertEqual(results, [])
+
+    def test_get_closest_statement(self):
+        self.chatbot.storage.create_many([
+            Statement(text='This is a lovely bog.'),
+            Statement(text='This is a beautiful swamp.'),
+            Statement(text='It smells like a swamp.')
+        ])
+
+        statement = Statement(text='This is a lovely swamp.')
+        results = self.search_algorithm.search_top_k(statement, 3)
+
+        self.assertIsLength(results, 3)
+        self.assertEqual(results[0].text, 'This is a beautiful swamp.')
+        self.assertGreaterEqual(results[0].confidence, results[1].confidence)
+
+    def test_confidence_matches_spacy_similarity(self):
+        from chatterbot.comparisons import SpacySimilarity
+
+        compare = SpacySimilarity(self.chatbot.storage.tagger.language)
+
+        self.chatbot.storage.create(text='It smells like a swamp.')
+
+        statement = Statement(text='This is a lovely swamp.')
+        results = self.search_algorithm.search_top_k(statement, 1)
+
+        self.assertAlmostEqual(
+            results[0].confidence,
+            compare(statement, results[0]),
+            places=5
+        )
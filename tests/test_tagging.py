@@ -1,3 +1,5 @@
+import os
+from tempfile import mkdtemp
 from unittest import TestCase
 from chatterbot import languages
 from chatterbot import tagging
@@ -135,3 +137,150 @@ class PosLemmaTaggerTests(TestCase):
         )
 
         self.assertEqual(bigram_string, 'VERB:mu')
+
+    def test_get_text_index_strings(self):
+        texts = [
+            'Hello, how are you doing on this awesome day?',
+            '?',
+            'Hello Dr. Salazar. How are you today?',
+            ''
+        ]
+
+        bigram_strings = self.tagger.get_text_index_strings(texts, batch_size=2)
+
+        self.assertEqual(bigram_strings, [
+            self.tagger.get_text_index_string(text) for text in texts
+        ])
+
+    def test_get_text_index_string_is_cached(self):
+        first_string = self.tagger.get_text_index_string('Hello, how are you?')
+        second_string = self.tagger.get_text_index_string('Hello, how are you?')
+
+        self.assertEqual(first_string, second_string)
+        self.assertEqual(self.tagger.cache.misses, 1)
+        self.assertEqual(self.tagger.cache.hits, 1)
+
+    def test_get_text_index_strings_uses_cache(self):
+        self.tagger.get_text_index_string('Hello, how are you?')
+
+        bigram_strings = self.tagger.get_text_index_strings([
+            'Hello, how are you?', 'I am well', 'I am well'
+        ])
+
+        self.assertEqual(bigram_strings[1], bigram_strings[2])
+        self.assertEqual(self.tagger.cache.hits, 1)
+        self.assertEqual(self.tagger.cache.misses, 2)
+
+
+class LowercaseTaggerTests(TestCase):
+
+    def setUp(self):
+        self.tagger = tagging.LowercaseTagger()
+
+    def test_get_text_index_strings(self):
+        index_strings = self.tagger.get_text_index_strings(['Hello', 'HOW are YOU?'])
+
+        self.assertEqual(index_strings, ['hello', 'how are you?'])
+
+
+class GetTextIndexStringsTests(TestCase):
+
+    def test_tagger_with_batch_method(self):
+        index_strings = tagging.get_text_index_strings(tagging.LowercaseTagger(), ['Hello', 'HI'])
+
+        self.assertEqual(index_strings, ['hello', 'hi'])
+
+    def test_tagger_without_batch_method(self):
+
+        class SingleTextTagger(object):
+
+            def get_text_index_string(self, text):
+                return text.upper()
+
+        index_strings = tagging.get_text_index_strings(SingleTextTagger(), ['Hello', 'hi'])
+
+        self.assertEqual(index_strings, ['HELLO', 'HI'])
+
+
+class IndexStringCacheTests(TestCase):
+
+    def setUp(self):
+        self.cache = tagging.IndexStringCache(maximum_size=2)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get('Hello'))
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_get(self):
+        self.cache.set('Hello', 'hello')
+
+        self.assertEqual(self.cache.get('Hello'), 'hello')
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 0)
+
+    def test_least_recently_used_is_removed(self):
+        self.cache.set('A', 'a')
+        self.cache.set('B', 'b')
+        self.cache.get('A')
+        self.cache.set('C', 'c')
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.get('A'), 'a')
+        self.assertIsNone(self.cache.get('B'))
+        self.assertEqual(self.cache.get('C'), 'c')
+
+    def test_maximum_size_zero(self):
+        self.cache = tagging.IndexStringCache(maximum_size=0)
+        self.cache.set('A', 'a')
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNone(self.cache.get('A'))
+
+    def test_clear(self):
+        self.cache.set('A', 'a')
+        self.cache.get('A')
+        self.cache.clear()
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.hits, 0)
+        self.assertIsNone(self.cache.get('A'))
+
+
+class PersistentIndexStringCacheTests(TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(mkdtemp(), 'index_strings.sqlite3')
+
+    def tearDown(self):
+        os.remove(self.path)
+        os.rmdir(os.path.dirname(self.path))
+
+    def get_cache(self, version):
+        return tagging.IndexStringCache(
+            maximum_size=10,
+            path=self.path,
+            get_version=lambda: version
+        )
+
+    def test_index_strings_are_reused(self):
+        cache = self.get_cache('en_core_web_sm-2.1.0')
+        cache.set_many({'A': 'a', 'B': 'b'})
+        cache.close()
+
+        cache = self.get_cache('en_core_web_sm-2.1.0')
+
+        self.assertEqual(cache.get('A'), 'a')
+        self.assertEqual(cache.get('B'), 'b')
+        self.assertEqual(cache.hits, 2)
+        cache.close()
+
+    def test_index_strings_from_other_versions_are_not_used(self):
+        cache = self.get_cache('en_core_web_sm-2.1.0')
+        cache.set('A', 'a')
+        cache.close()
+
+        cache = self.get_cache('de_core_news_sm-2.1.0')
+
+        self.assertIsNone(cache.get('A'))
+        cache.close()
@@ -1,5 +1,7 @@
 from tests.base_case import ChatBotTestCase
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from chatterbot import languages
 from chatterbot import utils
 
 
@@ -9,6 +11,28 @@ class UtilityTests(TestCase):
         datetime = utils.import_module('datetime.datetime')
         self.assertTrue(hasattr(datetime, 'now'))
 
+    @patch.dict('chatterbot.utils._spacy_models', clear=True)
+    def test_get_spacy_model_is_shared(self):
+        spacy = MagicMock()
+
+        with patch.dict('sys.modules', {'spacy': spacy}):
+            model_a = utils.get_spacy_model(languages.ENG, ('parser', 'ner'))
+            model_b = utils.get_spacy_model(languages.ENG, ('ner', 'parser'))
+
+        self.assertIs(model_a, model_b)
+        spacy.load.assert_called_once_with('en', disable=['ner', 'parser'])
+
+    @patch.dict('chatterbot.utils._spacy_models', clear=True)
+    def test_get_spacy_model_by_pipeline(self):
+        spacy = MagicMock()
+
+        with patch.dict('sys.modules', {'spacy': spacy}):
+            utils.get_spacy_model(languages.ENG, ('parser', 'ner'))
+            utils.get_spacy_model(languages.ENG)
+            utils.get_spacy_model(languages.GER, ('parser', 'ner'))
+
+        self.assertEqual(spacy.load.call_count, 3)
+
 
 class UtilityChatBotTestCase(ChatBotTestCase):
 
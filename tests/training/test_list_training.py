@@ -3,6 +3,17 @@ from chatterbot.trainers import ListTrainer
 from chatterbot import preprocessors
 
 
+class SingleTextTagger(object):
+    """
+    A tagger that can only tag one text at a time.
+    """
+
+    language = None
+
+    def get_text_index_string(self, text):
+        return text.lower()
+
+
 class ListTrainingTests(ChatBotTestCase):
 
     def setUp(self):
@@ -30,6 +41,17 @@ class ListTrainingTests(ChatBotTestCase):
 
         self.assertEqual(response.text, 'No, I think I am all set.')
 
+    def test_training_with_single_text_tagger(self):
+        self.chatbot.storage.tagger = SingleTextTagger()
+
+        self.trainer.train(['Hi', 'Hello'])
+
+        results = list(self.chatbot.storage.filter(text='Hello'))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].search_text, 'hello')
+        self.assertEqual(results[0].search_in_response_to, 'hi')
+
     def test_training_adds_statements(self):
         """
         Test that the training method adds statements
@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from chatterbot.storage import DjangoStorageAdapter
 from chatterbot.conversation import Statement as StatementObject
 from chatterbot.ext.django_chatterbot.models import Statement
@@ -96,6 +96,27 @@ class DjangoStorageAdapterTests(DjangoAdapterTestCase):
         with self.assertRaises(StorageAdapter.EmptyDatabaseException):
             self.adapter.get_random()
 
+    def test_get_latest_statements(self):
+        for text in 'ABC':
+            self.adapter.create(text=text, conversation='test')
+
+        self.adapter.create(text='D', conversation='other')
+
+        statements = self.adapter.get_latest_statements('test', 2)
+
+        self.assertEqual([statement.text for statement in statements], ['B', 'C'])
+
+    def test_get_random_skips_missing_ids(self):
+        for text in 'ABCDE':
+            self.adapter.create(text=text)
+
+        self.adapter.remove('B')
+        self.adapter.remove('C')
+        self.adapter.remove('D')
+
+        for _ in range(20):
+            self.assertIn(self.adapter.get_random().text, ['A', 'E'])
+
     def test_filter_by_text_multiple_results(self):
         self.adapter.create(
             text="Do you like this?",
@@ -318,6 +339,56 @@ class DjangoAdapterFilterTests(DjangoAdapterTestCase):
 
         self.assertEqual(len(results), 2)
 
+    def test_filter_fields(self):
+        self.adapter.create(text='Hi', conversation='test')
+
+        results = list(self.adapter.filter(fields=['text']))
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].text, 'Hi')
+        self.assertEqual(results[0].get_deferred_fields(), {
+            'search_text',
+            'conversation',
+            'created_at',
+            'in_response_to',
+            'search_in_response_to',
+            'persona',
+        })
+
+    def test_filter_loads_tags_per_page(self):
+        for text in 'ABC':
+            self.adapter.create(text=text, tags=['letter', text])
+
+        # One query for the statements and one for the tags of each page
+        with self.assertNumQueries(3):
+            tags = [
+                sorted(statement.get_tags()) for statement in self.adapter.filter(page_size=2, order_by=['id'])
+            ]
+
+        self.assertEqual(tags, [['A', 'letter'], ['B', 'letter'], ['C', 'letter']])
+
+    def test_filter_pages_without_iterator_chunk_size(self):
+        from unittest import mock
+
+        for text in 'ABC':
+            self.adapter.create(text=text, tags=['letter', text])
+
+        # Django 1.11 does not accept a chunk size for iterators
+        with mock.patch('django.VERSION', (1, 11, 0, 'final', 0)):
+            tags = [
+                sorted(statement.get_tags()) for statement in self.adapter.filter(page_size=2, order_by=['id'])
+            ]
+
+        self.assertEqual(tags, [['A', 'letter'], ['B', 'letter'], ['C', 'letter']])
+
+    def test_filter_without_tags(self):
+        self.adapter.create(text='A', tags=['letter'])
+
+        with self.assertNumQueries(1):
+            results = list(self.adapter.filter(load_tags=False))
+
+        self.assertEqual(len(results), 1)
+
 
 class DjangoOrderingTests(DjangoAdapterTestCase):
     """
@@ -466,6 +537,106 @@ class StorageAdapterCreateTests(DjangoAdapterTestCase):
         self.assertEqual(len(results[0].get_tags()), 1)
         self.assertEqual(results[0].get_tags(), ['ab'])
 
+    def test_create_many_in_chunks(self):
+        from chatterbot.ext.django_chatterbot.models import Tag
+
+        self.adapter.create(text='Hey', tags=['greeting'])
+
+        created_count = self.adapter.create_many((
+            StatementObject(text=text, tags=['greeting', text]) for text in 'ABCDE'
+        ), batch_size=2)
+
+        results = list(self.adapter.filter(tags=['greeting'], order_by=['id']))
+
+        self.assertEqual(created_count, 5)
+        self.assertEqual([result.text for result in results], ['Hey', 'A', 'B', 'C', 'D', 'E'])
+        self.assertEqual(sorted(results[3].get_tags()), ['C', 'greeting'])
+        self.assertEqual(Tag.objects.count(), 6)
+
+    def test_create_many_ids_without_sqlite(self):
+        from unittest import mock
+        from django.db import connection
+        from chatterbot.ext.django_chatterbot.models import Statement
+
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            with mock.patch.object(Statement.objects, 'bulk_create') as bulk_create:
+                self.adapter.create_many([
+                    StatementObject(text='A', tags=['first']),
+                    StatementObject(text='B', tags=['second'])
+                ])
+
+        results = list(self.adapter.filter(order_by=['id']))
+
+        self.assertFalse(bulk_create.called)
+        self.assertEqual([result.text for result in results], ['A', 'B'])
+        self.assertEqual(results[0].get_tags(), ['first'])
+        self.assertEqual(results[1].get_tags(), ['second'])
+
+    def test_create_many_tag_created_at_the_same_time(self):
+        from unittest import mock
+        from chatterbot.ext.django_chatterbot.models import Tag
+
+        bulk_create = Tag.objects.bulk_create
+
+        def bulk_create_after_another_process(tags):
+            # Another process creates one of the tags first
+            Tag.objects.create(name='greeting')
+            return bulk_create(tags)
+
+        with mock.patch.object(Tag.objects, 'bulk_create', side_effect=bulk_create_after_another_process):
+            self.adapter.create_many([
+                StatementObject(text='A', tags=['greeting', 'letter'])
+            ])
+
+        results = list(self.adapter.filter())
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(sorted(results[0].get_tags()), ['greeting', 'letter'])
+        self.assertEqual(Tag.objects.count(), 2)
+
+
+class DjangoAdapterIndexTests(TransactionTestCase):
+    """
+    Tests for keeping in-process indexes up to date.
+    """
+
+    def setUp(self):
+        from chatterbot.indexes import InvertedIndex
+
+        self.adapter = DjangoStorageAdapter()
+        self.index = InvertedIndex()
+        self.adapter.add_index(self.index)
+
+    def tearDown(self):
+        self.adapter.drop()
+
+    def test_create_pair_updates_index(self):
+        self.adapter.create_pair(
+            StatementObject(text='Hello', search_text='hello'),
+            StatementObject(text='Hi', search_text='hi', in_response_to='Hello')
+        )
+
+        self.assertEqual(len(self.index), 2)
+
+    def test_failed_create_pair_does_not_update_index(self):
+        create = self.adapter.create
+
+        def create_then_fail(**kwargs):
+            if kwargs['text'] == 'Hi':
+                raise RuntimeError('Unable to save the response')
+            return create(**kwargs)
+
+        self.adapter.create = create_then_fail
+
+        with self.assertRaises(RuntimeError):
+            self.adapter.create_pair(
+                StatementObject(text='Hello', search_text='hello'),
+                StatementObject(text='Hi', search_text='hi', in_response_to='Hello')
+            )
+
+        self.assertEqual(self.adapter.count(), 0)
+        self.assertEqual(len(self.index), 0)
+
 
 class StorageAdapterUpdateTests(DjangoAdapterTestCase):
     """